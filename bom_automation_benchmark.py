@@ -0,0 +1,315 @@
+from odoo import api, models
+import itertools
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+_logger = logging.getLogger(__name__)
+
+
+# Synthetic catalogue seeded before the run. Every name here is looked up by
+# the generators, so missing ones would only measure the placeholder path.
+BENCHMARK_CATALOGUE = {
+    'flights': [
+        'Flight - OD600 ID168 P400 T20 RH',
+        'Flight - OD600 ID168 P400 T16 RH',
+        'Flight - OD750 ID219 P500 T20 RH',
+        'Flight - OD750 ID219 P500 T16 RH',
+        'Flight - OD900 ID273 P600 T25 RH',
+        'Flight - OD900 ID273 P600 T20 RH',
+        'Flight - OD450 ID128 P300 T16 RH',
+        'Flight - OD450 ID128 P300 T12 RH',
+    ],
+    'hollow_bars': [
+        'Hollow Bar - OD128mm WT 11.5mm',
+        'Hollow Bar - OD150mm ID120mm',
+        'Hollow Bar - OD152mm WT 26mm',
+        'Hollow Bar - OD168mm WT 21.5mm',
+        'Hollow Bar - OD219mm WT 25mm',
+        'Hollow Bar - OD273mm WT 25mm',
+    ],
+    'pipes': [
+        'Pipe - OD168mm WT6.4mm',
+        'Pipe - OD219mm WT8.2mm',
+        'Pipe - OD273mm WT9.3mm',
+        '4" Tremie Pipe',
+        '6" Tremie Pipe',
+        '8" Tremie Pipe',
+    ],
+    'teeth': [
+        '22mm BC86 Teeth',
+        '22mm BC86 Tooth Holder',
+        '25mm BFZ162 Teeth',
+        '25mm BFZ162 Tooth Holder',
+        '38/30 Teeth',
+        '38/30 Tooth Holder',
+        'BFZ318TB - Weld on Casing teeth',
+    ],
+    'drive_heads': [
+        'Drive Head - 100mm Square',
+        'Drive Head - 110mm Square',
+        'Drive Head - 130mm Square',
+        'Drive Head - 150mm Square',
+        'Drive Head - 200mm Square Bauer',
+    ],
+    'couplings': [
+        'HD4 Coupling - Female',
+        'HD4 Coupling - Male',
+        'HD5 Coupling - Female',
+        'HD5 Coupling - Male',
+        'XHD5 Coupling - Female',
+        'XHD5 Coupling - Male',
+    ],
+    'casings': [
+        'Permanent Casing - OD620 WT10',
+        'Permanent Casing - OD624 WT12',
+        'Permanent Casing - OD920 WT10',
+        'Permanent Casing - OD924 WT12',
+    ],
+}
+
+# Attribute matrix per family, keyed by the template name the generators
+# dispatch on. Values are taken in order, so the first N combinations of the
+# cartesian product are the variants created for the family.
+BENCHMARK_FAMILIES = {
+    'Core Barrel': {
+        'Diameter': ['600mm', '750mm', '900mm', '1200mm'],
+        'Height-A': ['800mm', '1000mm'],
+        'Drive Head': ['130mm Square Head', '150mm Square Head', '200mm Bauer Square Head'],
+        'Teeth': ['22mm Teeth', '25mm Teeth', '38/30 Teeth'],
+        'Type': ['Standard', 'Heavy Duty'],
+        'Customization': ['Standard'],
+    },
+    'Bored Pile Auger': {
+        'Type': ['Taper Rock', 'Triad Rock', 'ZED 32mm', 'Clay/Shale', 'Blade'],
+        'Auger Diameter': ['600mm', '750mm', '900mm'],
+        'Drive Head': ['Drive Head - 130mm Square', 'Drive Head - 150mm Square'],
+        'Overall Length': ['6000mm', '9000mm'],
+        'Flighted Length': ['5000mm'],
+        'Rotation': ['Right Hand Rotation'],
+        'Teeth': ['22mm BC86 Teeth', '25mm BFZ162 Teeth'],
+        'Pilot': ['22mm Teeth Pilot'],
+        'Centre Tube': ['Hollow Bar - OD168mm WT 21.5mm', 'Hollow Bar - OD219mm WT 25mm'],
+        'Lead Flight': ['Lead Flight - OD600 ID168 P400 T20 RH'],
+        'Carrier Flight': ['Carrier Flight - OD600 ID168 P400 T16 RH'],
+    },
+    'CFA Auger': {
+        'Type': ['Lead', 'Intermediate', 'Extension'],
+        'Lead Auger': ['Taper Rock', 'ZED 32mm', 'Single Cut'],
+        'Auger Diameter': ['450mm', '600mm', '750mm'],
+        'CFA Drive Head': ['Drive Head - 150mm Square', 'HD5 Coupling'],
+        'Length': ['6m', '9m'],
+        'Rotation': ['Right Hand Rotation'],
+        'Teeth': ['22mm BC86 Teeth'],
+        'Pilot': ['22mm Teeth Pilot'],
+        'Centre Tube': ['Hollow Bar - OD152mm WT 26mm', 'Hollow Bar - OD168mm WT 21.5mm'],
+        'Inner Tube': ['Pipe - OD168mm WT6.4mm'],
+        'Lead Flight': ['Lead Flight - OD600 ID168 P400 T20 RH'],
+        'Carrier Flight': ['Carrier Flight - OD600 ID168 P400 T16 RH'],
+        'Coupling Flight': ['Coupling Flight - OD600 ID168 P400 T20 RH'],
+    },
+    'Drilling Barrel': {
+        'Diameter': ['600mm', '900mm', '1200mm', '1800mm'],
+        'Barrel Height': ['800mm', '1200mm'],
+        'Drive Head': ['130mm Square Head', '150mm Square Head', '200mm Bauer Square Head'],
+        'Opening Type': ['Plunger & Handle', 'Plunger', 'Handle'],
+        'No. of Blade': ['Single Blade', 'Double Blade'],
+        'Type': ['Standard', 'Heavy Duty'],
+        'Customization': ['Standard'],
+        'Front End': ['Rock', 'Clay', 'Taper', 'ZED'],
+        'Teeth': ['22mm Teeth', '25mm Teeth'],
+    },
+    'Cleaning Bucket': {
+        'Diameter': ['600mm', '900mm', '1200mm', '1800mm'],
+        'Barrel Height': ['800mm', '1200mm'],
+        'Drive Head': ['130mm Square Head', '150mm Square Head', '200mm Bauer Square Head'],
+        'Opening Type': ['Plunger & Handle', 'Plunger', 'Handle'],
+        'No. of Blade': ['Single Blade', 'Double Blade'],
+        'Type': ['Standard', 'Heavy Duty'],
+        'Customization': ['Standard'],
+    },
+    'Tremie Pipe Trial': {
+        'Type_TP': ['Intermediate', 'Lead Section'],
+        'Length_TP': ['1m', '2m', '3m', '6m'],
+        'Diameter_TP': ['4" Diameter', '6" Diameter', '8" Diameter'],
+        'Pipe Size_TP': ['4" Tremie Pipe', '6" Tremie Pipe', '8" Tremie Pipe'],
+    },
+    'Pile Casing Stock': {
+        'Casing Type': ['Permanent Casing'],
+        'Inside Diameter': ['600mm', '900mm'],
+        'Wall Thickness': ['10mm', '12mm'],
+        'Segment': ['Single'],
+        'Casing Length': ['6m', '12m'],
+        '1) Drive Band Size': ['100x20t', '150x25t'],
+        'Drive Band Type (A)': ['ID Aligned Drive Band', 'Overlapped Drive Band'],
+        '2) Shoe Size': ['100x20t', '150x25t'],
+        'Shoe Type (A)': ['ID Aligned Casing Shoe', 'OD Aligned Casing Shoe'],
+        'Teeth': ['BFZ318TB'],
+        'No. of Teeth': ['12', '18'],
+    },
+    'Extension Bar': {
+        'Type': ['Rigid', 'Telescopic Inner', 'Telescopic Outer'],
+        'Drive': ['130mm Square Drive', '150mm Square Drive', '200mm Square Bauer Drive'],
+        'Female to Female': ['to 130mm Square Drive (Female to Female)', 'to 150mm Square Drive (Female to Female)'],
+        'Centre Tube': ['Hollow Bar - OD168mm WT 21.5mm', 'Hollow Bar - OD219mm WT 25mm'],
+        'Length': ['3000mm', '6000mm'],
+        'Lift Lug': ['2 Lift Lugs', '4 Lift Lugs'],
+    },
+    'High Tensile Adapter': {
+        'From': ['HD4 Coupling', 'HD5 Coupling', 'XHD5 Coupling'],
+        'To': ['HD4 Coupling', 'HD5 Coupling', 'XHD5 Coupling'],
+        'Type': ['Female to Female', 'Male to Male', 'Female to Male', 'Male to Female'],
+        'Reducer': ['Reducer - 5" to 4"'],
+        'Lift Lug': ['2 Lift Lugs'],
+    },
+}
+
+# Work centre ids hard-coded by the default routing templates
+BENCHMARK_WORKCENTER_MAX_ID = 13
+
+
+def _percentile(values, pct):
+    """ Nearest-rank percentile of a list of numbers """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _summary(values):
+    return {
+        'mean': round(statistics.fmean(values), 3) if values else 0.0,
+        'p50': round(_percentile(values, 50), 3),
+        'p95': round(_percentile(values, 95), 3),
+        'max': round(max(values), 3) if values else 0.0,
+        'total': round(sum(values), 3),
+    }
+
+
+class BomAutomationBenchmark(models.AbstractModel):
+    _name = 'bom.automation.benchmark'
+    _description = 'BOM Automation Benchmark'
+
+    @api.model
+    def run(self, variants=10, families=None, output=None, keep=False):
+        """
+            Seed the synthetic catalogue, create `variants` variants for every
+            family and measure the BOM generation of each one.
+
+            Run from an odoo shell against a scratch database, e.g.
+                env['bom.automation.benchmark'].run(variants=25, output='/tmp/bom_bench.json')
+
+            Everything is rolled back at the end unless `keep` is set.
+            return: dict with wall time, queries and peak memory per family
+        """
+        families = families or list(BENCHMARK_FAMILIES)
+        unknown = set(families) - set(BENCHMARK_FAMILIES)
+        if unknown:
+            raise ValueError("Unknown benchmark families: %s" % ', '.join(sorted(unknown)))
+
+        cr = self.env.cr
+        self.env.flush_all()
+        cr.execute('SAVEPOINT bom_automation_benchmark')
+        try:
+            self._seed_benchmark_catalogue()
+            report = {
+                'database': cr.dbname,
+                'variants_per_family': variants,
+                'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'families': {},
+            }
+            for family in families:
+                report['families'][family] = self._benchmark_family(family, variants)
+        finally:
+            if not keep:
+                cr.execute('ROLLBACK TO SAVEPOINT bom_automation_benchmark')
+                self.env.invalidate_all()
+            cr.execute('RELEASE SAVEPOINT bom_automation_benchmark')
+
+        if output:
+            with open(output, 'w') as fh:
+                json.dump(report, fh, indent=2)
+        _logger.info("BOM benchmark finished: %s", json.dumps(report))
+        return report
+
+    def _seed_benchmark_catalogue(self):
+        """ Create the catalogue products and work centres the generators rely on """
+        Product = self.env['product.product']
+        unit = self.env.ref('uom.product_uom_unit')
+        names = [name for group in BENCHMARK_CATALOGUE.values() for name in group]
+        existing = set(Product.search([('name', 'in', names)]).mapped('name'))
+        for name in names:
+            if name not in existing:
+                Product.create({
+                    'name': name,
+                    'type': 'consu',
+                    'is_storable': True,
+                    'uom_id': unit.id,
+                })
+
+        Workcenter = self.env['mrp.workcenter']
+        max_id = Workcenter.with_context(active_test=False).search([], order='id desc', limit=1).id or 0
+        while max_id < BENCHMARK_WORKCENTER_MAX_ID:
+            max_id = Workcenter.create({'name': f"Benchmark Work Centre {max_id + 1}"}).id
+
+    def _get_benchmark_template(self, family):
+        """ Create a template for the family with dynamic variants """
+        Attribute = self.env['product.attribute']
+        line_vals = []
+        for attr_name, value_names in BENCHMARK_FAMILIES[family].items():
+            attribute = Attribute.search([('name', '=', attr_name)], limit=1)
+            if not attribute:
+                attribute = Attribute.create({'name': attr_name, 'create_variant': 'dynamic'})
+            values = self.env['product.attribute.value']
+            for value_name in value_names:
+                value = attribute.value_ids.filtered(lambda v: v.name == value_name)[:1]
+                if not value:
+                    value = value.create({'name': value_name, 'attribute_id': attribute.id})
+                values |= value
+            line_vals.append((0, 0, {'attribute_id': attribute.id, 'value_ids': [(6, 0, values.ids)]}))
+        return self.env['product.template'].create({
+            'name': family,
+            'type': 'consu',
+            'attribute_line_ids': line_vals,
+        })
+
+    def _benchmark_family(self, family, variants):
+        template = self._get_benchmark_template(family)
+        lines = template.attribute_line_ids
+        combinations = itertools.islice(
+            itertools.product(*[line.product_template_value_ids for line in lines]),
+            variants,
+        )
+        cr = self.env.cr
+        template = template.with_context(skip_variant_creation_email=True)
+
+        wall_times, query_counts, errors = [], [], []
+        tracemalloc.start()
+        try:
+            for combination in combinations:
+                combination = self.env['product.template.attribute.value'].concat(*combination)
+                queries_before = cr.sql_log_count
+                started = time.perf_counter()
+                try:
+                    with cr.savepoint():
+                        template._create_product_variant(combination)
+                        self.env.flush_all()
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                wall_times.append((time.perf_counter() - started) * 1000)
+                query_counts.append(cr.sql_log_count - queries_before)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'variants': len(wall_times),
+            'errors': len(errors),
+            'first_error': errors[0] if errors else None,
+            'wall_time_ms': _summary(wall_times),
+            'queries_per_variant': _summary(query_counts),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
@@ -0,0 +1,69 @@
+from odoo import models
+import logging
+import time
+_logger = logging.getLogger(__name__)
+
+# 'eager' builds the caches when the registry loads, 'lazy' on first use
+WARMUP_PARAM = 'bom_automation.warmup'
+WARMUP_BUDGET_PARAM = 'bom_automation.warmup_budget'
+WARMUP_BUDGET = 5.0
+WARMUP_XMLIDS = (
+    'uom.product_uom_meter',
+    'uom.product_uom_unit',
+    'general_ledger.product_variant_creation_email_template',
+)
+WARMUP_TEETH_FILES = ('core_barrel_teeth_qty.csv',)
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    def _register_hook(self):
+        super()._register_hook()
+        ICP = self.env['ir.config_parameter'].sudo()
+        if (ICP.get_param(WARMUP_PARAM) or 'eager') != 'eager':
+            return
+        try:
+            budget = float(ICP.get_param(WARMUP_BUDGET_PARAM) or WARMUP_BUDGET)
+        except ValueError:
+            budget = WARMUP_BUDGET
+        self._warmup_bom_caches(budget)
+
+    def _get_bom_warmup_steps(self):
+        """ return: [(name, callable)] building the registry caches of the generators, cheapest first """
+        return [
+            ('uom and template xmlids', lambda: [self.env.ref(xmlid, raise_if_not_found=False) for xmlid in WARMUP_XMLIDS]),
+            ('teeth tables', lambda: [self._load_teeth_data(filename) for filename in WARMUP_TEETH_FILES]),
+            ('high tensile adapter table', lambda: self._get_hta_table()),
+            ('tremie pipe table', lambda: self._fill_tre_pipe_table()),
+            ('permanent casing index', lambda: self._get_permanent_casing_index()),
+            ('teeth table', lambda: self._fill_teeth_table()),
+        ]
+
+    def _warmup_bom_caches(self, budget=WARMUP_BUDGET):
+        """
+            Build the caches of the BOM generators so the first variant of a
+            worker does not pay for them. Steps starting after `budget` seconds
+            are left to fill lazily. With preloaded databases the master warms
+            them once and every forked worker inherits them.
+        """
+        started = time.perf_counter()
+        done, skipped = [], []
+        for name, step in self._get_bom_warmup_steps():
+            if time.perf_counter() - started > budget:
+                skipped.append(name)
+                continue
+            step_started = time.perf_counter()
+            try:
+                with self.env.cr.savepoint():
+                    step()
+            except Exception:
+                _logger.warning("BOM automation warm-up step %s failed", name, exc_info=True)
+                skipped.append(name)
+                continue
+            done.append("%s %.0fms" % (name, (time.perf_counter() - step_started) * 1000))
+        _logger.info(
+            "BOM automation warm-up in %.0fms: %s%s",
+            (time.perf_counter() - started) * 1000, ", ".join(done) or "nothing",
+            "; over budget, left lazy: %s" % ", ".join(skipped) if skipped else "",
+        )
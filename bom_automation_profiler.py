@@ -0,0 +1,142 @@
+from odoo import api, fields, models
+from collections import Counter
+from contextlib import contextmanager
+import base64
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+_logger = logging.getLogger(__name__)
+
+# System parameter holding the number of variant creations left to profile
+PROFILE_PARAM = 'bom_automation.profile_next'
+# Context key profiling every create it is set on
+PROFILE_CONTEXT_KEY = 'bom_automation_profile'
+SAMPLE_INTERVAL = 0.005
+# Milliseconds a create waits for the counter row another create is decrementing
+PROFILE_LOCK_TIMEOUT = 200
+
+_local = threading.local()
+
+
+class StackSampler(threading.Thread):
+    """ Sample the stack of a thread at a fixed interval, collapsed for flame graphs """
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(name='bom-automation-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append("%s:%s" % (os.path.basename(code.co_filename), code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return "\n".join("%s %d" % (stack, count) for stack, count in self.stacks.most_common())
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if getattr(_local, 'profiling', False) or not self._bom_profile_requested(len(vals_list)):
+            return super().create(vals_list)
+        with self._bom_profile(len(vals_list)):
+            return super().create(vals_list)
+
+    @api.model
+    def _bom_profile_requested(self, count=1):
+        """
+            Cheap check: a context key, else the (cached) system parameter. While
+            it is above zero, the counter is decremented in its own short READ
+            COMMITTED transaction: concurrent creates queue for a few ms on the
+            row instead of failing on serialization, and the create transaction
+            never holds the row lock. The cached parameter is cleared once the
+            counter is spent, so the workers stop decrementing it.
+        """
+        if self.env.context.get(PROFILE_CONTEXT_KEY):
+            return True
+        remaining = self.env['ir.config_parameter'].sudo().get_param(PROFILE_PARAM)
+        if not remaining or remaining == '0':
+            return False
+        row = None
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+                cr.execute("SET LOCAL lock_timeout = %s", [PROFILE_LOCK_TIMEOUT])
+                cr.execute("""
+                    UPDATE ir_config_parameter
+                       SET value = GREATEST(value::int - %s, 0)::varchar
+                     WHERE key = %s
+                       AND CASE WHEN value ~ '^[0-9]+$' THEN value::int ELSE 0 END > 0
+                 RETURNING value
+                """, [count, PROFILE_PARAM])
+                row = cr.fetchone()
+        except Exception as e:
+            _logger.debug("BOM automation profile counter not decremented: %s", e)
+            return False
+        if not row or row[0] == '0':
+            # spent here or by another worker: drop the cached value
+            self.env.registry.clear_cache()
+        return bool(row)
+
+    @contextmanager
+    def _bom_profile(self, count):
+        """ Run cProfile and a stack sampler around create and store both as attachments """
+        profile = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        _local.profiling = True
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            sampler.stop()
+            _local.profiling = False
+            try:
+                self._store_bom_profile(profile, sampler, count, elapsed)
+            except Exception:
+                _logger.exception("Could not store the BOM automation profile")
+
+    def _store_bom_profile(self, profile, sampler, count, elapsed):
+        profile.create_stats()
+        stamp = fields.Datetime.now().strftime('%Y%m%d-%H%M%S')
+        name = "bom_profile_%s_%dvariants" % (stamp, count)
+        self.env['ir.attachment'].sudo().create([{
+            'name': name + '.prof',
+            'datas': base64.b64encode(marshal.dumps(profile.stats)),
+            'mimetype': 'application/octet-stream',
+            'res_model': 'product.product',
+            'description': "cProfile stats (pstats.Stats) of %d variant creation(s), %.3fs" % (count, elapsed),
+        }, {
+            'name': name + '.collapsed.txt',
+            'raw': sampler.collapsed().encode(),
+            'mimetype': 'text/plain',
+            'res_model': 'product.product',
+            'description': "Collapsed stacks sampled every %dms, for flamegraph.pl / speedscope" % (SAMPLE_INTERVAL * 1000),
+        }])
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(15)
+        _logger.info("BOM automation profile %s (%.3fs):\n%s", name, elapsed, summary.getvalue())
@@ -0,0 +1,264 @@
+from odoo import api, fields, models
+from contextlib import contextmanager
+from datetime import timedelta
+import logging
+import random
+import statistics
+import threading
+import time
+_logger = logging.getLogger(__name__)
+
+# Buffered samples are written to bom.automation.stat once either limit is hit
+STAT_FLUSH_INTERVAL = 60
+STAT_FLUSH_CALLS = 500
+# Wall time samples kept per (family, step) bucket for the percentiles, a
+# uniform reservoir of all the calls of the flush window
+STAT_MAX_SAMPLES = 200
+
+# Dispatchers of product.product create and the template they build BOMs for
+DISPATCHER_FAMILIES = {
+    '_create_bom_for_variant': 'Core Barrel',
+    '_create_tre_pipe': 'Tremie Pipe Trial',
+    '_create_cleaning_bucket': 'Cleaning Bucket',
+    '_create_drilling_barrel': 'Drilling Barrel',
+    '_create_bored_pile': 'Bored Pile Auger',
+    '_create_pile_casing': 'Pile Casing Stock',
+    '_create_bom_for_extension_bar': 'Extension Bar',
+    '_create_bom_for_high_tensile_adapter': 'High Tensile Adapter',
+    '_create_bom_for_cfa_auger': 'CFA Auger',
+}
+
+_buffer_lock = threading.Lock()
+_buffer = {}  # {dbname: {(family, step): [calls, queries, query_ms, python_ms, samples]}}
+_last_flush = {}  # {dbname: monotonic time of the last flush}
+_local = threading.local()
+
+
+def _record(dbname, family, step, queries, query_ms, wall_ms):
+    with _buffer_lock:
+        buckets = _buffer.setdefault(dbname, {})
+        bucket = buckets.setdefault((family, step), [0, 0, 0.0, 0.0, []])
+        bucket[0] += 1
+        bucket[1] += queries
+        bucket[2] += query_ms
+        bucket[3] += max(wall_ms - query_ms, 0.0)
+        if len(bucket[4]) < STAT_MAX_SAMPLES:
+            bucket[4].append(wall_ms)
+        else:
+            # reservoir sampling: the n-th call replaces a sample with probability MAX / n
+            index = random.randrange(bucket[0])
+            if index < STAT_MAX_SAMPLES:
+                bucket[4][index] = wall_ms
+
+
+class BomAutomationStat(models.Model):
+    _name = 'bom.automation.stat'
+    _description = 'BOM Automation Stat'
+    _order = 'id desc'
+
+    family = fields.Char(required=True, index=True)
+    step = fields.Char(required=True)
+    calls = fields.Integer()
+    queries = fields.Integer()
+    query_time = fields.Float(string='Query Time (ms)')
+    python_time = fields.Float(string='Python Time (ms)')
+    samples = fields.Text(help="Comma separated wall times (ms) of the calls in this bucket")
+
+    @contextmanager
+    def _measure(self, step, family=None):
+        """
+            Record query count, query time and python time of the wrapped block
+            under the family of the variant being generated.
+        """
+        family = family or getattr(_local, 'family', None)
+        if not family:
+            yield
+            return
+        cr = self.env.cr
+        thread = threading.current_thread()
+        queries = cr.sql_log_count
+        query_time = getattr(thread, 'query_time', 0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000
+            query_ms = (getattr(thread, 'query_time', 0.0) - query_time) * 1000
+            queries = cr.sql_log_count - queries
+            _record(cr.dbname, family, step, queries, query_ms, wall_ms)
+            trace = getattr(_local, 'trace', None)
+            if trace is not None:
+                trace.append((step, queries, query_ms, wall_ms - query_ms))
+
+    @contextmanager
+    def _measure_variant(self, dispatcher, product):
+        """ Measure a create dispatcher, only for the family it generates """
+        family = DISPATCHER_FAMILIES[dispatcher]
+        if (product.product_tmpl_id.name or '').strip().lower() != family.lower():
+            yield
+            return
+        previous = getattr(_local, 'family', None), getattr(_local, 'trace', None)
+        _local.family = family
+        _local.trace = [] if self.env.context.get('bom_automation_trace') else None
+        try:
+            with self._measure(dispatcher, family):
+                yield
+        finally:
+            if _local.trace is not None:
+                _logger.info(
+                    "BOM trace %s [%s]:\n%s", product.display_name, family,
+                    "\n".join(
+                        "  %-40s queries=%-4d sql=%8.2fms python=%8.2fms" % line
+                        for line in _local.trace
+                    ),
+                )
+            _local.family, _local.trace = previous
+
+    @api.model
+    def _flush_if_due(self):
+        dbname = self.env.cr.dbname
+        now = time.monotonic()
+        with _buffer_lock:
+            buckets = _buffer.get(dbname)
+            if not buckets:
+                return
+            calls = sum(bucket[0] for bucket in buckets.values())
+            if calls < STAT_FLUSH_CALLS and now - _last_flush.setdefault(dbname, now) < STAT_FLUSH_INTERVAL:
+                return
+            _buffer[dbname] = {}
+            _last_flush[dbname] = now
+        self.sudo().create([{
+            'family': family,
+            'step': step,
+            'calls': bucket[0],
+            'queries': bucket[1],
+            'query_time': bucket[2],
+            'python_time': bucket[3],
+            'samples': ",".join("%.1f" % s for s in bucket[4]),
+        } for (family, step), bucket in buckets.items()])
+
+    @api.model
+    def get_breakdown(self, days=7, family=None):
+        """
+            return: per family and step, the call count, average queries,
+            SQL and python time and the p50/p95 wall time in ms
+        """
+        domain = [('create_date', '>=', fields.Datetime.now() - timedelta(days=days))]
+        if family:
+            domain.append(('family', '=', family))
+        groups = {}
+        for stat in self.search(domain):
+            group = groups.setdefault((stat.family, stat.step), [0, 0, 0.0, 0.0, []])
+            group[0] += stat.calls
+            group[1] += stat.queries
+            group[2] += stat.query_time
+            group[3] += stat.python_time
+            group[4].extend(float(s) for s in (stat.samples or '').split(',') if s)
+
+        breakdown = []
+        for (family, step), (calls, queries, query_ms, python_ms, samples) in sorted(groups.items()):
+            if len(samples) > 1:
+                cuts = statistics.quantiles(samples, n=20, method='inclusive')
+                p50, p95 = statistics.median(samples), cuts[18]
+            else:
+                p50 = p95 = samples[0] if samples else 0.0
+            breakdown.append({
+                'family': family,
+                'step': step,
+                'calls': calls,
+                'avg_queries': round(queries / calls, 1) if calls else 0.0,
+                'avg_query_ms': round(query_ms / calls, 2) if calls else 0.0,
+                'avg_python_ms': round(python_ms / calls, 2) if calls else 0.0,
+                'p50_ms': round(p50, 2),
+                'p95_ms': round(p95, 2),
+            })
+        return breakdown
+
+
+class MrpBom(models.Model):
+    _inherit = 'mrp.bom'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        with self.env['bom.automation.stat']._measure('mrp.bom.create'):
+            return super().create(vals_list)
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        products = super().create(vals_list)
+        self.env['bom.automation.stat']._flush_if_due()
+        return products
+
+    # Dispatchers
+
+    def _create_bom_for_variant(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_bom_for_variant', product):
+            return super()._create_bom_for_variant(product)
+
+    def _create_tre_pipe(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_tre_pipe', product):
+            return super()._create_tre_pipe(product)
+
+    def _create_cleaning_bucket(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_cleaning_bucket', product):
+            return super()._create_cleaning_bucket(product)
+
+    def _create_drilling_barrel(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_drilling_barrel', product):
+            return super()._create_drilling_barrel(product)
+
+    def _create_bored_pile(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_bored_pile', product):
+            return super()._create_bored_pile(product)
+
+    def _create_pile_casing(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_pile_casing', product):
+            return super()._create_pile_casing(product)
+
+    def _create_bom_for_extension_bar(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_bom_for_extension_bar', product):
+            return super()._create_bom_for_extension_bar(product)
+
+    def _create_bom_for_high_tensile_adapter(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_bom_for_high_tensile_adapter', product):
+            return super()._create_bom_for_high_tensile_adapter(product)
+
+    def _create_bom_for_cfa_auger(self, product):
+        with self.env['bom.automation.stat']._measure_variant('_create_bom_for_cfa_auger', product):
+            return super()._create_bom_for_cfa_auger(product)
+
+    # Resolver steps
+
+    def _resolve_bp_flight_attr(self, value):
+        with self.env['bom.automation.stat']._measure('flight resolution'):
+            return super()._resolve_bp_flight_attr(value)
+
+    def _find_flight_product(self, *args, **kwargs):
+        with self.env['bom.automation.stat']._measure('flight matching'):
+            return super()._find_flight_product(*args, **kwargs)
+
+    def _search_bom_component(self, component_name, operator='=ilike'):
+        with self.env['bom.automation.stat']._measure('component search'):
+            return super()._search_bom_component(component_name, operator=operator)
+
+    def _search_bom_components(self, component_names, operator='=ilike'):
+        with self.env['bom.automation.stat']._measure('component search'):
+            return super()._search_bom_components(component_names, operator=operator)
+
+    def _get_or_create_bom_components(self, component_uoms, operator='=ilike'):
+        with self.env['bom.automation.stat']._measure('component upsert'):
+            return super()._get_or_create_bom_components(component_uoms, operator=operator)
+
+    def _create_bom_placeholder(self, component_name, uom):
+        with self.env['bom.automation.stat']._measure('placeholder creation'):
+            return super()._create_bom_placeholder(component_name, uom)
+
+    # Generator stages
+
+    def _get_cfa_stage(self, stage, *args):
+        with self.env['bom.automation.stat']._measure('cfa stage %s' % stage):
+            return super()._get_cfa_stage(stage, *args)
@@ -0,0 +1,309 @@
+from odoo import SUPERUSER_ID, api, models
+from odoo.tools import config
+import bisect
+import fcntl
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+_logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'BOMSNAP1'
+SNAPSHOT_FORMAT = 2
+# Seconds between two watermark checks of a worker, and minimum age of a
+# snapshot before it is rebuilt: every variant advances the watermark. The
+# rebuild runs in a background thread, the requests keep the current mapping.
+SNAPSHOT_CHECK_INTERVAL = 5
+SNAPSHOT_REBUILD_AGE = 60
+
+# magic, format, built at, watermark date, watermark count,
+# (count, offset) of the flight, component and tube tables
+HEADER = struct.Struct('<8sIddQIQIQIQ')
+# od, pitch, thickness, rotation (0 RH, 1 LH), turns, inner diameter, product id
+FLIGHT = struct.Struct('<iiiidii')
+# name offset, name length, product id
+COMPONENT = struct.Struct('<III')
+# name offset, name length, kind, od, wall thickness, inner diameter, from the stored tube fields
+TUBE = struct.Struct('<IIiddd')
+
+ROTATIONS = {'RH': 0, 'LH': 1}
+TUBE_KINDS = ('hollow_bar', 'pipe')
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+class _Table:
+    """ Read-only sequence over fixed-size records of the mapping, for bisect """
+
+    def __init__(self, mm, record, offset, count, key=None):
+        self.mm, self.record, self.offset, self.count = mm, record, offset, count
+        self.key = key or (lambda values: values)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return self.key(self.record.unpack_from(self.mm, self.offset + index * self.record.size))
+
+
+class CatalogueSnapshot:
+    """
+        Versioned binary snapshot of the BOM catalogue shared by the workers
+        through a read-only memory map. A worker rebuilds it in a temporary
+        file under an exclusive lock and swaps it in with os.replace; the
+        others notice the new inode and remap it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mm = None
+        self.header = None
+        self.stat = None
+        self.checked = 0.0
+        self.rebuilding = None
+
+    def _map(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self.mm = self.header = self.stat = None
+            return
+        if self.stat == (st.st_ino, st.st_mtime_ns, st.st_size):
+            return
+        with open(self.path, 'rb') as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(mm, 0)
+        if header[0] != SNAPSHOT_MAGIC or header[1] != SNAPSHOT_FORMAT:
+            _logger.warning("Ignoring BOM catalogue snapshot %s of an unknown format", self.path)
+            mm.close()
+            return
+        # the previous mapping is released once no lookup holds it anymore
+        self.mm, self.header = mm, header
+        self.stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+        _logger.debug("Mapped BOM catalogue snapshot %s built at %s", self.path, header[2])
+
+    def ensure_fresh(self, registry):
+        """
+            Remap a newer file, and rebuild it in the background when the
+            catalogue may have moved past its watermark. Never blocks the request.
+        """
+        now = time.time()
+        if now - self.checked < SNAPSHOT_CHECK_INTERVAL:
+            return
+        self.checked = now
+        self._map()
+        if self.header and now - self.header[2] < SNAPSHOT_REBUILD_AGE:
+            return
+        with _snapshots_lock:
+            if self.rebuilding is not None and self.rebuilding.is_alive():
+                return
+            self.rebuilding = threading.Thread(
+                target=self._rebuild_in_background, args=(registry,),
+                name='bom-catalogue-snapshot', daemon=True,
+            )
+            self.rebuilding.start()
+
+    def _read_file_watermark(self):
+        """ return: the watermark of the file on disk, None if there is none """
+        try:
+            with open(self.path, 'rb') as fh:
+                header = HEADER.unpack(fh.read(HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return None
+        if header[0] != SNAPSHOT_MAGIC or header[1] != SNAPSHOT_FORMAT:
+            return None
+        return header[3], header[4]
+
+    def _rebuild_in_background(self, registry):
+        """ The mapping is left alone here: ensure_fresh picks the new file up """
+        try:
+            with registry.cursor() as cr:
+                watermark = _read_watermark(cr)
+                if self._read_file_watermark() == watermark:
+                    return
+                self._rebuild(api.Environment(cr, SUPERUSER_ID, {}), watermark)
+        except Exception:
+            _logger.warning("BOM catalogue snapshot rebuild failed", exc_info=True)
+
+    def _rebuild(self, env, watermark):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.lock', 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # another worker is rebuilding it
+            if self._read_file_watermark() == watermark:
+                return
+            started = time.perf_counter()
+            data = _build_snapshot(env, watermark)
+            tmp_path = '%s.%d.tmp' % (self.path, os.getpid())
+            with open(tmp_path, 'wb') as fh:
+                fh.write(data)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.path)
+            _logger.info(
+                "BOM catalogue snapshot rebuilt in %.0fms (%d bytes)",
+                (time.perf_counter() - started) * 1000, len(data),
+            )
+
+    def find_flight(self, key, base_id):
+        """ return: (product id, inner diameter) of the first flight of `key` with base_id <= ID <= base_id + 5 """
+        mm, header = self.mm, self.header
+        table = _Table(mm, FLIGHT, header[6], header[5], key=lambda values: values[:6])
+        index = bisect.bisect_left(table, key + (base_id,))
+        if index < len(table):
+            values = FLIGHT.unpack_from(mm, header[6] + index * FLIGHT.size)
+            if values[:5] == key and values[5] <= base_id + 5:
+                return values[6], values[5]
+        return None, None
+
+    def _find_name(self, record, offset, count, name):
+        mm = self.mm
+        table = _Table(mm, record, offset, count, key=lambda values: mm[values[0]:values[0] + values[1]])
+        key = name.lower().encode()
+        index = bisect.bisect_left(table, key)
+        if index < count:
+            values = record.unpack_from(mm, offset + index * record.size)
+            if mm[values[0]:values[0] + values[1]] == key:
+                return values
+        return None
+
+    def find_component(self, name):
+        """ return: id of the first product named `name` case-insensitively """
+        values = self._find_name(COMPONENT, self.header[8], self.header[7], name)
+        return values[2] if values else None
+
+    def find_tube(self, name):
+        """ return: {'kind', 'od', 'id', 'wt'} stored on the hollow bar / pipe named `name`, None if unknown """
+        values = self._find_name(TUBE, self.header[10], self.header[9], name)
+        if not values:
+            return None
+        return {'kind': TUBE_KINDS[values[2]], 'od': values[3], 'id': values[5], 'wt': values[4]}
+
+
+def _read_watermark(cr):
+    cr.execute("""
+        SELECT GREATEST(
+                   (SELECT max(write_date) FROM product_product),
+                   (SELECT max(write_date) FROM product_template)
+               ),
+               (SELECT count(*) FROM product_product WHERE active)
+    """)
+    write_date, count = cr.fetchone()
+    return (write_date.timestamp() if write_date else 0.0), count
+
+
+def _build_snapshot(env, watermark):
+    Product = env['product.product']
+    flights, components, tubes = [], {}, {}
+    for product in Product.search([]):
+        name = product.name or ''
+        key = name.lower().encode()
+        components.setdefault(key, product.id)
+        if 'flight -' in name.lower():
+            spec = Product._parse_flight_spec(name)
+            if spec is not None and spec['rotation'] in ROTATIONS:
+                turns = float(spec['no_turns'][1:]) if spec['no_turns'] else 0.0
+                flights.append((
+                    spec['od'], spec['pitch'], spec['thickness'], ROTATIONS[spec['rotation']],
+                    turns, spec['id'], product.id,
+                ))
+        elif key not in tubes and product.tube_kind in TUBE_KINDS:
+            tubes[key] = (TUBE_KINDS.index(product.tube_kind), product.tube_od, product.tube_wt, product.tube_id)
+    # stable sort: equal flights keep the product order of the original search
+    flights.sort(key=lambda values: values[:6])
+
+    blob, names = bytearray(), {}
+    for key in sorted(components):
+        names[key] = len(blob)
+        blob += key
+    flight_offset = HEADER.size
+    component_offset = flight_offset + len(flights) * FLIGHT.size
+    tube_offset = component_offset + len(components) * COMPONENT.size
+    blob_offset = tube_offset + len(tubes) * TUBE.size
+
+    data = bytearray(HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, time.time(), watermark[0], watermark[1],
+        len(flights), flight_offset, len(components), component_offset, len(tubes), tube_offset,
+    ))
+    for values in flights:
+        data += FLIGHT.pack(*values)
+    for key in sorted(components):
+        data += COMPONENT.pack(blob_offset + names[key], len(key), components[key])
+    for key in sorted(tubes):
+        data += TUBE.pack(blob_offset + names[key], len(key), *tubes[key])
+    data += blob
+    return bytes(data)
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    def _get_bom_snapshot(self):
+        """ return: the fresh catalogue snapshot of the database, None when it cannot be used """
+        dbname = self.env.cr.dbname
+        with _snapshots_lock:
+            snapshot = _snapshots.get(dbname)
+            if snapshot is None:
+                path = os.path.join(config['data_dir'], 'bom_automation', '%s.snapshot' % dbname)
+                snapshot = _snapshots[dbname] = CatalogueSnapshot(path)
+        try:
+            snapshot.ensure_fresh(self.env.registry)
+        except Exception:
+            _logger.warning("BOM catalogue snapshot unavailable", exc_info=True)
+            snapshot.checked = time.time()
+        return snapshot if snapshot.mm is not None else None
+
+    def _find_flight_product(self, base_id, od, pitch, thickness, rotation, no_turns):
+        snapshot = self._get_bom_snapshot()
+        turns = float(no_turns[1:]) if re.fullmatch(r'R\d+(?:\.\d+)?', no_turns or '') else 0.0
+        if snapshot is None or (no_turns or '') != (f"R{turns}" if no_turns else ''):
+            return super()._find_flight_product(base_id, od, pitch, thickness, rotation, no_turns)
+        if rotation.upper() not in ROTATIONS:
+            return None, None
+        product_id = snapshot.find_flight((od, pitch, thickness, ROTATIONS[rotation.upper()], turns), base_id)[0]
+        if product_id is not None:
+            product = self.env['product.product'].browse(product_id).exists()
+            # the snapshot may predate an edit of the flight, trust it only while the record agrees
+            if product and product.active and product.is_flight and (
+                product.flight_od, product.flight_pitch, product.flight_thickness,
+                product.flight_rotation, product.flight_turns or '',
+            ) == (od, pitch, thickness, rotation.upper(), no_turns or '') and (
+                base_id <= product.flight_id_value <= base_id + 5
+            ):
+                return product, product.flight_id_value
+        return super()._find_flight_product(base_id, od, pitch, thickness, rotation, no_turns)
+
+    def _search_bom_components(self, component_names, operator='=ilike'):
+        snapshot = self._get_bom_snapshot()
+        names = {name for name in component_names if name}
+        if snapshot is None:
+            return super()._search_bom_components(names, operator=operator)
+        hits = {
+            name: snapshot.find_component(name)
+            for name in names
+            if operator == '=' or not ('%' in name or '_' in name)
+        }
+        hits = {name: product_id for name, product_id in hits.items() if product_id}
+        # the snapshot may be behind the catalogue: keep the hits still matching
+        found = self.env['product.product'].browse(set(hits.values())).exists()
+        found = {product.id: product for product in found if product.active}
+        products = {}
+        for name, product_id in hits.items():
+            product = found.get(product_id)
+            if product and (product.name == name if operator == '=' else product.name.lower() == name.lower()):
+                products[name] = product
+        missing = names - set(products)
+        if missing:
+            products.update(super()._search_bom_components(missing, operator=operator))
+        return products
+
+    def _get_tube_geometry(self, name):
+        snapshot = self._get_bom_snapshot()
+        geometry = snapshot.find_tube(name) if snapshot is not None and name else None
+        return geometry or super()._get_tube_geometry(name)
@@ -0,0 +1,89 @@
+from odoo import api, fields, models
+from odoo.exceptions import ConcurrencyError
+import logging
+_logger = logging.getLogger(__name__)
+
+# First key of the advisory locks claiming a component key, its hashtext is the second
+PLACEHOLDER_LOCK_KEY = 0x424f4d4b
+
+
+class BomComponentKey(models.Model):
+    _name = 'bom.component.key'
+    _description = 'BOM Component Key'
+    _rec_name = 'key'
+
+    key = fields.Char(required=True, help="Component name, lowercased unless it is matched case-sensitively")
+    product_id = fields.Many2one('product.product', ondelete='cascade')
+
+    _sql_constraints = [
+        ('key_unique', 'unique(key)', "A component key must be unique."),
+    ]
+
+    @api.model
+    def _get_or_create_placeholders(self, component_uoms, case_sensitive=False):
+        """
+            Get-or-create the placeholders of components missing from the catalogue.
+
+            Each key is claimed with a transaction level advisory lock, taken with
+            pg_try_advisory_xact_lock so a configurator never waits on another one.
+            A key claimed by another running transaction names a placeholder this
+            one could not see even once committed (repeatable read), so instead of
+            creating a duplicate it fails right away with a ConcurrencyError and the
+            request is retried, finding the committed placeholder. The same goes for
+            a key recorded since this transaction started: its upsert raises a
+            serialization failure. A placeholder is therefore only created once.
+            The product stored on a key is reused only while it is active and still
+            named after it, otherwise the key is repointed to a new placeholder.
+            component_uoms: {component name: uom of its placeholder}
+            return: {component name: product}
+        """
+        Product = self.env['product.product']
+        to_key = str if case_sensitive else str.lower
+        keys = {name: to_key(name) for name in component_uoms}
+        self.env.cr.execute("""
+            SELECT key
+              FROM unnest(%s::varchar[]) AS key
+             WHERE NOT pg_try_advisory_xact_lock(%s, hashtext(key))
+        """, [sorted(set(keys.values())), PLACEHOLDER_LOCK_KEY])
+        busy = [key for key, in self.env.cr.fetchall()]
+        if busy:
+            raise ConcurrencyError("BOM placeholders being created by another transaction: %s" % ", ".join(busy))
+        self.env.cr.execute(
+            "SELECT key, product_id FROM bom_component_key WHERE key = ANY(%s) AND product_id IS NOT NULL",
+            [list(set(keys.values()))],
+        )
+        stored = dict(self.env.cr.fetchall())
+        # archived or renamed since: the key is stale
+        active = {
+            product.id: product
+            for product in Product.with_context(active_test=False).browse(set(stored.values())).exists()
+            if product.active and product.name
+        }
+        known = {
+            key: active[product_id] for key, product_id in stored.items()
+            if product_id in active and to_key(active[product_id].name) == key
+        }
+
+        products, created = {}, {}
+        for name, uom in component_uoms.items():
+            key = keys[name]
+            product = known.get(key) or created.get(key)
+            if not product:
+                product = created[key] = Product._create_bom_placeholder(name, uom)
+            products[name] = product
+
+        if created:
+            self.env.cr.execute("""
+                INSERT INTO bom_component_key (key, product_id, create_uid, create_date, write_uid, write_date)
+                     SELECT key, product_id, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+                       FROM unnest(%(keys)s::varchar[], %(product_ids)s::int[]) AS t(key, product_id)
+                ON CONFLICT (key) DO UPDATE
+                        SET product_id = EXCLUDED.product_id, write_uid = EXCLUDED.write_uid, write_date = EXCLUDED.write_date
+            """, {
+                'uid': self.env.uid,
+                'keys': list(created),
+                'product_ids': [product.id for product in created.values()],
+            })
+            _logger.info("BOM placeholders created: %s", ", ".join(p.name for p in created.values()))
+        self.invalidate_model(['product_id'])
+        return products
@@ -0,0 +1,465 @@
+"""
+    Golden corpus harness for the BOM generators.
+
+    Feeds the recorded attribute sets of golden/corpus.json through every
+    generation of the generators (bom_automation_v1, v2, v13 and the live
+    product_product + product_bom models) under a stub Odoo environment,
+    diffs the BOM components against golden/<version>.json and times each
+    version. The recorded flight quantity calls are also fed through their
+    batched engines, which must match the scalar functions exactly.
+
+        python bom_golden_harness.py                 # diff + timings
+        python bom_golden_harness.py --update        # re-record golden files
+        python bom_golden_harness.py --versions live --repeat 20
+
+    The components are captured where the dispatchers hand them over to the
+    BOM builders, so nothing is created and no database is needed.
+    bom_automation_v1.py is a pasted fragment of methods: it is repaired
+    (stray web UI text, shifted indentation) and layered over v2, which
+    provides the helpers the fragment relies on.
+"""
+import argparse
+import functools
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(HERE, 'golden')
+VERSIONS = ('v1', 'v2', 'v13', 'live')
+
+DISPATCHERS = (
+    '_create_bom_for_variant',
+    '_create_tre_pipe',
+    '_create_cleaning_bucket',
+    '_create_drilling_barrel',
+    '_create_bored_pile',
+    '_create_pile_casing',
+    '_create_bom_for_extension_bar',
+    '_create_bom_for_high_tensile_adapter',
+    '_create_bom_for_cfa_auger',
+)
+BOM_BUILDERS = ('_create_bom_components', '_create_pcs_bom_components', '_create_cfa_bom_components')
+# (scalar function of the recorded calls, builder of its numeric inputs, batched engine)
+BATCHED_ENGINES = (
+    ('_get_carrier_flight_qty', '_get_cflight_inputs', '_get_cflight_qtys'),
+    ('_get_cfa_carrier_coupling_flight_qty', '_get_cfa_flight_inputs', '_get_cfa_flight_qtys'),
+)
+
+
+# Stub odoo ------------------------------------------------------------------
+
+class ValidationError(Exception):
+    pass
+
+
+class UserError(Exception):
+    pass
+
+
+def _decorator(*args, **kwargs):
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
+
+
+def _ormcache(*keys):
+    """ Registry cache of the generators: the results are kept for the whole run """
+    def decorator(func):
+        cache = {}
+
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            if args not in cache:
+                cache[args] = func(self, *args)
+            return cache[args]
+        return wrapper
+    return decorator
+
+
+class _StubModel:
+    _name = None
+    _inherit = None
+
+
+def _install_stub_odoo():
+    """ Register a minimal odoo package so the model files can be imported """
+    if getattr(sys.modules.get('odoo'), '_bom_stub', False):
+        return
+    odoo = types.ModuleType('odoo')
+    odoo._bom_stub = True
+    api = types.ModuleType('odoo.api')
+    for name in ('model', 'model_create_multi', 'depends', 'depends_context', 'onchange', 'constrains', 'autovacuum'):
+        setattr(api, name, _decorator)
+    fields = types.ModuleType('odoo.fields')
+    fields.__getattr__ = lambda name: (lambda *args, **kwargs: None)
+    models = types.ModuleType('odoo.models')
+    models.Model = models.AbstractModel = models.TransientModel = _StubModel
+    exceptions = types.ModuleType('odoo.exceptions')
+    exceptions.ValidationError = ValidationError
+    exceptions.UserError = UserError
+    tools = types.ModuleType('odoo.tools')
+    tools.file_path = lambda path: os.path.join(GOLDEN_DIR, 'data', os.path.basename(path))
+    tools.ormcache = _ormcache
+    osv = types.ModuleType('odoo.osv')
+    expression = types.ModuleType('odoo.osv.expression')
+    expression.OR = lambda domains: ['|'] * (len(domains) - 1) + [leaf for domain in domains for leaf in domain]
+    osv.expression = expression
+    modules = types.ModuleType('odoo.modules')
+    module = types.ModuleType('odoo.modules.module')
+    module.get_module_resource = lambda module_name, *path: os.path.join(GOLDEN_DIR, 'data', path[-1])
+    modules.module = module
+    odoo.api, odoo.fields, odoo.models = api, fields, models
+    odoo.exceptions, odoo.tools, odoo.modules, odoo.osv = exceptions, tools, modules, osv
+    sys.modules.update({
+        'odoo': odoo, 'odoo.api': api, 'odoo.fields': fields, 'odoo.models': models,
+        'odoo.exceptions': exceptions, 'odoo.tools': tools,
+        'odoo.osv': osv, 'odoo.osv.expression': expression,
+        'odoo.modules': modules, 'odoo.modules.module': module,
+    })
+
+
+# Stub environment -----------------------------------------------------------
+
+def _like_regex(pattern):
+    """ SQL (i)like pattern to a python regex """
+    return ''.join('.*' if c == '%' else '.' if c == '_' else re.escape(c) for c in pattern)
+
+
+class StubRecord:
+    def __init__(self, rid, name):
+        self.id = rid
+        self.name = name
+        self.display_name = name
+
+
+class StubRecordset(list):
+    """ Enough of a recordset for the generators: truthiness, iteration and first record fields """
+
+    def __getattr__(self, name):
+        if name in ('id', 'name', 'display_name'):
+            return getattr(self[0], name) if self else (False if name == 'id' else '')
+        if self and hasattr(self[0], name):
+            return getattr(self[0], name)
+        raise AttributeError(name)
+
+    @property
+    def ids(self):
+        return [record.id for record in self]
+
+
+class StubModel:
+    _order = 'id'
+
+    def __init__(self, records=()):
+        self._records = list(records)
+
+    def _match(self, record, leaf):
+        field, operator, value = leaf
+        current = getattr(record, field, None)
+        if operator == '=':
+            return current == value
+        if operator == '!=':
+            return current != value
+        if operator == 'in':
+            return current in value
+        if operator == '>=':
+            return current is not None and current >= value
+        if operator == '<=':
+            return current is not None and current <= value
+        if operator == '=ilike':
+            return re.fullmatch(_like_regex(value), current or '', re.IGNORECASE | re.DOTALL) is not None
+        if operator == 'ilike':
+            return value.lower() in (current or '').lower()
+        raise NotImplementedError(operator)
+
+    def search(self, domain, limit=None, order=None):
+        found = StubRecordset(
+            r for r in self._records
+            if all(self._match(r, leaf) for leaf in domain if isinstance(leaf, (list, tuple)))
+        )
+        if order:
+            # first order field only, the catalogue order breaks the ties
+            field = order.split(',')[0].split()[0]
+            found = StubRecordset(sorted(found, key=lambda r: getattr(r, field, 0) or 0))
+        return StubRecordset(found[:limit]) if limit else found
+
+    def search_count(self, domain, limit=None):
+        return len(self.search(domain, limit=limit))
+
+    def browse(self, ids):
+        ids = [ids] if isinstance(ids, int) else ids
+        return StubRecordset(r for r in self._records if r.id in ids)
+
+    def sudo(self):
+        return self
+
+    def flush_model(self, fnames=None):
+        pass
+
+
+class StubCursor:
+    """ The catalogue never changes during a run: version queries get one constant row """
+    dbname = 'golden'
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return (None, 0)
+
+
+class StubEnv:
+    def __init__(self, catalogue):
+        products = [StubRecord(i + 1, name) for i, name in enumerate(catalogue)]
+        self._models = {
+            'product.product': StubModel(products),
+            'product.template': StubModel(products),
+        }
+        self.context = {}
+        self.cr = StubCursor()
+        self.lang = 'en_US'
+
+    def __getitem__(self, model):
+        return self._models.setdefault(model, StubModel())
+
+    def ref(self, xmlid, raise_if_not_found=True):
+        return StubRecord(abs(hash(xmlid)) % 1000, xmlid)
+
+
+class StubAttributeValue:
+    """ Both the product.template.attribute.value and its product.attribute.value """
+
+    def __init__(self, attribute, value):
+        self.attribute_id = StubRecord(0, attribute)
+        self.name = value
+        self.product_attribute_value_id = self
+        self.bom_component_id = None
+        # stored numeric fields, as computed from the name in the database
+        parser = getattr(sys.modules.get('bom_live.product_attribute_value'), '_parse_numeric_value', None)
+        number, self.numeric_unit = parser(value) if parser else (None, False)
+        self.has_numeric_value = number is not None
+        self.numeric_value = number or False
+
+    def _set_bom_component(self, product):
+        pass
+
+
+class StubProduct:
+    def __init__(self, template, attributes):
+        values = [StubAttributeValue(a, v) for a, v in attributes.items()]
+        self.id = 1
+        self.product_tmpl_id = StubRecord(1, template)
+        self.name = template
+        self.display_name = "%s (%s)" % (template, ', '.join(attributes.values()))
+        self.product_template_attribute_value_ids = values
+        self.product_template_external_attribute_value_ids = values
+
+
+# Generations ----------------------------------------------------------------
+
+def _load_module(name, path, source=None, package=None):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = package or ''
+    sys.modules[name] = module
+    if source is None:
+        spec.loader.exec_module(module)
+    else:
+        exec(compile(source, path, 'exec'), module.__dict__)
+    return module
+
+
+def _repair_v1_source(path):
+    """ Wrap the v1 method fragment in a class, dropping pasted UI text and stray indentation """
+    lines = []
+    for line in open(path).read().replace('Add commentMore actions', '').split('\n'):
+        indent = len(line) - len(line.lstrip(' '))
+        lines.append(line[1:] if indent % 4 == 1 else line)
+    header = (
+        "from odoo import api, fields, models\n"
+        "from odoo.exceptions import ValidationError\n"
+        "import csv, logging, math, re\n"
+        "_logger = logging.getLogger(__name__)\n"
+        "class ProductProduct(models.Model):\n"
+    )
+    return header + '\n'.join(lines)
+
+
+def load_generation(version):
+    """ return: the generator class of a version, with the BOM builders captured """
+    _install_stub_odoo()
+    if version == 'live':
+        package = types.ModuleType('bom_live')
+        package.__path__ = [HERE]
+        sys.modules['bom_live'] = package
+        bases = tuple(
+            _load_module('bom_live.%s' % name, os.path.join(HERE, name + '.py'), package='bom_live').ProductProduct
+            for name in ('product_bom', 'product_product')
+        )
+        _load_module('bom_live.product_attribute_value', os.path.join(HERE, 'product_attribute_value.py'), package='bom_live')
+    elif version == 'v1':
+        v2 = load_generation('v2').__mro__[1]
+        path = os.path.join(HERE, 'bom_automation_v1.py')
+        bases = (_load_module('bom_automation_v1', path, source=_repair_v1_source(path)).ProductProduct, v2)
+    else:
+        bases = (_load_module('bom_automation_%s' % version, os.path.join(HERE, 'bom_automation_%s.py' % version)).ProductProduct,)
+
+    def _capture(self, product, reference, components, *args, **kwargs):
+        self._captured.append(components)
+
+    return type('Golden%s' % version.upper(), (*bases,), {name: _capture for name in BOM_BUILDERS})
+
+
+def run_case(generator, case):
+    """ return: the components every dispatcher handed to a BOM builder, or the error raised """
+    generator._captured = []
+    product = StubProduct(case['family'], case['attributes'])
+    try:
+        for dispatcher in DISPATCHERS:
+            if hasattr(generator, dispatcher):
+                getattr(generator, dispatcher)(product)
+    except Exception as e:
+        return {'error': '%s: %s' % (type(e).__name__, e)}
+    return json.loads(json.dumps(generator._captured))
+
+
+def run_call(generator, call):
+    """ Call a helper with the recorded arguments its signature accepts """
+    func = getattr(generator, call['function'], None)
+    if func is None:
+        return {'skipped': 'not defined'}
+    params = inspect.signature(func).parameters
+    missing = [p for p, spec in params.items() if spec.default is spec.empty and p not in call['args']]
+    if missing:
+        return {'skipped': 'signature needs %s' % ', '.join(missing)}
+    try:
+        result = func(**{k: v for k, v in call['args'].items() if k in params})
+    except Exception as e:
+        return {'error': '%s: %s' % (type(e).__name__, e)}
+    return json.loads(json.dumps(result))
+
+
+def run_version(version, corpus, repeat=1):
+    generator = load_generation(version)()
+    generator.env = StubEnv(corpus['catalogue'])
+    if hasattr(generator, '_get_flight_geometry_values'):
+        # stored geometry fields, as computed from the names in the database
+        for record in generator.env['product.product']._records:
+            record.__dict__.update(generator._get_flight_geometry_values(record.name))
+    results, timings = {}, {}
+    for _ in range(repeat):
+        for case in corpus['cases']:
+            started = time.perf_counter()
+            results[case['id']] = run_case(generator, case)
+            elapsed = time.perf_counter() - started
+            timings[case['family']] = timings.get(case['family'], 0.0) + elapsed
+        for call in corpus['calls']:
+            started = time.perf_counter()
+            results[call['id']] = run_call(generator, call)
+            timings[call['function']] = timings.get(call['function'], 0.0) + time.perf_counter() - started
+    return results, {k: round(v * 1000 / repeat, 3) for k, v in timings.items()}
+
+
+def check_batched(generator, corpus):
+    """
+        Feed the recorded calls of the scalar flight quantities through their
+        batched engine, all rows at once.
+        return: (rows checked, {call id: (scalar, batched)} for every row that differs)
+    """
+    checked, mismatches = 0, {}
+    for function, builder, engine in BATCHED_ENGINES:
+        if not hasattr(generator, engine):
+            continue
+        rows = []
+        for call in corpus['calls']:
+            if call['function'] != function:
+                continue
+            scalar = run_call(generator, call)
+            inputs = run_call(generator, dict(call, function=builder))
+            if isinstance(scalar, dict) or isinstance(inputs, dict):
+                continue  # raised or skipped by both paths
+            rows.append((call['id'], scalar, inputs))
+        computed = [row for row in rows if row[2] is not None]
+        results = getattr(generator, engine)(*zip(*(row[2] for row in computed))) if computed else []
+        if isinstance(results, tuple):
+            results = list(zip(*results))
+        batched = dict(zip((row[0] for row in computed), json.loads(json.dumps(results))))
+        for call_id, scalar, inputs in rows:
+            # no inputs: the scalar function returns 0 without computing
+            value = batched.get(call_id, 0)
+            checked += 1
+            if value != scalar or type(value) is not type(scalar):
+                mismatches[call_id] = (scalar, value)
+    return checked, mismatches
+
+
+def diff_results(expected, actual):
+    """ return: {case id: (expected, actual)} for every case that differs """
+    return {
+        key: (expected.get(key), actual.get(key))
+        for key in sorted(set(expected) | set(actual))
+        if expected.get(key) != actual.get(key)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--versions', nargs='+', default=list(VERSIONS), choices=VERSIONS)
+    parser.add_argument('--repeat', type=int, default=3, help="timing repetitions of the corpus")
+    parser.add_argument('--update', action='store_true', help="re-record the golden files")
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--verbose', action='store_true', help="show the generators' own log output")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    with open(os.path.join(GOLDEN_DIR, 'corpus.json')) as fh:
+        corpus = json.load(fh)
+
+    report, failed = {}, False
+    for version in args.versions:
+        results, timings = run_version(version, corpus, repeat=args.repeat)
+        golden_path = os.path.join(GOLDEN_DIR, '%s.json' % version)
+        if args.update:
+            with open(golden_path, 'w') as fh:
+                json.dump(results, fh, indent=1, sort_keys=True)
+            diffs = {}
+        else:
+            with open(golden_path) as fh:
+                diffs = diff_results(json.load(fh), results)
+        failed = failed or bool(diffs)
+        report[version] = {
+            'cases': len(results),
+            'errors': sum(1 for r in results.values() if isinstance(r, dict) and 'error' in r),
+            'diffs': len(diffs),
+            'time_ms': round(sum(timings.values()), 3),
+            'time_ms_by_family': timings,
+        }
+        print("%-5s cases=%-4d errors=%-4d diffs=%-4d time=%9.3fms" % (
+            version, len(results), report[version]['errors'], len(diffs), report[version]['time_ms']))
+        for key, (expected, actual) in list(diffs.items())[:10]:
+            print("    %s\n      golden: %s\n      actual: %s" % (key, expected, actual))
+        if version == 'live':
+            generator = load_generation(version)()
+            generator.env = StubEnv(corpus['catalogue'])
+            checked, mismatches = check_batched(generator, corpus)
+            failed = failed or bool(mismatches)
+            report[version]['batched_mismatches'] = len(mismatches)
+            print("      batched engines: rows=%d mismatches=%d" % (checked, len(mismatches)))
+            for key, (scalar, batched) in list(mismatches.items())[:10]:
+                print("    %s\n      scalar:  %s\n      batched: %s" % (key, scalar, batched))
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
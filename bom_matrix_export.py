@@ -0,0 +1,165 @@
+from odoo import fields, models
+import csv
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import xlsxwriter
+_logger = logging.getLogger(__name__)
+
+EXPORT_HEADER = ['Template', 'Variant', 'Component', 'Quantity', 'Error']
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+XLSX_MAX_ROWS = 1048576
+CHUNK_SIZE = 1 << 20
+
+
+class _CsvRowWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_HEADER)
+
+    def writerow(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class _XlsxRowWriter:
+    """ constant_memory workbooks flush every row to disk; a new sheet starts when one is full """
+
+    def __init__(self, path):
+        self.workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        self.sheet = None
+        self.row = XLSX_MAX_ROWS
+
+    def writerow(self, row):
+        if self.row >= XLSX_MAX_ROWS:
+            self.sheet = self.workbook.add_worksheet()
+            self.sheet.write_row(0, 0, EXPORT_HEADER)
+            self.row = 1
+        self.sheet.write_row(self.row, 0, row)
+        self.row += 1
+
+    def close(self):
+        self.workbook.close()
+
+
+class BomMatrixExport(models.TransientModel):
+    _name = 'bom.matrix.export'
+    _description = 'BOM Matrix Export'
+
+    product_tmpl_id = fields.Many2one('product.template', string='Template', required=True)
+    file_format = fields.Selection([('csv', 'CSV'), ('xlsx', 'XLSX')], default='csv', required=True)
+    only_possible = fields.Boolean(default=True, help="Skip combinations excluded on the template")
+    attachment_id = fields.Many2one('ir.attachment', string='File', readonly=True)
+    combination_count = fields.Integer(readonly=True)
+    row_count = fields.Integer(readonly=True)
+    error_count = fields.Integer(readonly=True)
+    rows_per_second = fields.Float(readonly=True)
+
+    def _get_export_name(self):
+        return "%s_%s.%s" % (
+            (self.product_tmpl_id.name or 'template').replace('/', '-').replace(' ', '_'),
+            time.strftime('%Y%m%d-%H%M%S'),
+            self.file_format,
+        )
+
+    def action_export(self):
+        """
+            Stream every BOM the template would produce to a temporary CSV/XLSX
+            file, attach it to the wizard and download it
+        """
+        self.ensure_one()
+        template = self.product_tmpl_id
+        Attachment = self.env['ir.attachment']
+        # in the filestore itself, so the finished file is moved and never copied
+        folder = Attachment._filestore() if Attachment._storage() == 'file' else None
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix='bom_export_', suffix='.' + self.file_format, dir=folder)
+        os.close(fd)
+        try:
+            writer = _XlsxRowWriter(path) if self.file_format == 'xlsx' else _CsvRowWriter(path)
+            combinations = rows = errors = 0
+            started = time.perf_counter()
+            try:
+                for combination, components, error in template._iter_bom_matrix(self.only_possible):
+                    combinations += 1
+                    variant = combination._get_combination_name()
+                    if error:
+                        errors += 1
+                        writer.writerow([template.name, variant, '', '', error])
+                        rows += 1
+                    for name, qty in components:
+                        writer.writerow([template.name, variant, name, qty, ''])
+                        rows += 1
+            finally:
+                writer.close()
+            elapsed = time.perf_counter() - started
+            attachment = self._create_export_attachment(path, stored=bool(folder))
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+        rows_per_second = rows / elapsed if elapsed else 0.0
+        _logger.info(
+            "BOM matrix export of %s: %d combinations, %d rows, %d errors in %.1fs (%.0f rows/s) -> %s",
+            template.name, combinations, rows, errors, elapsed, rows_per_second, attachment.name,
+        )
+        self.write({
+            'attachment_id': attachment.id,
+            'combination_count': combinations,
+            'row_count': rows,
+            'error_count': errors,
+            'rows_per_second': rows_per_second,
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%d?download=true' % attachment.id,
+            'target': 'self',
+        }
+
+    def _create_export_attachment(self, path, stored=True):
+        """
+            Attach the export file without loading it: it is hashed in chunks and
+            moved into the filestore under its checksum, and the attachment is
+            created on that file, unindexed. A database filestore needs the bytes.
+            param: path: finished export file, in the filestore folder if stored
+            return: ir.attachment
+        """
+        Attachment = self.env['ir.attachment']
+        vals = {
+            'name': self._get_export_name(),
+            'mimetype': EXPORT_MIMETYPES[self.file_format],
+            'res_model': self._name,
+            'res_id': self.id,
+        }
+        if not stored:
+            with open(path, 'rb') as fh:
+                return Attachment.create(dict(vals, raw=fh.read()))
+        sha = hashlib.sha1()
+        with open(path, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(CHUNK_SIZE), b''):
+                sha.update(chunk)
+        checksum = sha.hexdigest()
+        fname = '%s/%s' % (checksum[:2], checksum)
+        full_path = Attachment._full_path(fname)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        if os.path.exists(full_path):
+            os.unlink(path)
+        else:
+            os.replace(path, full_path)
+        # deleted by the filestore GC if this transaction is rolled back
+        Attachment._mark_for_gc(fname)
+        return Attachment.create(dict(
+            vals,
+            store_fname=fname,
+            file_size=os.path.getsize(full_path),
+            checksum=checksum,
+            index_content=False,
+        ))
@@ -0,0 +1,82 @@
+from odoo import fields, models
+from collections import Counter
+import logging
+import time
+_logger = logging.getLogger(__name__)
+
+# Families whose BOM builder matches component names case-sensitively (operator '=')
+CASE_SENSITIVE_FAMILIES = {'pile casing stock'}
+
+
+class BomPreflightReport(models.TransientModel):
+    _name = 'bom.preflight.report'
+    _description = 'BOM Pre-flight Report'
+
+    product_tmpl_id = fields.Many2one('product.template', string='Template', required=True)
+    only_possible = fields.Boolean(default=True, help="Skip combinations excluded on the template")
+    combination_count = fields.Integer(readonly=True)
+    component_count = fields.Integer(readonly=True, help="Distinct component names needed by the matrix")
+    missing_count = fields.Integer(readonly=True)
+    error_count = fields.Integer(readonly=True, help="Combinations the rules raise an error for")
+    duration = fields.Float(readonly=True, string='Duration (s)')
+    line_ids = fields.One2many('bom.preflight.report.line', 'report_id', string='Lines')
+
+    def action_analyse(self):
+        """
+            Run the component rules over every combination of the template and
+            rank the components missing from the catalogue, and the errors, by the
+            number of combinations hitting them. Nothing is created.
+        """
+        self.ensure_one()
+        template = self.product_tmpl_id
+        started = time.perf_counter()
+        needed, errors = Counter(), Counter()
+        combinations = 0
+        for combination, components, error in template._iter_bom_matrix(self.only_possible):
+            combinations += 1
+            if error:
+                errors[error] += 1
+            needed.update({name for name, qty in components})
+
+        # matched as the BOM builders will match them, wildcards included
+        operator = '=' if (template.name or '').strip().lower() in CASE_SENSITIVE_FAMILIES else '=ilike'
+        existing = self.env['product.product']._search_bom_components(needed, operator=operator)
+        missing = {name: count for name, count in needed.items() if name not in existing}
+
+        self.line_ids.unlink()
+        lines = [{
+            'report_id': self.id,
+            'kind': 'missing',
+            'name': name,
+            'combination_count': count,
+        } for name, count in sorted(missing.items(), key=lambda item: (-item[1], item[0]))]
+        lines += [{
+            'report_id': self.id,
+            'kind': 'error',
+            'name': message,
+            'combination_count': count,
+        } for message, count in errors.most_common()]
+        self.env['bom.preflight.report.line'].create(lines)
+        self.write({
+            'combination_count': combinations,
+            'component_count': len(needed),
+            'missing_count': len(missing),
+            'error_count': sum(errors.values()),
+            'duration': time.perf_counter() - started,
+        })
+        _logger.info(
+            "BOM pre-flight of %s: %d combinations, %d components, %d missing, %d errors in %.1fs",
+            template.name, combinations, len(needed), len(missing), self.error_count, self.duration,
+        )
+        return True
+
+
+class BomPreflightReportLine(models.TransientModel):
+    _name = 'bom.preflight.report.line'
+    _description = 'BOM Pre-flight Report Line'
+    _order = 'kind desc, combination_count desc, name'
+
+    report_id = fields.Many2one('bom.preflight.report', required=True, ondelete='cascade')
+    kind = fields.Selection([('missing', 'Missing Component'), ('error', 'Error')], required=True)
+    name = fields.Char(required=True)
+    combination_count = fields.Integer(string='Combinations')
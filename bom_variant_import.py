@@ -0,0 +1,204 @@
+from odoo import api, fields, models
+from odoo.exceptions import ValidationError
+from contextlib import contextmanager
+import csv
+import io
+import itertools
+import logging
+_logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 200
+# First key of the advisory locks claiming a job, the job id is the second
+IMPORT_LOCK_KEY = 0x424f4d49
+
+
+class BomVariantImport(models.Model):
+    _name = 'bom.variant.import'
+    _description = 'BOM Variant Import'
+    _order = 'id desc'
+
+    name = fields.Char(required=True)
+    attachment_id = fields.Many2one(
+        'ir.attachment', required=True, ondelete='cascade',
+        help="CSV file: a Template column, then one column per attribute holding the value name",
+    )
+    chunk_size = fields.Integer(default=IMPORT_CHUNK_SIZE, required=True)
+    send_creation_email = fields.Boolean(help="Send the variant creation email for every imported variant")
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], default='draft', required=True)
+    last_row = fields.Integer(readonly=True, help="Checkpoint: last data row committed, the import resumes after it")
+    created_count = fields.Integer(readonly=True)
+    skipped_count = fields.Integer(readonly=True, help="Rows whose variant already existed")
+    error_count = fields.Integer(readonly=True)
+    error_ids = fields.One2many('bom.variant.import.error', 'import_id', string='Errors')
+    message = fields.Text(readonly=True)
+
+    @contextmanager
+    def _open_rows(self):
+        """ Stream the CSV rows from the filestore instead of loading the file in memory """
+        attachment = self.attachment_id.sudo()
+        if attachment.store_fname:
+            fh = open(attachment._full_path(attachment.store_fname), newline='', encoding='utf-8-sig')
+        else:
+            fh = io.StringIO(attachment.raw.decode('utf-8-sig'), newline='')
+        try:
+            yield csv.reader(fh)
+        finally:
+            fh.close()
+
+    def _get_template_values(self, template_name, cache):
+        """
+            return: (template id, {attribute name: {value name: PTAV id}}), case-insensitive.
+            Only ids are cached, records do not survive the invalidation between chunks.
+        """
+        key = template_name.strip().lower()
+        if key not in cache:
+            template = self.env['product.template'].search([('name', '=ilike', template_name.strip())], limit=1)
+            if not template:
+                raise ValidationError(f"Opss! Template {template_name} not found.")
+            values = {}
+            for line in template.valid_product_template_attribute_line_ids._without_no_variant_attributes():
+                values[line.attribute_id.name.strip().lower()] = {
+                    ptav.name.strip().lower(): ptav.id
+                    for ptav in line.product_template_value_ids._only_active()
+                }
+            cache[key] = (template.id, values)
+        return cache[key]
+
+    def _get_row_combination(self, header, row, cache):
+        """ return: (template, combination) of a CSV row """
+        template_id, values = self._get_template_values(row[0], cache)
+        ptav_ids = []
+        for attribute, value in zip(header[1:], row[1:]):
+            attribute, value = attribute.strip().lower(), value.strip()
+            if not value:
+                continue
+            if attribute not in values:
+                raise ValidationError(f"Opss! Attribute {attribute} is not on template {row[0]}.")
+            ptav_id = values[attribute].get(value.lower())
+            if not ptav_id:
+                raise ValidationError(f"Opss! Value {value} of {attribute} is not on template {row[0]}.")
+            ptav_ids.append(ptav_id)
+        template = self.env['product.template'].browse(template_id)
+        return template, self.env['product.template.attribute.value'].browse(ptav_ids)
+
+    @contextmanager
+    def _claim(self):
+        """
+            Session level advisory lock on the job: unlike a row lock it holds
+            across the commits of the chunks, and Postgres releases it with the
+            connection of a worker that died.
+            yield: True when this worker owns the job, False when another one runs it
+        """
+        cr = self.env.cr
+        cr.execute("SELECT pg_try_advisory_lock(%s, %s)", [IMPORT_LOCK_KEY, self.id])
+        claimed = cr.fetchone()[0]
+        try:
+            yield claimed
+        finally:
+            if claimed:
+                cr.execute("SELECT pg_advisory_unlock(%s, %s)", [IMPORT_LOCK_KEY, self.id])
+
+    def action_run(self):
+        for job in self:
+            with job._claim() as claimed:
+                if not claimed:
+                    raise ValidationError(f"Opss! Import {job.name} is already running.")
+                job._run()
+        return True
+
+    def action_reset(self):
+        """ Restart from the first row """
+        self.error_ids.unlink()
+        self.write({'state': 'draft', 'last_row': 0, 'created_count': 0, 'skipped_count': 0, 'error_count': 0, 'message': False})
+
+    @api.model
+    def _cron_process_imports(self):
+        """
+            Resume the imports left running (worker restart, timeout) and start
+            the drafts; the jobs a user or another cron is processing are skipped
+        """
+        for job in self.search([('state', 'in', ('draft', 'running'))], order='id'):
+            with job._claim() as claimed:
+                if not claimed:
+                    continue
+                # it may have finished between the search and the claim
+                job.invalidate_recordset(['state'])
+                if job.state in ('draft', 'running'):
+                    job._run()
+
+    def _run(self):
+        """
+            Create the variants chunk by chunk. Each row runs in a savepoint, so a
+            bad row is logged as an error instead of rolling back the chunk; each
+            chunk is committed with the checkpoint and the env cache is dropped.
+        """
+        self.ensure_one()
+        self.write({'state': 'running', 'message': False})
+        self.env.cr.commit()
+        cr = self.env.cr
+        chunk_size = max(self.chunk_size, 1)
+        context = {} if self.send_creation_email else {'skip_variant_creation_email': True}
+        templates = {}
+        try:
+            with self._open_rows() as reader:
+                header = next(reader, None)
+                if not header or header[0].strip().lower() != 'template':
+                    raise ValidationError("Opss! The first column of the file must be Template.")
+                rows = itertools.islice(enumerate(reader, 1), self.last_row, None)
+                while True:
+                    chunk = list(itertools.islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    created = skipped = 0
+                    errors = []
+                    for row_number, row in chunk:
+                        if not any(cell.strip() for cell in row):
+                            continue
+                        try:
+                            with cr.savepoint():
+                                template, combination = self._get_row_combination(header, row, templates)
+                                if template._get_variant_for_combination(combination):
+                                    skipped += 1
+                                    continue
+                                template.with_context(**context)._create_product_variant(combination)
+                                self.env.flush_all()
+                            created += 1
+                        except Exception as e:
+                            errors.append({'import_id': self.id, 'row': row_number, 'template': row[0], 'message': str(e)})
+                    self.env['bom.variant.import.error'].create(errors)
+                    self.write({
+                        'last_row': chunk[-1][0],
+                        'created_count': self.created_count + created,
+                        'skipped_count': self.skipped_count + skipped,
+                        'error_count': self.error_count + len(errors),
+                    })
+                    cr.commit()
+                    self.env.invalidate_all()
+                    _logger.info(
+                        "BOM variant import %s: row %d, %d created, %d skipped, %d errors",
+                        self.name, self.last_row, self.created_count, self.skipped_count, self.error_count,
+                    )
+        except Exception as e:
+            cr.rollback()
+            _logger.exception("BOM variant import %s stopped after row %d", self.name, self.last_row)
+            self.write({'state': 'failed', 'message': str(e)})
+            cr.commit()
+            return
+        self.write({'state': 'done'})
+        cr.commit()
+
+
+class BomVariantImportError(models.Model):
+    _name = 'bom.variant.import.error'
+    _description = 'BOM Variant Import Error'
+    _order = 'row'
+
+    import_id = fields.Many2one('bom.variant.import', required=True, index=True, ondelete='cascade')
+    row = fields.Integer()
+    template = fields.Char()
+    message = fields.Text()
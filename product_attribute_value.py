@@ -0,0 +1,193 @@
+from odoo import api, fields, models
+import logging
+import re
+_logger = logging.getLogger(__name__)
+
+NUMBER_PATTERN = re.compile(r'\d+\.?\d*')
+UNIT_PATTERN = re.compile(r'\s*(mm|cm|m|kg|in|")(?![a-z])', re.IGNORECASE)
+# As _find_bp_flight_attr_product cleans a flight value name
+FLIGHT_PREFIX_PATTERN = re.compile(r'^(?:Lead|Carrier|Coupling)\s+Flight\s*-\s*')
+FLIGHT_SUFFIX_PATTERN = re.compile(r'\s*\(.*?\)\s*$')
+# Milliseconds the memo of a resolved component may wait for a row lock
+MEMO_LOCK_TIMEOUT = 100
+
+
+def _parse_numeric_value(name):
+    """
+        The first number of a value name, as the generators read it, and the unit
+        written right after it: "600mm" -> (600.0, 'mm'), '4" Lo Drill' -> (4.0, 'in').
+        return: (value, unit), (None, False) when the name holds no number
+    """
+    match = NUMBER_PATTERN.search(name or '')
+    if not match:
+        return None, False
+    unit = UNIT_PATTERN.match(name, match.end())
+    unit = unit.group(1).lower() if unit else False
+    return float(match.group()), 'in' if unit == '"' else unit
+
+
+def _is_flight_name(name):
+    return 'flight -' in (name or '').lower()
+
+
+def _flight_key(name):
+    """
+        The flight product name a value resolves to, without its trailing
+        parenthetical and lowercased: a flight product and the values it may
+        resolve share it
+    """
+    cleaned = FLIGHT_PREFIX_PATTERN.sub('Flight - ', (name or '').strip())
+    return FLIGHT_SUFFIX_PATTERN.sub('', cleaned).strip().lower()
+
+
+def _is_permanent_casing_name(name):
+    return 'permanent casing' in (name or '').lower()
+
+
+class ProductAttributeValue(models.Model):
+    _inherit = 'product.attribute.value'
+
+    bom_component_id = fields.Many2one(
+        'product.product', string='BOM Component', readonly=True, copy=False,
+        ondelete='set null', index='btree_not_null',
+        help="Component product the BOM rules resolved this value to, cached",
+    )
+    has_numeric_value = fields.Boolean(compute='_compute_numeric_value', store=True)
+    numeric_value = fields.Float(
+        compute='_compute_numeric_value', store=True, index='btree_not_null', digits=(16, 3),
+        help="First number of the value name, e.g. 600 for \"600mm\"",
+    )
+    numeric_unit = fields.Char(compute='_compute_numeric_value', store=True)
+
+    @api.depends('name')
+    def _compute_numeric_value(self):
+        for value in self:
+            number, unit = _parse_numeric_value(value.name)
+            value.has_numeric_value = number is not None
+            value.numeric_value = number or False
+            value.numeric_unit = unit
+
+    def write(self, vals):
+        if 'name' in vals:
+            vals = dict(vals, bom_component_id=False)
+        return super().write(vals)
+
+    def _set_bom_component(self, product):
+        """
+            Memoize the resolved component in its own short transaction, so
+            configurators creating variants of the same value never lock its row.
+            A row locked by another transaction, the caller's included, is skipped
+            instead of waited for, and so is a product not committed yet.
+        """
+        self.ensure_one()
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute("SET LOCAL lock_timeout = %s", [MEMO_LOCK_TIMEOUT])
+                cr.execute("""
+                    UPDATE product_attribute_value SET bom_component_id = %s
+                     WHERE id IN (
+                        SELECT id FROM product_attribute_value
+                         WHERE id = %s AND bom_component_id IS NULL
+                           FOR UPDATE SKIP LOCKED
+                     )
+                """, [product.id, self.id])
+        except Exception as e:
+            _logger.debug("BOM component of attribute value %s not memoized: %s", self.id, e)
+
+    @api.model
+    def _clear_bom_components(self, products=None, flight_names=()):
+        """
+            Forget the components resolved to `products`, and those of the values
+            a flight named in `flight_names` may now resolve to instead. Only the
+            rows affected are updated, and so locked.
+        """
+        values = self.browse()
+        Value = self.with_context(active_test=False)
+        if products:
+            values |= Value.search([('bom_component_id', 'in', products.ids)])
+        keys = {_flight_key(name) for name in flight_names if _is_flight_name(name)}
+        if keys:
+            values |= Value.search([('bom_component_id', '!=', False)]).filtered(
+                lambda value: _flight_key(value.name) in keys
+            )
+        if not values:
+            return
+        self.env.cr.execute(
+            "UPDATE product_attribute_value SET bom_component_id = NULL WHERE id = ANY(%s)",
+            [values.ids],
+        )
+        values.invalidate_recordset(['bom_component_id'])
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        products = super().create(vals_list)
+        # a new flight may match a value better than its memoized one
+        self.env['product.attribute.value']._clear_bom_components(flight_names=products.mapped('name'))
+        return products
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'name' in vals or 'active' in vals:
+            self.env['product.attribute.value']._clear_bom_components(self, flight_names=self.mapped('name'))
+        return res
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    def _clear_permanent_casing_index(self):
+        """ The casing index is versioned: read its version again when a casing comes or goes """
+        if any(_is_permanent_casing_name(template.name) for template in self):
+            self.env['product.product']._reset_permanent_casing_version()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super().create(vals_list)
+        templates._clear_permanent_casing_index()
+        return templates
+
+    def unlink(self):
+        casings = any(_is_permanent_casing_name(template.name) for template in self)
+        res = super().unlink()
+        if casings:
+            self.env['product.product']._reset_permanent_casing_version()
+        return res
+
+    def write(self, vals):
+        # a casing renamed away from the index as well as into it
+        casings = ('name' in vals or 'active' in vals) and any(
+            _is_permanent_casing_name(name) for name in self.mapped('name') + [vals.get('name')]
+        )
+        res = super().write(vals)
+        if casings:
+            self.env['product.product']._reset_permanent_casing_version()
+        if 'name' in vals or 'active' in vals:
+            variants = self.with_context(active_test=False).product_variant_ids
+            self.env['product.attribute.value']._clear_bom_components(variants, flight_names=variants.mapped('name'))
+        return res
+
+
+class ProductTemplateAttributeLine(models.Model):
+    _inherit = 'product.template.attribute.line'
+
+    def _fill_bom_tables(self):
+        """ Precompute the table rows of the values added to a tremie pipe template """
+        templates = self.product_tmpl_id.filtered(lambda template: template.name == 'Tremie Pipe Trial')
+        if templates:
+            self.env['product.product']._fill_tre_pipe_table(templates)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._fill_bom_tables()
+        return lines
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'value_ids' in vals or 'attribute_id' in vals:
+            self._fill_bom_tables()
+        return res
@@ -1,10 +1,440 @@
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
+import itertools
 import re
 from odoo.exceptions import ValidationError
 import logging
 import math
 _logger = logging.getLogger(__name__)
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+HTA_FEMALE_DRIVES = {
+    "3.5\" API Coupling": "3.5\" API Female coupling",
+    "2\" Hex Coupling": "2\" Hex Coupling - Female",
+    "3\" Hex Coupling": "3\" Hex Coupling - Female",
+    "4\" Hex Coupling": "4\" Hex Coupling - Female",
+    "35TM Coupling": "35TM Coupling - Female",
+    "53TM Coupling": "53TM Coupling - Female",
+    "Carrendeena 5\" Coupling": "Carrendeena 5\" Coupling - Female",
+    "Casagrande 5\" Coupling": "Casagrande 5\" Coupling - Female",
+    "HD4 Coupling": "HD4 Coupling - Female",
+    "HD5 Coupling": "HD5 Coupling - Female",
+    "25XHD5 Coupling": "25XHD5 Coupling - Female",
+    "XHD5 Coupling": "XHD5 Coupling - Female",
+    "XHD5 Mini Coupling": "XHD5 Mini Coupling - Female",
+    "Llamada Coupling": "Llamada Coupling - Female",
+    "MAIT175 Coupling": "MAIT175 Coupling - Female",
+    "MAIT200 Coupling": "MAIT200 Coupling - Female",
+    "SW80 Coupling": "TB80/SW80 Coupling - Female",
+    "SW110 Coupling": "SW110 Female Coupling",
+    "SW150 EMDE Coupling": "SW150 EMDE Female",
+    "SW150 Bauer Coupling": "SW150 Bauer Coupling - Female",
+    "SW175 Coupling": "SW175 Coupling - Female",
+    "SW200 Coupling": "SW200 Female Coupling",
+    "SW250 Coupling": "SW250 Female Coupling",
+    "TB46 Coupling": "TB46 Coupling - Female",
+    "65mm Round Drive": "Drive Head - 65mm Round",
+    "65mm Square Drive": "Drive Head - 65mm Square",
+    "75mm Square Drive": "Drive Head - 75mm Square",
+    "100mm Square Drive": "Drive Head - 100mm Square",
+    "110mm Square Drive": "Drive Head - 110mm Square",
+    "130mm Square Drive": "Drive Head - 130mm Square",
+    "130mm Square Drive DIGGA": "Drive Head - 130mm Square DIGGA",
+    "150mm Square Drive": "Drive Head - 150mm Square",
+    "150mm Square Drive IMT": "Drive Head - 150mm Square IMT",
+    "200mm Square Drive Bauer": "Drive Head - 200mm Square Bauer",
+    "200mm Square Drive MAIT": "Drive Head - 200mm Square MAIT",
+    "150mm AT Hex": "Drive Head - 150mm AT Hex",
+    "Terex 2.5\" Hex H250": "Terex Hex Hub Female 2.5\" (H250)"
+}
+
+HTA_MALE_DRIVES = {
+    "3.5\" API Coupling": "3.5\" API Male coupling",
+    "2\" Hex Coupling": "2\" Hex Coupling - Male Male Joiner",
+    "3\" Hex Coupling": "3\" Hex Coupling - Male Male Joiner",
+    "4\" Hex Coupling": "4\" Hex Coupling - Male Male Joiner",
+    "35TM Coupling": "35TM Coupling - Male",
+    "53TM Coupling": "53TM Coupling - Male",
+    "Carrendeena 5\" Coupling": "Carrendeena 5\" Coupling - Male",
+    "Casagrande 5\" Coupling": "Casagrande 5\" Coupling - Male",
+    "HD4 Coupling": "HD4 Coupling - Male",
+    "HD5 Coupling": "HD5 Coupling - Male",
+    "25XHD5 Coupling": "25XHD5 Coupling - Male",
+    "XHD5 Coupling": "XHD5 Coupling - Male",
+    "XHD5 Mini Coupling": "XHD5 Mini Coupling - Male",
+    "Llamada Coupling": "Llamada Coupling - Male",
+    "MAIT175 Coupling": "MAIT175 Coupling - Male",
+    "MAIT200 Coupling": "MAIT200 Coupling - Male",
+    "SW80 Coupling": "TB80/SW80 Coupling - Male",
+    "SW110 Coupling": "SW110 Male Coupling",
+    "SW150 EMDE Coupling": "SW150 EMDE Female",
+    "SW150 Bauer Coupling": "SW150 Bauer Coupling - Female",
+    "SW175 Coupling": "SW175 Coupling - male",
+    "SW200 Coupling": "SW200 Male Coupling",
+    "SW250 Coupling": "SW250 Male Coupling",
+    "TB46 Coupling": "TB46 Coupling - Male",
+    "75mm Square Drive": "75mm Square Extension Bar Stubb",
+    "100mm Square Drive": "100mm square Stubb",
+    "110mm Square Drive": "110mm Drive Stubb",
+    "130mm Square Drive": "130mm Stubb",
+    "130mm Square Drive DIGGA": "130mm Stubb - Digga",
+    "150mm Square Drive": "150mm Stub",
+    "150mm Square Drive IMT": "150mm IMT Stub",
+    "200mm Square Drive Bauer": "200mm Bauer Drive Stubb",
+    "200mm Square Drive MAIT": "200mm MAIT Square Stub",
+}
+
+HTA_FEMALE_DRIVES_CI = {k.strip().lower(): v for k, v in HTA_FEMALE_DRIVES.items()}
+HTA_MALE_DRIVES_CI = {k.strip().lower(): v for k, v in HTA_MALE_DRIVES.items()}
+
+HTA_STIFFENING_MATRIX = {
+    'Drive Head - 100mm Square': {
+        '75mm Stubb': True, '100mm Stubb': False, '110mm Stubb': False,
+        '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
+    },
+    'Drive Head - 110mm Square': {
+        '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': False,
+        '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
+    },
+    'Drive Head - 130mm Square': {
+        '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
+        '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
+    },
+    'Drive Head - 130mm Square DIGGA': {
+        '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
+        '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
+    },
+    'Drive Head - 150mm Square': {
+        '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
+        '130mm Stubb': True, '150mm Stubb': False, '75mm Head': True,
+    },
+    'Drive Head - 150mm Square IMT': {
+        '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
+        '130mm Stubb': True, '150mm Stubb': True, '75mm Head': True,
+    },
+    'Drive Head - 200mm Square Bauer': {
+        '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
+        '130mm Stubb': True, '150mm Stubb': True, '75mm Head': True,
+    },
+    'Drive Head - 200mm Square MAIT': {
+        '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
+        '130mm Stubb': True, '150mm Stubb': True, '75mm Head': True,
+    },
+}
+
+HTA_STIFFENING_RINGS = {
+    '75mm Stubb': 'Stiffening Ring - 75mm Stubb',
+    '100mm Stubb': 'Stiffening Ring - 100mm Stubb',
+    '110mm Stubb': 'Stiffening Ring - 110mm Stubb',
+    '130mm Stubb': 'Stiffening Ring - 130mm Stubb',
+    '150mm Stubb': 'Stiffening Ring - 150mm Stubb',
+    '75mm Head': 'Stiffening Ring - 75mm Head',
+}
+
+HTA_STIFFENING_MATRIX_CI = {
+    k.strip().lower(): {sk.strip().lower(): sv for sk, sv in v.items()}
+    for k, v in HTA_STIFFENING_MATRIX.items()
+}
+
+HTA_COUPLING_TYPES = ('female to female', 'male to male', 'female to male', 'male to female')
+
+# Extension Bar: drive attribute -> drive head item
+EB_DRIVE_HEADS = {
+    '75mm Square Drive': 'Drive Head - 75mm Square',
+    '100mm Square Drive': 'Drive Head - 100mm Square',
+    '110mm Square Drive': 'Drive Head - 110mm Square',
+    '130mm Square Drive': 'Drive Head - 130mm Square',
+    '130mm Square Digga Drive': 'Drive Head - 130mm Square DIGGA',
+    '150mm Square Drive': 'Drive Head - 150mm Square',
+    '150mm Square IMT Drive': 'Drive Head - 150mm Square IMT',
+    '200mm Square Bauer Drive': 'Drive Head - 200mm Square Bauer',
+    '200mm Square MAIT Drive': 'Drive Head - 200mm Square MAIT'
+}
+# drive attribute -> [drive head height, base plate thickness, stub height] in mm
+EB_DRIVE_HEAD_HEIGHTS = {
+    '75mm Square Drive': [150, 0, 40],
+    '100mm Square Drive': [175, 25, 50],
+    '110mm Square Drive': [240, 25, 40],
+    '130mm Square Drive': [260, 32, 40],
+    '130mm Square Digga Drive': [260, 32, 40],
+    '150mm Square Drive': [260, 32, 60],
+    '150mm Square IMT Drive': [260, 32, 60],
+    '200mm Square Bauer Drive': [457, 32, 60],
+    '200mm Square MAIT Drive': [345, 32, 60],
+}
+# drive attribute -> base plate item
+EB_BASE_PLATES = {
+    '100mm Square Drive': 'Base Plate - 100mm Head',
+    '110mm Square Drive': 'Base Plate - 110mm Head',
+    '130mm Square Drive': 'Base Plate - 130mm Head',
+    '130mm Square Digga Drive': 'Base Plate - 130mm Head',
+    '150mm Square Drive': 'Base Plate - 150mm Head',
+    '150mm Square IMT Drive': 'Base Plate - 150mm Head',
+    '200mm Square Bauer Drive': 'Base Plate - 200mm Head',
+    '200mm Square MAIT Drive': 'Base Plate - 200mm Head ',
+}
+# adaptor attribute -> stub item
+EB_ADAPTOR_STUBS = {
+    'to 75mm Square Stub': '75mm Square Extension Bar Stubb',
+    'to 100mm Square Stub': '100mm square Stubb',
+    'to 110mm Square Stub': '110mm Drive Stubb',
+    'to 130mm Square Stub': '130mm Stubb',
+    'to 130mm Square Digga Stub': '130mm Stubb - Digga',
+    'to 150mm Square Stub': '150mm Drive Stub',
+    'to 150mm Square IMT Stub': '150mm IMT Stub',
+    'to 200mm Square Bauer Stub': '200mm Bauer Drive Stubb',
+    'to 200mm Square MAIT Stub': '200mm MAIT Square Stub'
+}
+# drive attribute -> stub item of the drive
+EB_DRIVE_STUBS = {
+    '75mm Square Drive': '75mm Square Extension Bar Stubb',
+    '100mm Square Drive': '100mm square Stubb',
+    '110mm Square Drive': '110mm Drive Stubb',
+    '130mm Square Drive': '130mm Stubb',
+    '130mm Square Digga Drive': '130mm Stubb - Digga',
+    '150mm Square Drive': '150mm Drive Stub',
+    '150mm Square IMT Drive': '150mm IMT Stub',
+    '200mm Square Bauer Drive': '200mm Bauer Drive Stubb',
+    '200mm Square MAIT Drive': '200mm MAIT Square Stub'
+}
+# male to male attribute -> [stub item, stub height in mm]
+EB_MALE_STUBS = {
+    'to 75mm Square Drive (Male to Male)': ['75mm Square Extension Bar Stubb', 40],
+    'to 100mm Square Drive (Male to Male)': ['100mm square Stubb', 50],
+    'to 110mm Square Drive (Male to Male)': ['110mm Drive Stubb', 40],
+    'to 130mm Square Drive (Male to Male)': ['130mm Stubb', 40],
+    'to 130mm Square Digga Drive (Male to Male)': ['130mm Stubb - Digga', 40],
+    'to 150mm Square Drive (Male to Male)': ['150mm Drive Stub', 60],
+    'to 150mm Square IMT Drive (Male to Male)': ['150mm IMT Stub', 60],
+    'to 200mm Square Bauer Drive (Male to Male)': ['200mm Bauer Drive Stubb', 60],
+    'to 200mm Square MAIT Drive (Male to Male)': ['200mm MAIT Square Stub', 60],
+}
+# female to female attribute -> [drive head height, base plate thickness] in mm
+EB_FEMALE_HEADS = {
+    'to 75mm Square Drive (Female to Female)': [150, 0],
+    'to 100mm Square Drive (Female to Female)': [175, 25],
+    'to 110mm Square Drive (Female to Female)': [240, 25],
+    'to 130mm Square Drive (Female to Female)': [260, 32],
+    'to 130mm Square Digga Drive (Female to Female)': [260, 32],
+    'to 150mm Square Drive (Female to Female)': [260, 32],
+    'to 150mm Square IMT Drive (Female to Female)': [260, 32],
+    'to 200mm Square Bauer Drive (Female to Female)': [457, 32],
+    'to 200mm Square MAIT Drive (Female to Female)': [345, 32],
+}
+# female to female attribute -> drive head of the gusset 2
+EB_FEMALE_DRIVE_HEADS = {
+    'to 75mm Square Drive (Female to Female)': 'Drive Head - 75mm Square',
+    'to 100mm Square Drive (Female to Female)': 'Drive Head - 100mm Square',
+    'to 110mm Square Drive (Female to Female)': 'Drive Head - 110mm Square',
+    'to 130mm Square Drive (Female to Female)': 'Drive Head - 130mm Square',
+    'to 130mm Square Digga Drive (Female to Female)': 'Drive Head - 130mm Square DIGGA',
+    'to 150mm Square Drive (Female to Female)': 'Drive Head - 150mm Square',
+    'to 150mm Square IMT Drive (Female to Female)': 'Drive Head - 150mm Square IMT',
+    'to 200mm Square Bauer Drive (Female to Female)': 'Drive Head - 200mm Square Bauer',
+    'to 200mm Square MAIT Drive (Female to Female)': 'Drive Head - 200mm Square MAIT',
+}
+# male to male attribute -> drive head of the stub 2
+EB_MALE_DRIVE_HEADS = {
+    'to 75mm Square Drive (Male to Male)': 'Drive Head - 75mm Square',
+    'to 100mm Square Drive (Male to Male)': 'Drive Head - 100mm Square',
+    'to 110mm Square Drive (Male to Male)': 'Drive Head - 110mm Square',
+    'to 130mm Square Drive (Male to Male)': 'Drive Head - 130mm Square',
+    'to 130mm Square Digga Drive (Male to Male)': 'Drive Head - 130mm Square DIGGA',
+    'to 150mm Square Drive (Male to Male)': 'Drive Head - 150mm Square',
+    'to 150mm Square IMT Drive (Male to Male)': 'Drive Head - 150mm Square IMT',
+    'to 200mm Square Bauer Drive (Male to Male)': 'Drive Head - 200mm Square Bauer',
+    'to 200mm Square MAIT Drive (Male to Male)': 'Drive Head - 200mm Square MAIT',
+}
+# centre tube attribute -> collar item of the telescopic inner bars
+EB_COLLARS = {
+    "4140 75mm square billet": "Extension Bar Collar - 75mm",
+    "4140 100mm square billet": "Extension Bar Collar - 100mm"
+}
+EB_GUSSET_GROUPS = {
+    'Drive Head - 100mm Square': 'dhead_100_110_mm',
+    'Drive Head - 110mm Square': 'dhead_100_110_mm',
+    'Drive Head - 130mm Square': 'dhead_130_mm',
+    'Drive Head - 130mm Square DIGGA': 'dhead_130_mm',
+    'Drive Head - 150mm Square': 'dhead_150_mm',
+    'Drive Head - 150mm Square IMT': 'dhead_150_mm',
+    'Drive Head - 200mm Square Bauer': 'dhead_200_mm',
+    'Drive Head - 200mm Square MAIT': 'dhead_200_mm',
+}
+# gusset group -> {centre tube: gusset item}
+EB_GUSSETS = {
+    'dhead_100_110_mm': {
+        # Hollow Bars
+        'Hollow Bar - OD128mm WT 11.5mm': "Gusset - 100mm Drive 150mm Tube",
+        'Hollow Bar - OD150mm ID120mm': "Gusset - 100mm Drive 150mm Tube",
+        'Hollow Bar - OD152mm WT 26mm': "Gusset - 100mm Drive 150mm Tube",
+        'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 100mm Drive 150mm Tube",
+        'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 100mm Drive 170mm Tube",
+        'Hollow Bar - OD168mm WT 29mm': "Gusset - 100mm Drive 170mm Tube",
+        'Hollow Bar - OD170mm ID140mm': "Gusset - 100mm Drive 170mm Tube",
+        'Hollow Bar - OD180 ID150': "Gusset - 100mm Drive 170mm Tube",
+        'Hollow bar - OD200 ID150': "Gusset - 100mm Drive 170mm Tube",
+        'Hollow Bar - OD219mm WT 25mm': "Gusset - 100mm Drive 219mm Tube",
+        # Pipes
+        'Pipe - OD168mm WT6.4mm': "Gusset - 100mm Drive 170mm Tube",
+        'Pipe - OD168mm WT4.8mm': "Gusset - 100mm Drive 170mm Tube",
+        'Pipe - OD168mm WT11mm': "Gusset - 100mm Drive 170mm Tube",
+        'Pipe - OD177mm WT 8mm': "Gusset - 100mm Drive 170mm Tube",
+        'Pipe - OD219mm WT8.2mm': "Gusset - 100mm Drive 219mm Tube",
+        'Pipe - OD219mm WT6.4mm': "Gusset - 100mm Drive 219mm Tube",
+        'Pipe - OD219mm WT12.7mm': "Gusset - 100mm Drive 219mm Tube",
+    },
+    'dhead_130_mm': {
+        # Hollow Bars
+        'Hollow Bar - OD150mm ID120mm': "Gusset - 130mm Drive 150mm Tube",
+        'Hollow Bar - OD152mm WT 26mm': "Gusset - 130mm Drive 150mm Tube",
+        'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 130mm Drive 150mm Tube",
+        'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 130mm Drive 170mm Tube",
+        'Hollow Bar - OD168mm WT 29mm': "Gusset - 130mm Drive 170mm Tube",
+        'Hollow Bar - OD170mm ID140mm': "Gusset - 130mm Drive 170mm Tube",
+        'Hollow Bar - OD180 ID150': "Gusset - 130mm Drive 170mm Tube",
+        'Hollow bar - OD200 ID150': "Gusset - 130mm Drive 170mm Tube",
+        'Hollow Bar - OD219mm WT 25mm': "Gusset - 130mm Drive 219mm Tube",
+        'Hollow bar - OD273mm WT14': "Gusset - 130mm Drive 273mm Tube",
+        'Hollow Bar - OD273mm WT 25mm': "Gusset - 130mm Drive 273mm Tube",
+        'Hollow Bar - OD273mm WT 32mm': "Gusset - 130mm Drive 273mm Tube",
+        'Hollow Bar - OD323mm WT25mm': "Gusset - 130mm Drive 323mm Tube",
+        'Hollow Bar - OD323mm WT30mm': "Gusset - 130mm Drive 323mm Tube",
+        'Hollow Bar - OD356 ID306': "Gusset - 130mm Drive 323mm Tube",
+        'Hollow bar - OD457mm T35mm': "Gusset - 130mm Drive 323mm Tube",
+        'Hollow bar - OD457mm T25mm': "Gusset - 130mm Drive 323mm Tube",
+        # Pipes
+        'Pipe - OD168mm WT6.4mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD168mm WT4.8mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD168mm WT11mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD177mm WT 8mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD219mm WT8.2mm': "Gusset - 130mm Drive 219mm Tube",
+        'Pipe - OD219mm WT6.4mm': "Gusset - 130mm Drive 219mm Tube",
+        'Pipe - OD219mm WT12.7mm': "Gusset - 130mm Drive 219mm Tube",
+        'Pipe - OD273mm WT9.3mm': "Gusset - 130mm Drive 273mm Tube",
+        'Pipe - OD273mm WT6.4mm': "Gusset - 130mm Drive 273mm Tube",
+        'Pipe - OD273mm WT12.7mm': "Gusset - 130mm Drive 273mm Tube",
+        'Pipe - OD323mm WT9.75mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD323mm WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD323mm WT6.4mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD323mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD355 WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD355mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - 406mm 9.5mm WT': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD406mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD457mm WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
+        'Pipe - OD457mm WT15.9mm': "Gusset - 130mm Drive 323mm Tube",
+    },
+    'dhead_150_mm': {
+        # Hollow Bars
+        'Hollow Bar - OD150mm ID120mm': "Gusset - 150mm Drive 150mm Tube",
+        'Hollow Bar - OD152mm WT 26mm': "Gusset - 150mm Drive 150mm Tube",
+        'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 150mm Drive 150mm Tube",
+        'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 150mm Drive 170mm Tube",
+        'Hollow Bar - OD168mm WT 29mm': "Gusset - 150mm Drive 170mm Tube",
+        'Hollow Bar - OD170mm ID140mm': "Gusset - 150mm Drive 170mm Tube",
+        'Hollow Bar - OD180 ID150': "Gusset - 150mm Drive 170mm Tube",
+        'Hollow bar - OD200 ID150': "Gusset - 150mm Drive 170mm Tube",
+        'Hollow Bar - OD219mm WT 25mm': "Gusset - 150mm Drive 170mm Tube",
+        'Hollow bar - OD273mm WT14': "Gusset - 150mm Drive 273mm Tube",
+        'Hollow Bar - OD273mm WT 25mm': "Gusset - 150mm Drive 273mm Tube",
+        'Hollow Bar - OD273mm WT 32mm': "Gusset - 150mm Drive 273mm Tube",
+        'Hollow Bar - OD323mm WT25mm': "Gusset - 150mm Drive 273mm Tube",
+        'Hollow Bar - OD323mm WT30mm': "Gusset - 150mm Drive 273mm Tube",
+        'Hollow Bar - OD356 ID306': "Gusset - 150mm Drive 273mm Tube",
+        'Hollow bar - OD457mm T35mm': "Gusset - 150mm Drive 273mm Tube",
+        'Hollow bar - OD457mm T25mm': "Gusset - 150mm Drive 273mm Tube",
+        # Pipes (smaller pipes use 130mm gussets)
+        'Pipe - OD168mm WT6.4mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD168mm WT4.8mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD168mm WT11mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD177mm WT 8mm': "Gusset - 130mm Drive 170mm Tube",
+        'Pipe - OD219mm WT8.2mm': "Gusset - 130mm Drive 219mm Tube",
+        'Pipe - OD219mm WT6.4mm': "Gusset - 130mm Drive 219mm Tube",
+        'Pipe - OD219mm WT12.7mm': "Gusset - 130mm Drive 219mm Tube",
+        # Larger pipes use 150mm gussets
+        'Pipe - OD273mm WT9.3mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD273mm WT6.4mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD273mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD323mm WT9.75mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD323mm WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD323mm WT6.4mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD323mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD355 WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD355mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - 406mm 9.5mm WT': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD406mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD457mm WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
+        'Pipe - OD457mm WT15.9mm': "Gusset - 150mm Drive 273mm Tube",
+    },
+    'dhead_200_mm': {
+        # Hollow Bars
+        'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 200mm Drive 170mm Tube",
+        'Hollow Bar - OD168mm WT 29mm': "Gusset - 200mm Drive 170mm Tube",
+        'Hollow Bar - OD170mm ID140mm': "Gusset - 200mm Drive 170mm Tube",
+        'Hollow Bar - OD180 ID150': "Gusset - 200mm Drive 170mm Tube",
+        'Hollow bar - OD200 ID150': "Gusset - 200mm Drive 170mm Tube",
+        'Hollow Bar - OD219mm WT 25mm': "Gusset - 200mm Drive 170mm Tube",
+        'Hollow bar - OD273mm WT14': "Gusset - 200mm Drive 273mm Tube",
+        'Hollow Bar - OD273mm WT 25mm': "Gusset - 200mm Drive 273mm Tube",
+        'Hollow Bar - OD273mm WT 32mm': "Gusset - 200mm Drive 273mm Tube",
+        'Hollow Bar - OD323mm WT25mm': "Gusset - 200mm Drive 273mm Tube",
+        'Hollow Bar - OD323mm WT30mm': "Gusset - 200mm Drive 273mm Tube",
+        'Hollow Bar - OD356 ID306': "Gusset - 200mm Drive 273mm Tube",
+        'Hollow bar - OD457mm T35mm': "Gusset - 200mm Drive 273mm Tube",
+        'Hollow bar - OD457mm T25mm': "Gusset - 200mm Drive 273mm Tube",
+        # Pipes
+        'Pipe - OD168mm WT6.4mm': "Gusset - 200mm Drive 170mm Tube",
+        'Pipe - OD168mm WT4.8mm': "Gusset - 200mm Drive 170mm Tube",
+        'Pipe - OD168mm WT11mm': "Gusset - 200mm Drive 170mm Tube",
+        'Pipe - OD177mm WT 8mm': "Gusset - 200mm Drive 170mm Tube",
+        'Pipe - OD219mm WT8.2mm': "Gusset - 200mm Drive 170mm Tube",
+        'Pipe - OD219mm WT6.4mm': "Gusset - 200mm Drive 170mm Tube",
+        'Pipe - OD219mm WT12.7mm': "Gusset - 200mm Drive 170mm Tube",
+        'Pipe - OD273mm WT9.3mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD273mm WT6.4mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD273mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD323mm WT9.75mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD323mm WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD323mm WT6.4mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD323mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD355 WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD355mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - 406mm 9.5mm WT': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD406mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD457mm WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
+        'Pipe - OD457mm WT15.9mm': "Gusset - 200mm Drive 273mm Tube",
+    }
+}
+
+# Compiled once: the heights in meters and the gussets by (drive head item, centre tube)
+EB_DRIVE_HEAD_HEIGHTS_M = {drive: tuple(mm / 1000.0 for mm in heights) for drive, heights in EB_DRIVE_HEAD_HEIGHTS.items()}
+EB_FEMALE_HEADS_M = {female: tuple(mm / 1000.0 for mm in heights) for female, heights in EB_FEMALE_HEADS.items()}
+EB_MALE_STUBS_M = {male: (stub, mm / 1000.0) for male, (stub, mm) in EB_MALE_STUBS.items()}
+EB_GUSSET_INDEX = {
+    (drive_head, centre_tube): gusset
+    for drive_head, group in EB_GUSSET_GROUPS.items()
+    for centre_tube, gusset in EB_GUSSETS[group].items()
+}
+
+# Sub-assemblies of the CFA augers, run through _get_cfa_stage
+CFA_STAGES = {
+    'at2': '_get_cfa_coupling_dhead_at2',
+    'at3': '_get_cfa_coupling_ctube_at3',
+    'at5': '_get_cfa_coupling_teeth_at5',
+    'at6': '_get_cfa_zed_center_at6',
+}
+# Stages cached per the arguments of their method. AT2 also takes the overall
+# length, nearly one key per variant, so it is not cached
+CFA_CACHED_STAGES = ('at3', 'at5', 'at6')
+# {stage: [calls, misses]} of this process, see _get_cfa_stage_stats
+_cfa_stage_counters = {stage: [0, 0] for stage in CFA_CACHED_STAGES}
+
+# CFA section types of the batched flight quantities
+CFA_TYPE_CODES = {'Lead': 1, 'Intermediate': 2}
+
 
 class ProductProduct(models.Model):
     _inherit = "product.product"
@@ -19,6 +449,22 @@ class ProductProduct(models.Model):
             self._create_bom_for_cfa_auger(product)
         return products
 
+    def _get_bom_component_generators(self):
+        generators = super()._get_bom_component_generators()
+        generators.update({
+            'Extension Bar': self._get_extension_bar_components,
+            'High Tensile Adapter': self._get_high_tensile_adapter_components,
+            'CFA Auger': self._get_cfa_auger_components,
+        })
+        return generators
+
+    def _get_bulk_bom_generators(self):
+        generators = super()._get_bulk_bom_generators()
+        generators.update({
+            'Extension Bar': self._get_extension_bar_components,
+        })
+        return generators
+
     def _create_bom_for_cfa_auger(self, product):
         """
             Create a BOM component for CFA Auger
@@ -50,12 +496,17 @@ class ProductProduct(models.Model):
         pilot = attributes.get('Pilot', '')
         centre_tube = attributes.get('Centre Tube', '')
         inner_tube = attributes.get('Inner Tube', '')
-        lead_flight = self._parse_bp_flight_attr(attributes.get('Lead Flight', ''))
-        carrier_flight = self._parse_bp_flight_attr(attributes.get('Carrier Flight', ''))
-        coupling_flight = self._parse_bp_flight_attr(attributes.get('Coupling Flight', ''))
-
-        diameter_match = re.search(r"\d+\.?\d*", diameter) if diameter else None
-        diameter = int(diameter_match.group()) if diameter_match else 0
+        values = {attr.attribute_id.name: attr.product_attribute_value_id for attr in product.product_template_attribute_value_ids}
+        lead_flight = self._resolve_bp_flight_attr(values.get('Lead Flight'))
+        carrier_flight = self._resolve_bp_flight_attr(values.get('Carrier Flight'))
+        coupling_flight = self._resolve_bp_flight_attr(values.get('Coupling Flight'))
+
+        numbers = self._get_attribute_numbers(product)
+        if 'Auger Diameter' in numbers:
+            diameter = int(numbers['Auger Diameter'])
+        else:
+            diameter_match = re.search(r"\d+\.?\d*", diameter) if diameter else None
+            diameter = int(diameter_match.group()) if diameter_match else 0
 
         # Validate pilot — only raise if explicitly set to "Please select..."
         # N/A and empty are acceptable (N/A gets excluded as empty by attributes)
@@ -85,18 +536,18 @@ class ProductProduct(models.Model):
 
     def _get_cfa_dual_taper_rock(self, cfa_type, lead_type, diameter, drive_head, o_length, rotation, teeth, pilot, centre_tube, inner_tube, lead_flight, carrier_flight, coupling_flight):
         # Get all items for at3
-        ctube_at3 = self._get_cfa_coupling_ctube_at3(centre_tube, inner_tube, drive_head, cfa_type)
+        ctube_at3 = self._get_cfa_stage('at3', centre_tube, inner_tube, drive_head, cfa_type)
         # Get the elbow item for mapping of inner tube height
         elbow = ctube_at3[0][0] if ctube_at3 else ''
         zed_center = "" # leave empty; only applicable for zed type
-        base_coupling_at2 = self._get_cfa_coupling_dhead_at2(cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
+        base_coupling_at2 = self._get_cfa_stage('at2', cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
         # Override Spacer Ring qty using actual inner tube length from AT2
         inn_tube_qty = base_coupling_at2[4][1] if len(base_coupling_at2) > 4 else 0
         ctube_at3 = self._apply_cfa_spacer_ring_qty(ctube_at3, inn_tube_qty)
         # Return: Items for lead, carrier, and coupling flights w/ qty
         cfa_stock_flights_at4 = self._get_cfa_lead_ca_co_flights(cfa_type, lead_type, lead_flight, carrier_flight, coupling_flight, o_length, drive_head)
         # Get all the teeth and pilot items
-        teeth_and_pilot_at5 = self._get_cfa_coupling_teeth_at5(diameter, centre_tube, lead_type, teeth, pilot)
+        teeth_and_pilot_at5 = self._get_cfa_stage('at5', diameter, centre_tube, lead_type, teeth, pilot)
         # Get tube gusset
         cfa_tube_gusset_at7 = self._get_cfa_tube_gusset_at7(centre_tube, drive_head)
 
@@ -116,10 +567,10 @@ class ProductProduct(models.Model):
 
     def _get_cfa_intermediate(self, cfa_type, lead_type, diameter, drive_head, o_length, rotation, teeth, pilot, centre_tube, inner_tube, lead_flight, carrier_flight, coupling_flight):
         # Get all items for at3
-        ctube_at3 = self._get_cfa_coupling_ctube_at3(centre_tube, inner_tube, drive_head, cfa_type)
+        ctube_at3 = self._get_cfa_stage('at3', centre_tube, inner_tube, drive_head, cfa_type)
         elbow = ctube_at3[0][0] if ctube_at3 else ''  # Get the elbow item for mapping of inner tube height
         zed_center = "" # leave empty; only applicable for zed type
-        base_coupling_at2 = self._get_cfa_coupling_dhead_at2(cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
+        base_coupling_at2 = self._get_cfa_stage('at2', cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
         # Override Spacer Ring qty using actual inner tube length from AT2
         inn_tube_qty = base_coupling_at2[4][1] if len(base_coupling_at2) > 4 else 0
         ctube_at3 = self._apply_cfa_spacer_ring_qty(ctube_at3, inn_tube_qty)
@@ -141,10 +592,10 @@ class ProductProduct(models.Model):
 
     def _get_cfa_extension(self, cfa_type, lead_type, diameter, drive_head, o_length, rotation, teeth, pilot, centre_tube, inner_tube, lead_flight, carrier_flight, coupling_flight):
         # Get all items for at3
-        ctube_at3 = self._get_cfa_coupling_ctube_at3(centre_tube, inner_tube, drive_head, cfa_type)
+        ctube_at3 = self._get_cfa_stage('at3', centre_tube, inner_tube, drive_head, cfa_type)
         elbow = ctube_at3[0][0] if ctube_at3 else ''# Get the elbow item for mapping of inner tube height
         zed_center = "" # leave empty; only applicable for zed type
-        base_coupling_at2 = self._get_cfa_coupling_dhead_at2(cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
+        base_coupling_at2 = self._get_cfa_stage('at2', cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
         # Override Spacer Ring qty using actual inner tube length from AT2
         inn_tube_qty = base_coupling_at2[4][1] if len(base_coupling_at2) > 4 else 0
         ctube_at3 = self._apply_cfa_spacer_ring_qty(ctube_at3, inn_tube_qty)
@@ -164,19 +615,19 @@ class ProductProduct(models.Model):
 
     def _get_cfa_zed(self, cfa_type, lead_type, diameter, drive_head, o_length, rotation, teeth, pilot, centre_tube, inner_tube, lead_flight, carrier_flight, coupling_flight):
         # Get all items for at3
-        ctube_at3 = self._get_cfa_coupling_ctube_at3(centre_tube, inner_tube, drive_head, cfa_type)
+        ctube_at3 = self._get_cfa_stage('at3', centre_tube, inner_tube, drive_head, cfa_type)
         elbow = ctube_at3[0][0] if ctube_at3 else ''  # Get the elbow item for mapping of inner tube height
         # Zed center items
-        zed_center_at6 = self._get_cfa_zed_center_at6(centre_tube, diameter)
+        zed_center_at6 = self._get_cfa_stage('at6', centre_tube, diameter)
         zed_center = zed_center_at6[0][0] if zed_center_at6 else ''
-        base_coupling_at2 = self._get_cfa_coupling_dhead_at2(cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
+        base_coupling_at2 = self._get_cfa_stage('at2', cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
         # Override Spacer Ring qty using actual inner tube length from AT2
         inn_tube_qty = base_coupling_at2[4][1] if len(base_coupling_at2) > 4 else 0
         ctube_at3 = self._apply_cfa_spacer_ring_qty(ctube_at3, inn_tube_qty)
         # Return: Items for lead, carrier, and coupling flights w/ qty
         cfa_stock_flights_at4 = self._get_cfa_lead_ca_co_flights(cfa_type, lead_type, lead_flight, carrier_flight, coupling_flight, o_length, drive_head)
         # Get all the teeth and pilot items
-        teeth_and_pilot_at5 = self._get_cfa_coupling_teeth_at5(diameter, centre_tube, lead_type, teeth, pilot)
+        teeth_and_pilot_at5 = self._get_cfa_stage('at5', diameter, centre_tube, lead_type, teeth, pilot)
         # We combine all components based on lead type
         cfa_tube_gusset_at7 = self._get_cfa_tube_gusset_at7(centre_tube, drive_head)
         teeth_brace = [("ZED Auger Teeth Brace", 2)]
@@ -196,17 +647,17 @@ class ProductProduct(models.Model):
 
     def _get_cfa_single_cut(self, cfa_type, lead_type, diameter, drive_head, o_length, rotation, teeth, pilot, centre_tube, inner_tube, lead_flight, carrier_flight, coupling_flight):
         # Get all items for at3
-        ctube_at3 = self._get_cfa_coupling_ctube_at3(centre_tube, inner_tube, drive_head, cfa_type)
+        ctube_at3 = self._get_cfa_stage('at3', centre_tube, inner_tube, drive_head, cfa_type)
         elbow = ctube_at3[0][0] if ctube_at3 else ''  # Get the elbow item for mapping of inner tube height
         zed_center = "" # leave empty; only applicable for zed type
-        base_coupling_at2 = self._get_cfa_coupling_dhead_at2(cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
+        base_coupling_at2 = self._get_cfa_stage('at2', cfa_type, lead_type, drive_head, centre_tube, inner_tube, pilot, zed_center, elbow, o_length)
         # Override Spacer Ring qty using actual inner tube length from AT2
         inn_tube_qty = base_coupling_at2[4][1] if len(base_coupling_at2) > 4 else 0
         ctube_at3 = self._apply_cfa_spacer_ring_qty(ctube_at3, inn_tube_qty)
         # Return: Items for lead, carrier, and coupling flights w/ qty
         cfa_stock_flights_at4 = self._get_cfa_lead_ca_co_flights(cfa_type, lead_type, lead_flight, carrier_flight, coupling_flight, o_length, drive_head)
         # Get all the teeth and pilot items
-        teeth_and_pilot_at5 = self._get_cfa_coupling_teeth_at5(diameter, centre_tube, lead_type, teeth, pilot)
+        teeth_and_pilot_at5 = self._get_cfa_stage('at5', diameter, centre_tube, lead_type, teeth, pilot)
         cfa_tube_gusset_at7 = self._get_cfa_tube_gusset_at7(centre_tube, drive_head)
 
         # Profiling uses the lead flight product name
@@ -225,6 +676,44 @@ class ProductProduct(models.Model):
         components = [c for c in combination if c and len(c) >= 2 and c[0] and c[1]]
         return components
 
+    def _get_cfa_stage(self, stage, *args):
+        """
+            Run a CFA sub-assembly, through the stage cache for CFA_CACHED_STAGES
+            so variants with the same inputs share its result.
+            param: stage, key of CFA_STAGES, then the arguments of its method
+            return: list of the stage items
+        """
+        if stage not in _cfa_stage_counters:
+            return list(getattr(self, CFA_STAGES[stage])(*args))
+        if stage == 'at3':
+            # the type only drops the plug / plug holder of Intermediate and Extension
+            args = args[:3] + (args[3] if args[3] in ('Intermediate', 'Extension') else '',)
+        _cfa_stage_counters[stage][0] += 1
+        return list(self._get_cfa_stage_row(stage, args))
+
+    @tools.ormcache('stage', 'args')
+    def _get_cfa_stage_row(self, stage, args):
+        _cfa_stage_counters[stage][1] += 1
+        return tuple(getattr(self, CFA_STAGES[stage])(*args))
+
+    @api.model
+    def _get_cfa_stage_stats(self):
+        """
+            Hit rates of the CFA stage caches in this worker since it started;
+            the stage timings are in bom.automation.stat.get_breakdown.
+            return: [{'stage', 'calls', 'hits', 'hit_rate'}]
+        """
+        stats = []
+        for stage, (calls, misses) in _cfa_stage_counters.items():
+            hits = max(calls - misses, 0)
+            stats.append({
+                'stage': stage,
+                'calls': calls,
+                'hits': hits,
+                'hit_rate': round(hits / calls, 3) if calls else 0.0,
+            })
+        return stats
+
     def _create_bom_for_high_tensile_adapter(self, product):
         """
             Create a BOM component for High Tensile Adapter
@@ -245,8 +734,8 @@ class ProductProduct(models.Model):
         reducer = attributes.get('Reducer', '')
         lift_lug = attributes.get('Lift Lug', '')
 
-        _drive1, _drive2, _base_plate = self._get_high_tensile_drive_head(from_drive, to_drive, type)
-        _stiff_ring = self._get_stiffening_ring_for_tensile_adapter(_drive1, _drive2, type)
+        key = tuple((value or '').strip().lower() for value in (from_drive, to_drive, type))
+        _drives, _stiff_ring = self._get_hta_table().get(key) or self._compute_hta_components(from_drive, to_drive, type)
 
         liftlug_match = re.match(r'^\s*(\d+)', lift_lug or '')
         lift_lug_qty = int(liftlug_match.group(1)) if liftlug_match else 0
@@ -256,9 +745,7 @@ class ProductProduct(models.Model):
         _reducer = (c_reducer, 1) if c_reducer else (None, 0)
         _none = (None, 0)
         lst = [
-            _drive1,
-            _drive2,
-            _base_plate or _none,
+            *_drives,
             _reducer,
             _stiff_ring or _none,
             _liftlug,
@@ -266,6 +753,57 @@ class ProductProduct(models.Model):
         components = [x for x in lst if x and x[0]]
         return components
 
+    def _compute_hta_components(self, from_drive, to_drive, type):
+        """
+            return: (drive heads and base plate, stiffening ring or None) of an adapter
+        """
+        _drive1, _drive2, _base_plate = self._get_high_tensile_drive_head(from_drive, to_drive, type)
+        _stiff_ring = self._get_stiffening_ring_for_tensile_adapter(_drive1, _drive2, type)
+        return tuple(x for x in (_drive1, _drive2, _base_plate) if x and x[0]), _stiff_ring
+
+    @tools.ormcache()
+    def _get_hta_table(self):
+        """
+            Components of every from / to drive and coupling type the adapter
+            maps, computed once so a variant is a single lookup.
+            return: {(from, to, type) lowercased: (drive heads and base plate, stiffening ring or None)}
+        """
+        drives = sorted(set(HTA_FEMALE_DRIVES_CI) | set(HTA_MALE_DRIVES_CI))
+        return {
+            key: self._compute_hta_components(*key)
+            for key in itertools.product(drives, drives, HTA_COUPLING_TYPES)
+        }
+
+    def _get_hta_unmapped_combinations(self):
+        """
+            Exhaustiveness report of the adapter table over the From / To / Type
+            values configured on the High Tensile Adapter template.
+            return: [(from, to, type)] missing a drive head component
+        """
+        template = self.env['product.template'].search([('name', '=ilike', 'high tensile adapter')], limit=1)
+        values = {'From': [], 'To': [], 'Type': []}
+        for line in template.attribute_line_ids:
+            if line.attribute_id.name in values:
+                values[line.attribute_id.name] = line.value_ids.mapped('name')
+
+        table = self._get_hta_table()
+        unmapped = []
+        for from_drive, to_drive, type in itertools.product(values['From'], values['To'], values['Type']):
+            key = tuple(value.strip().lower() for value in (from_drive, to_drive, type))
+            if key not in table:
+                unmapped.append((from_drive, to_drive, type))
+                continue
+            _drive1, _drive2, _base_plate = self._get_high_tensile_drive_head(from_drive, to_drive, type)
+            if not (_drive1[0] and _drive2[0]):
+                unmapped.append((from_drive, to_drive, type))
+        if unmapped:
+            _logger.warning(
+                "High Tensile Adapter: %d of %d combinations unmapped: %s",
+                len(unmapped), len(values['From']) * len(values['To']) * len(values['Type']),
+                "; ".join(" / ".join(combination) for combination in unmapped),
+            )
+        return unmapped
+
     def _get_hta_reducer(self, reducer):
         reducer_map = {
             'Reducer - 4" to 2"': 'Reducer - 4" to 2"',
@@ -315,6 +853,10 @@ class ProductProduct(models.Model):
         self._create_bom_components(product, reference, components)
 
     def _get_extension_bar_components(self, product):
+        """
+            param: product.product to get the product attributes
+            return: a list of items to create bom components
+        """
         attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
         type = attributes.get('Type', '')
         drive_head = attributes.get('Drive', '')
@@ -326,20 +868,28 @@ class ProductProduct(models.Model):
         # stubb = attributes.get('Stub', '')
         lift_lug = attributes.get('Lift Lug', '')
 
-        components = []
+        values = {attr.attribute_id.name: attr.product_attribute_value_id for attr in product.product_template_attribute_value_ids}
+        length_value = values.get('Length')
+        if length_value and length_value.has_numeric_value and length_value.numeric_unit in ('m', 'mm'):
+            # pre-parsed on the value: the number followed by "m" the name pattern reads
+            length_no = float(length_value.numeric_value)
+        else:
+            length_no = self._get_eb_length(length)
 
         if type == 'Telescopic Inner':
-            components = self._get_eb_telescopic_inner_components(type, drive_head, adaptor, f_female, m_male, center_tube, length, lift_lug)
-        elif type == 'Telescopic Outer':
-            components = self._get_eb_telescopic_outer_components(type, drive_head, adaptor, f_female, m_male, center_tube, length, lift_lug)
-        else:
-            components = self._get_eb_rigid_components(type, drive_head, adaptor, f_female, m_male, center_tube, length, lift_lug)
+            return self._get_eb_telescopic_inner_components(type, drive_head, adaptor, f_female, m_male, center_tube, length_no, lift_lug)
+        if type == 'Telescopic Outer':
+            return self._get_eb_telescopic_outer_components(type, drive_head, adaptor, f_female, m_male, center_tube, length_no, lift_lug)
+        return self._get_eb_rigid_components(type, drive_head, adaptor, f_female, m_male, center_tube, length_no, lift_lug)
 
-        return components
+    def _get_eb_length(self, length):
+        """ return: the length in meters read from the name of the Length value, 0.0 if none """
+        length_str = re.search(r'(\d+(\.\d+)?)\s*m', (length or '').lower())
+        return float(length_str.group(1)) if length_str else 0.0
 
-    def _get_eb_telescopic_inner_components(self, type, drive_head, adaptor, f_female, m_male, center_tube, length, lift_lug):
+    def _get_eb_telescopic_inner_components(self, type, drive_head, adaptor, f_female, m_male, center_tube, length_no, lift_lug):
         _drive_head = self._get_eb_drive_head(drive_head)
-        _center_tube_stub_bp = self._get_extension_bar_center_tube_at2(type, center_tube, drive_head, f_female, m_male, length, adaptor)
+        _center_tube_stub_bp = self._get_extension_bar_center_tube_at2(type, center_tube, drive_head, f_female, m_male, length_no, adaptor)
         lift_lug = re.match(r'^\s*(\d+(?:\.\d+)?)', lift_lug)
         lift_lug_qty = int(lift_lug.group(1)) if lift_lug else 0.0
         _liftlug = (f'Lift lug', lift_lug_qty) if lift_lug else (None, 0)
@@ -353,9 +903,9 @@ class ProductProduct(models.Model):
         components = [x for x in lst if x[0]]
         return components
 
-    def _get_eb_telescopic_outer_components(self, type, drive_head, adaptor, f_female, m_male, center_tube, length, lift_lug):
+    def _get_eb_telescopic_outer_components(self, type, drive_head, adaptor, f_female, m_male, center_tube, length_no, lift_lug):
         _drive_head = self._get_eb_drive_head(drive_head)
-        _center_tube_stub_bp = self._get_extension_bar_center_tube_at2(type, center_tube, drive_head, f_female, m_male, length, adaptor)
+        _center_tube_stub_bp = self._get_extension_bar_center_tube_at2(type, center_tube, drive_head, f_female, m_male, length_no, adaptor)
         _dhead = _drive_head[0] if _drive_head else '' # drive head item
         _gusset = self._get_extension_bar_center_tube_gusset(_dhead, center_tube)
         lift_lug = re.match(r'^\s*(\d+(?:\.\d+)?)', lift_lug)
@@ -370,17 +920,12 @@ class ProductProduct(models.Model):
         components = [x for x in lst if x[0]]
         return components
 
-    def _get_eb_rigid_components(self, type, drive_head, adaptor, f_female, m_male, center_tube, length, lift_lug):
+    def _get_eb_rigid_components(self, type, drive_head, adaptor, f_female, m_male, center_tube, length_no, lift_lug):
         """
             return: list of items for dhead, base plate, stub and gusset
         """
-        def _get_mm_size(str):
-            fm_str = re.search(r'(\d+)mm', str)
-            number = int(fm_str.group(1)) if fm_str else 0
-            return number
-
-        f_female_mm = _get_mm_size(f_female)
-        d_head_mm = _get_mm_size(drive_head)
+        f_female_mm = self._get_mm_number(f_female)
+        d_head_mm = self._get_mm_number(drive_head)
 
         _drive_head = self._get_eb_drive_head(drive_head)
         _drive_head_1 = _drive_head[0] if _drive_head else ''  # Drive head item
@@ -389,7 +934,7 @@ class ProductProduct(models.Model):
         _dhead_qty = 1 if f_female and _drive_head_1 != _drive_head_2 or not f_female else 2
         _dhead = (_drive_head_1, _dhead_qty) if not m_male else (None, 0)
 
-        _center_tube_stub_bp = self._get_extension_bar_center_tube_at2(type, center_tube, drive_head, f_female, m_male, length, adaptor)
+        _center_tube_stub_bp = self._get_extension_bar_center_tube_at2(type, center_tube, drive_head, f_female, m_male, length_no, adaptor)
 
         _gusset = self._get_extension_bar_center_tube_gusset(_drive_head_1, center_tube)
         _gusset_name = _gusset[0] if _gusset else ''  # Gusset item
@@ -420,61 +965,24 @@ class ProductProduct(models.Model):
         return components
 
     def _get_eb_collar(self, centre):
-        centre_tube = {
-            "4140 75mm square billet": "Extension Bar Collar - 75mm",
-            "4140 100mm square billet": "Extension Bar Collar - 100mm"
-        }
-        return centre_tube.get(centre, '')
+        return EB_COLLARS.get(centre, '')
 
     def _get_eb_drive_head(self, drive_head):
-        DRIVE_HEAD = {
-            '75mm Square Drive': 'Drive Head - 75mm Square',
-            '100mm Square Drive': 'Drive Head - 100mm Square',
-            '110mm Square Drive': 'Drive Head - 110mm Square',
-            '130mm Square Drive': 'Drive Head - 130mm Square',
-            '130mm Square Digga Drive': 'Drive Head - 130mm Square DIGGA',
-            '150mm Square Drive': 'Drive Head - 150mm Square',
-            '150mm Square IMT Drive': 'Drive Head - 150mm Square IMT',
-            '200mm Square Bauer Drive': 'Drive Head - 200mm Square Bauer',
-            '200mm Square MAIT Drive': 'Drive Head - 200mm Square MAIT'
-        }
-        return (DRIVE_HEAD.get(drive_head, ''), 1)
+        return (EB_DRIVE_HEADS.get(drive_head, ''), 1)
 
     def _get_eb_female_gusset_dhead(self, female):
         """
         param: female_female attribute
         return: find the drive head based on the female attribute for gusset 2
         """
-        F_FEMALE = {
-            'to 75mm Square Drive (Female to Female)': 'Drive Head - 75mm Square',
-            'to 100mm Square Drive (Female to Female)': 'Drive Head - 100mm Square',
-            'to 110mm Square Drive (Female to Female)': 'Drive Head - 110mm Square',
-            'to 130mm Square Drive (Female to Female)': 'Drive Head - 130mm Square',
-            'to 130mm Square Digga Drive (Female to Female)': 'Drive Head - 130mm Square DIGGA',
-            'to 150mm Square Drive (Female to Female)': 'Drive Head - 150mm Square',
-            'to 150mm Square IMT Drive (Female to Female)': 'Drive Head - 150mm Square IMT',
-            'to 200mm Square Bauer Drive (Female to Female)': 'Drive Head - 200mm Square Bauer',
-            'to 200mm Square MAIT Drive (Female to Female)': 'Drive Head - 200mm Square MAIT',
-        }
-        return F_FEMALE.get(female, '')
+        return EB_FEMALE_DRIVE_HEADS.get(female, '')
 
     def _get_eb_male_stub_dhead(self, male):
         """
         param: male_male attribute
         return: find the drive head based on the male attribute for stub 2
         """
-        M_MALE = {
-            'to 75mm Square Drive (Male to Male)': 'Drive Head - 75mm Square',
-            'to 100mm Square Drive (Male to Male)': 'Drive Head - 100mm Square',
-            'to 110mm Square Drive (Male to Male)': 'Drive Head - 110mm Square',
-            'to 130mm Square Drive (Male to Male)': 'Drive Head - 130mm Square',
-            'to 130mm Square Digga Drive (Male to Male)': 'Drive Head - 130mm Square DIGGA',
-            'to 150mm Square Drive (Male to Male)': 'Drive Head - 150mm Square',
-            'to 150mm Square IMT Drive (Male to Male)': 'Drive Head - 150mm Square IMT',
-            'to 200mm Square Bauer Drive (Male to Male)': 'Drive Head - 200mm Square Bauer',
-            'to 200mm Square MAIT Drive (Male to Male)': 'Drive Head - 200mm Square MAIT',
-        }
-        return M_MALE.get(male, '')
+        return EB_MALE_DRIVE_HEADS.get(male, '')
 
     def _get_drive_head_from_female(self, female):
             if not female or female == 'N/A' or 'Custom' in female:
@@ -488,110 +996,36 @@ class ProductProduct(models.Model):
                 return f"Drive Head - {match.group(1)}"
             return ''
 
-    def _get_extension_bar_center_tube_at2(self, type, center_tube, drive_head, f_female, m_male, length, adaptor):
-        """Compute center tube quantity for Extension Bar based on type, drive head, and stub"""
-
-        def _get_mm_number(str):
-            fm_str = re.search(r'(\d+)mm', str)
-            number = int(fm_str.group(1)) if fm_str else 0
-            return number
-
-        # list of heights [dh_height, bp_thikness, stub_height]
-        DRIVE_HEAD_HEIGHTS = {
-            '75mm Square Drive': [150, 0, 40],
-            '100mm Square Drive': [175, 25, 50],
-            '110mm Square Drive': [240, 25, 40],
-            '130mm Square Drive': [260, 32, 40],
-            '130mm Square Digga Drive': [260, 32, 40],
-            '150mm Square Drive': [260, 32, 60],
-            '150mm Square IMT Drive': [260, 32, 60],
-            '200mm Square Bauer Drive': [457, 32, 60],
-            '200mm Square MAIT Drive': [345, 32, 60],
-        }
-        # mapping of items for base plate and stub
-        BASE_PLATE = {
-            '100mm Square Drive': 'Base Plate - 100mm Head',
-            '110mm Square Drive': 'Base Plate - 110mm Head',
-            '130mm Square Drive': 'Base Plate - 130mm Head',
-            '130mm Square Digga Drive': 'Base Plate - 130mm Head',
-            '150mm Square Drive': 'Base Plate - 150mm Head',
-            '150mm Square IMT Drive': 'Base Plate - 150mm Head',
-            '200mm Square Bauer Drive': 'Base Plate - 200mm Head',
-            '200mm Square MAIT Drive': 'Base Plate - 200mm Head ',
-        }
-        STUB = {
-            'to 75mm Square Stub': '75mm Square Extension Bar Stubb',
-            'to 100mm Square Stub': '100mm square Stubb',
-            'to 110mm Square Stub': '110mm Drive Stubb',
-            'to 130mm Square Stub': '130mm Stubb',
-            'to 130mm Square Digga Stub': '130mm Stubb - Digga',
-            'to 150mm Square Stub': '150mm Drive Stub',
-            'to 150mm Square IMT Stub': '150mm IMT Stub',
-            'to 200mm Square Bauer Stub': '200mm Bauer Drive Stubb',
-            'to 200mm Square MAIT Stub': '200mm MAIT Square Stub'
-        }
-        STUB_DHEAD = {
-            '75mm Square Drive': '75mm Square Extension Bar Stubb',
-            '100mm Square Drive': '100mm square Stubb',
-            '110mm Square Drive': '110mm Drive Stubb',
-            '130mm Square Drive': '130mm Stubb',
-            '130mm Square Digga Drive': '130mm Stubb - Digga',
-            '150mm Square Drive': '150mm Drive Stub',
-            '150mm Square IMT Drive': '150mm IMT Stub',
-            '200mm Square Bauer Drive': '200mm Bauer Drive Stubb',
-            '200mm Square MAIT Drive': '200mm MAIT Square Stub'
-        }
-        # mapping of stub item and height
-        STUB_2 = {
-            'to 75mm Square Drive (Male to Male)': ['75mm Square Extension Bar Stubb', 40],
-            'to 100mm Square Drive (Male to Male)': ['100mm square Stubb', 50],
-            'to 110mm Square Drive (Male to Male)': ['110mm Drive Stubb', 40],
-            'to 130mm Square Drive (Male to Male)': ['130mm Stubb', 40],
-            'to 130mm Square Digga Drive (Male to Male)': ['130mm Stubb - Digga', 40],
-            'to 150mm Square Drive (Male to Male)': ['150mm Drive Stub', 60],
-            'to 150mm Square IMT Drive (Male to Male)': ['150mm IMT Stub', 60],
-            'to 200mm Square Bauer Drive (Male to Male)': ['200mm Bauer Drive Stubb', 60],
-            'to 200mm Square MAIT Drive (Male to Male)': ['200mm MAIT Square Stub', 60],
-        }
-        # mapping of female head and base plate
-        DH_BP_2 = {
-            'to 75mm Square Drive (Female to Female)': [150, 0],
-            'to 100mm Square Drive (Female to Female)': [175, 25],
-            'to 110mm Square Drive (Female to Female)': [240, 25],
-            'to 130mm Square Drive (Female to Female)': [260, 32],
-            'to 130mm Square Digga Drive (Female to Female)': [260, 32],
-            'to 150mm Square Drive (Female to Female)': [260, 32],
-            'to 150mm Square IMT Drive (Female to Female)': [260, 32],
-            'to 200mm Square Bauer Drive (Female to Female)': [457, 32],
-            'to 200mm Square MAIT Drive (Female to Female)': [345, 32],
-        }
+    def _get_extension_bar_center_tube_at2(self, type, center_tube, drive_head, f_female, m_male, length_no, adaptor):
+        """
+            Compute center tube quantity for Extension Bar based on type, drive head, and stub
+            param: length_no, length of the bar in meters
+        """
         _drive_head = self._get_eb_drive_head(drive_head)
         _drive_head_1 = _drive_head[0] if _drive_head else ''  # Drive head item
         _drive_head_2 = self._get_drive_head_from_female(f_female)
 
-        d_head = DRIVE_HEAD_HEIGHTS.get(drive_head, [])
-        length_str = re.search(r'(\d+(\.\d+)?)\s*m', length.lower())
-        length_no = float(length_str.group(1)) if length_str else 0.0
+        d_head = EB_DRIVE_HEAD_HEIGHTS_M.get(drive_head, [])
 
         # Find the mm size of Female Female and Drive
-        f_female_no = _get_mm_number(f_female)
-        d_head_no = _get_mm_number(drive_head)
+        f_female_no = self._get_mm_number(f_female)
+        d_head_no = self._get_mm_number(drive_head)
 
-        # Convert mm to meters for head, base, stub
-        head_height = d_head[0] / 1000.0 if d_head else 0
-        base_height = d_head[1] / 1000.0 if d_head else 0
-        stub_height = d_head[2] / 1000.0 if d_head else 0
+        # Heights of head, base, stub, already in meters
+        head_height = d_head[0] if d_head else 0
+        base_height = d_head[1] if d_head else 0
+        stub_height = d_head[2] if d_head else 0
 
-        Dh_bp_2 = DH_BP_2.get(f_female, [])
-        Stub_2 = STUB_2.get(m_male, [])
-        Base_plate = BASE_PLATE.get(drive_head, '')
-        Stub = STUB.get(adaptor, '')
-        Stub_dhead = STUB_DHEAD.get(drive_head, '')
+        Dh_bp_2 = EB_FEMALE_HEADS_M.get(f_female, [])
+        Stub_2 = EB_MALE_STUBS_M.get(m_male, [])
+        Base_plate = EB_BASE_PLATES.get(drive_head, '')
+        Stub = EB_ADAPTOR_STUBS.get(adaptor, '')
+        Stub_dhead = EB_DRIVE_STUBS.get(drive_head, '')
 
         # Find the heights
-        dhead_2 = Dh_bp_2[0] / 1000.0 if f_female else 0  # drive head 2
-        bp_2 = Dh_bp_2[1] / 1000.0 if f_female else 0  # base plate 2
-        stub_2 = Stub_2[1] / 1000.0 if m_male else 0  # stub 2
+        dhead_2 = Dh_bp_2[0] if f_female else 0  # drive head 2
+        bp_2 = Dh_bp_2[1] if f_female else 0  # base plate 2
+        stub_2 = Stub_2[1] if m_male else 0  # stub 2
 
         tube_qty = 0
         if type == 'Telescopic Inner':
@@ -735,167 +1169,7 @@ class ProductProduct(models.Model):
         Returns:
             tuple: (component_name, quantity), e.g., ("Gusset - 130mm Drive 273mm Tube", 1)
         """
-        dhead_100_110_mm = ['Drive Head - 100mm Square', 'Drive Head - 110mm Square']
-        dhead_130_mm = ['Drive Head - 130mm Square', 'Drive Head - 130mm Square DIGGA']
-        dhead_150_mm = ['Drive Head - 150mm Square', 'Drive Head - 150mm Square IMT']
-        dhead_200_mm = ['Drive Head - 200mm Square Bauer', 'Drive Head - 200mm Square MAIT']
-
-        gusset_map = {
-            'dhead_100_110_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD128mm WT 11.5mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD150mm ID120mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 26mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 100mm Drive 219mm Tube",
-                # Pipes
-                'Pipe - OD168mm WT6.4mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 100mm Drive 219mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 100mm Drive 219mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 100mm Drive 219mm Tube",
-            },
-            'dhead_130_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD150mm ID120mm': "Gusset - 130mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 26mm': "Gusset - 130mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 130mm Drive 150mm Tube",
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 130mm Drive 219mm Tube",
-                'Hollow bar - OD273mm WT14': "Gusset - 130mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 25mm': "Gusset - 130mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 32mm': "Gusset - 130mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT25mm': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow Bar - OD323mm WT30mm': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow Bar - OD356 ID306': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow bar - OD457mm T35mm': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow bar - OD457mm T25mm': "Gusset - 130mm Drive 323mm Tube",
-                # Pipes
-                'Pipe - OD168mm WT6.4mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD273mm WT9.3mm': "Gusset - 130mm Drive 273mm Tube",
-                'Pipe - OD273mm WT6.4mm': "Gusset - 130mm Drive 273mm Tube",
-                'Pipe - OD273mm WT12.7mm': "Gusset - 130mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.75mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD323mm WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD323mm WT6.4mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD323mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD355 WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD355mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - 406mm 9.5mm WT': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD406mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD457mm WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD457mm WT15.9mm': "Gusset - 130mm Drive 323mm Tube",
-            },
-            'dhead_150_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD150mm ID120mm': "Gusset - 150mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 26mm': "Gusset - 150mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 150mm Drive 150mm Tube",
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow bar - OD273mm WT14': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 25mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 32mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT25mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT30mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD356 ID306': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T35mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T25mm': "Gusset - 150mm Drive 273mm Tube",
-                # Pipes (smaller pipes use 130mm gussets)
-                'Pipe - OD168mm WT6.4mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 130mm Drive 219mm Tube",
-                # Larger pipes use 150mm gussets
-                'Pipe - OD273mm WT9.3mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD273mm WT6.4mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD273mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.75mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT6.4mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD355 WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD355mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - 406mm 9.5mm WT': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD406mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD457mm WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD457mm WT15.9mm': "Gusset - 150mm Drive 273mm Tube",
-            },
-            'dhead_200_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow bar - OD273mm WT14': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 25mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 32mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT25mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT30mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD356 ID306': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T35mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T25mm': "Gusset - 200mm Drive 273mm Tube",
-                # Pipes
-                'Pipe - OD168mm WT6.4mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD273mm WT9.3mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD273mm WT6.4mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD273mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.75mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT6.4mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD355 WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD355mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - 406mm 9.5mm WT': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD406mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD457mm WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD457mm WT15.9mm': "Gusset - 200mm Drive 273mm Tube",
-            }
-        }
-
-        d_head = ''
-        if drive_head in dhead_100_110_mm:
-            d_head = 'dhead_100_110_mm'
-        elif drive_head in dhead_130_mm:
-            d_head = 'dhead_130_mm'
-        elif drive_head in dhead_150_mm:
-            d_head = 'dhead_150_mm'
-        elif drive_head in dhead_200_mm:
-            d_head = 'dhead_200_mm'
-
-        gusset_label = gusset_map.get(d_head, {}).get(center_tube)
+        gusset_label = EB_GUSSET_INDEX.get((drive_head, center_tube))
         return (gusset_label, 1) if gusset_label else (None, 0)
 
     def _get_high_tensile_drive_head(self, from_drive, to_drive, type):
@@ -911,93 +1185,14 @@ class ProductProduct(models.Model):
             list of tuple: [(component_name, qty), ...]
         """
 
-        female_map = {
-            "3.5\" API Coupling": "3.5\" API Female coupling",
-            "2\" Hex Coupling": "2\" Hex Coupling - Female",
-            "3\" Hex Coupling": "3\" Hex Coupling - Female",
-            "4\" Hex Coupling": "4\" Hex Coupling - Female",
-            "35TM Coupling": "35TM Coupling - Female",
-            "53TM Coupling": "53TM Coupling - Female",
-            "Carrendeena 5\" Coupling": "Carrendeena 5\" Coupling - Female",
-            "Casagrande 5\" Coupling": "Casagrande 5\" Coupling - Female",
-            "HD4 Coupling": "HD4 Coupling - Female",
-            "HD5 Coupling": "HD5 Coupling - Female",
-            "25XHD5 Coupling": "25XHD5 Coupling - Female",
-            "XHD5 Coupling": "XHD5 Coupling - Female",
-            "XHD5 Mini Coupling": "XHD5 Mini Coupling - Female",
-            "Llamada Coupling": "Llamada Coupling - Female",
-            "MAIT175 Coupling": "MAIT175 Coupling - Female",
-            "MAIT200 Coupling": "MAIT200 Coupling - Female",
-            "SW80 Coupling": "TB80/SW80 Coupling - Female",
-            "SW110 Coupling": "SW110 Female Coupling",
-            "SW150 EMDE Coupling": "SW150 EMDE Female",
-            "SW150 Bauer Coupling": "SW150 Bauer Coupling - Female",
-            "SW175 Coupling": "SW175 Coupling - Female",
-            "SW200 Coupling": "SW200 Female Coupling",
-            "SW250 Coupling": "SW250 Female Coupling",
-            "TB46 Coupling": "TB46 Coupling - Female",
-            "65mm Round Drive": "Drive Head - 65mm Round",
-            "65mm Square Drive": "Drive Head - 65mm Square",
-            "75mm Square Drive": "Drive Head - 75mm Square",
-            "100mm Square Drive": "Drive Head - 100mm Square",
-            "110mm Square Drive": "Drive Head - 110mm Square",
-            "130mm Square Drive": "Drive Head - 130mm Square",
-            "130mm Square Drive DIGGA": "Drive Head - 130mm Square DIGGA",
-            "150mm Square Drive": "Drive Head - 150mm Square",
-            "150mm Square Drive IMT": "Drive Head - 150mm Square IMT",
-            "200mm Square Drive Bauer": "Drive Head - 200mm Square Bauer",
-            "200mm Square Drive MAIT": "Drive Head - 200mm Square MAIT",
-            "150mm AT Hex": "Drive Head - 150mm AT Hex",
-            "Terex 2.5\" Hex H250": "Terex Hex Hub Female 2.5\" (H250)"
-        }
-
-        male_map = {
-            "3.5\" API Coupling": "3.5\" API Male coupling",
-            "2\" Hex Coupling": "2\" Hex Coupling - Male Male Joiner",
-            "3\" Hex Coupling": "3\" Hex Coupling - Male Male Joiner",
-            "4\" Hex Coupling": "4\" Hex Coupling - Male Male Joiner",
-            "35TM Coupling": "35TM Coupling - Male",
-            "53TM Coupling": "53TM Coupling - Male",
-            "Carrendeena 5\" Coupling": "Carrendeena 5\" Coupling - Male",
-            "Casagrande 5\" Coupling": "Casagrande 5\" Coupling - Male",
-            "HD4 Coupling": "HD4 Coupling - Male",
-            "HD5 Coupling": "HD5 Coupling - Male",
-            "25XHD5 Coupling": "25XHD5 Coupling - Male",
-            "XHD5 Coupling": "XHD5 Coupling - Male",
-            "XHD5 Mini Coupling": "XHD5 Mini Coupling - Male",
-            "Llamada Coupling": "Llamada Coupling - Male",
-            "MAIT175 Coupling": "MAIT175 Coupling - Male",
-            "MAIT200 Coupling": "MAIT200 Coupling - Male",
-            "SW80 Coupling": "TB80/SW80 Coupling - Male",
-            "SW110 Coupling": "SW110 Male Coupling",
-            "SW150 EMDE Coupling": "SW150 EMDE Female",
-            "SW150 Bauer Coupling": "SW150 Bauer Coupling - Female",
-            "SW175 Coupling": "SW175 Coupling - male",
-            "SW200 Coupling": "SW200 Male Coupling",
-            "SW250 Coupling": "SW250 Male Coupling",
-            "TB46 Coupling": "TB46 Coupling - Male",
-            "75mm Square Drive": "75mm Square Extension Bar Stubb",
-            "100mm Square Drive": "100mm square Stubb",
-            "110mm Square Drive": "110mm Drive Stubb",
-            "130mm Square Drive": "130mm Stubb",
-            "130mm Square Drive DIGGA": "130mm Stubb - Digga",
-            "150mm Square Drive": "150mm Stub",
-            "150mm Square Drive IMT": "150mm IMT Stub",
-            "200mm Square Drive Bauer": "200mm Bauer Drive Stubb",
-            "200mm Square Drive MAIT": "200mm MAIT Square Stub",
-        }
-
-        female_ci = {k.strip().lower(): v for k, v in female_map.items()}
-        male_ci = {k.strip().lower(): v for k, v in male_map.items()}
-
         fd = (from_drive or '').strip().lower()
         td = (to_drive or '').strip().lower()
         type_norm = (type or '').strip().lower()
 
-        from_female = female_ci.get(fd)
-        from_male = male_ci.get(fd)
-        to_female = female_ci.get(td)
-        to_male = male_ci.get(td)
+        from_female = HTA_FEMALE_DRIVES_CI.get(fd)
+        from_male = HTA_MALE_DRIVES_CI.get(fd)
+        to_female = HTA_FEMALE_DRIVES_CI.get(td)
+        to_male = HTA_MALE_DRIVES_CI.get(td)
 
         ff_dhead = ""
         if type_norm == 'female to female':
@@ -1041,55 +1236,6 @@ class ProductProduct(models.Model):
             tuple or None: e.g. ('[75 Drive Stiffening Collar] Stiffening Ring - 130mm Stubb', 1)
         """
 
-        stiffening_matrix = {
-            'Drive Head - 100mm Square': {
-                '75mm Stubb': True, '100mm Stubb': False, '110mm Stubb': False,
-                '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
-            },
-            'Drive Head - 110mm Square': {
-                '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': False,
-                '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
-            },
-            'Drive Head - 130mm Square': {
-                '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
-                '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
-            },
-            'Drive Head - 130mm Square DIGGA': {
-                '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
-                '130mm Stubb': False, '150mm Stubb': False, '75mm Head': True,
-            },
-            'Drive Head - 150mm Square': {
-                '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
-                '130mm Stubb': True, '150mm Stubb': False, '75mm Head': True,
-            },
-            'Drive Head - 150mm Square IMT': {
-                '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
-                '130mm Stubb': True, '150mm Stubb': True, '75mm Head': True,
-            },
-            'Drive Head - 200mm Square Bauer': {
-                '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
-                '130mm Stubb': True, '150mm Stubb': True, '75mm Head': True,
-            },
-            'Drive Head - 200mm Square MAIT': {
-                '75mm Stubb': True, '100mm Stubb': True, '110mm Stubb': True,
-                '130mm Stubb': True, '150mm Stubb': True, '75mm Head': True,
-            },
-        }
-
-        ring_label_map = {
-            '75mm Stubb': 'Stiffening Ring - 75mm Stubb',
-            '100mm Stubb': 'Stiffening Ring - 100mm Stubb',
-            '110mm Stubb': 'Stiffening Ring - 110mm Stubb',
-            '130mm Stubb': 'Stiffening Ring - 130mm Stubb',
-            '150mm Stubb': 'Stiffening Ring - 150mm Stubb',
-            '75mm Head': 'Stiffening Ring - 75mm Head',
-        }
-
-        matrix_ci = {
-            k.strip().lower(): {sk.strip().lower(): sv for sk, sv in v.items()}
-            for k, v in stiffening_matrix.items()
-        }
-
         def _name(t):
             return t[0] if t and t[0] else ""
 
@@ -1106,11 +1252,11 @@ class ProductProduct(models.Model):
         if not drive:
             return None
 
-        available = matrix_ci.get(drive.strip().lower())
+        available = HTA_STIFFENING_MATRIX_CI.get(drive.strip().lower())
         dhead_75 = self._get_mm_number(drive)
 
         if dhead_75 == 75:
-            return (ring_label_map['75mm Head'], 1)
+            return (HTA_STIFFENING_RINGS['75mm Head'], 1)
 
         if not available:
             return None
@@ -1122,7 +1268,7 @@ class ProductProduct(models.Model):
                 preferred_stub = f"{match.group(1)}mm Stubb"
 
         if preferred_stub and available.get(preferred_stub.strip().lower()):
-            return (ring_label_map[preferred_stub], 1)
+            return (HTA_STIFFENING_RINGS[preferred_stub], 1)
 
         return None
 
@@ -1134,18 +1280,15 @@ class ProductProduct(models.Model):
         unit = self.env.ref('uom.product_uom_unit', raise_if_not_found=False)
 
         components = [c for c in components if c and len(c) >= 2 and c[0] and c[1]]
+        component_uoms = {
+            component_name: uom_meter if any(x in component_name for x in ['Hollow Bar', 'Pipe']) else unit
+            for component_name, qty in components
+        }
+        products = self._get_or_create_bom_components(component_uoms)
         for component_name, qty in components:
-            uom = uom_meter if any(x in component_name for x in ['Hollow Bar', 'Pipe']) else unit
-            component = self.env['product.product'].search([('name', '=ilike', component_name)], limit=1)
-            if not component:
-                component = self.env['product.product'].create({
-                    'name': component_name,
-                    'type': 'consu',
-                    'is_storable': True,
-                    'uom_id': uom.id,
-                })
+            uom = component_uoms[component_name]
             bom_lines.append((0, 0, {
-                'product_id': component.id,
+                'product_id': products[component_name].id,
                 'product_qty': qty,
                 'product_uom_id': uom.id,
             }))
@@ -1247,39 +1390,20 @@ class ProductProduct(models.Model):
         c_tube_od = int(od_match.group(1)) if od_match else ''
 
         if lead_type in ['Dual Rock', 'Taper Rock']:
-            return self._get_dual_taper_teeth(dia, teeth, pilot)
+            return self._get_teeth_parts('cfa dual taper', dia, teeth, pilot)
         elif lead_type in ['ZED 50mm', 'ZED 40mm', 'ZED 32mm', 'ZED 25mm']:
-            return self._get_zed_teeth(dia, teeth, c_tube_od)
+            return self._get_teeth_parts('cfa zed', dia, teeth, pilot, c_tube_od)
         elif lead_type == 'Clay/Shale':
-            return self._get_clay_shale_teeth(dia, teeth, pilot)
+            return self._get_teeth_parts('cfa clay shale', dia, teeth, pilot)
         elif lead_type == 'Single Cut':
-            return self._get_single_cut_teeth(dia, teeth, pilot)
+            return self._get_teeth_parts('cfa single cut', dia, teeth, pilot)
         else:
             return (None, 0)
 
     def _get_cfa_zed_center_at6(self, center_tube, diameter):
         # dia = int(re.search(r"\d+\.?\d*", diameter).group())
         dia = diameter
-        center_tube_map = {
-            # Hollow Bars
-            'Hollow Bar - OD150mm ID120mm': "ZED Centre 150mm",
-            'Hollow Bar - OD152mm WT 26mm': "ZED Centre 150mm",
-            'Hollow Bar - OD152mm WT 33.5mm': "ZED Centre 150mm",
-            'Hollow Bar - OD168mm WT 21.5mm': "ZED Centre 168mm",
-            'Hollow Bar - OD168mm WT 29mm': "ZED Centre 168mm",
-            'Hollow Bar - OD170mm ID140mm': "ZED Centre 168mm",
-            'Hollow Bar - OD219mm WT 25mm': "ZED Centre 219mm",
-            'Hollow bar - OD273mm WT14': "ZED Centre 273mm",
-            'Hollow Bar - OD273mm WT 25mm': "ZED Centre 273mm",
-            'Hollow Bar - OD273mm WT 32mm': "ZED Centre 273mm",
-            # Pipes
-            'Pipe - OD168mm WT4.8mm': "ZED Centre 168mm",
-            'Pipe - OD168mm WT6.4mm': "ZED Centre 168mm",
-            'Pipe - OD168mm WT11mm': "ZED Centre 168mm",
-            'Pipe - OD219mm WT12.7mm': "ZED Centre 219mm",
-            'Pipe - OD273mm WT12.7mm': "ZED Centre 273mm",
-        }
-        zed_center = [(center_tube_map.get(center_tube, ''), 1)]
+        zed_center = [(self._get_zed_center_component_map(center_tube), 1)]
         zed_flight = [('ZED Flight Stiffener (Under 600mm)', 2)] if dia < 600 else [('ZED Flight Stiffener (600mm+)', 2)]
 
         return zed_center + zed_flight
@@ -2022,6 +2146,25 @@ class ProductProduct(models.Model):
         coupling qty is still calculated from the carrier pitch attribute
         so that the carrier qty correctly accounts for the coupling space.
         """
+        (cfa_type, l_pitch, l_no_turn, ca_pitch, ca_no_turn, co_pitch, co_no_turn,
+         female_height, co_has_attrs, o_length_mm) = self._get_cfa_flight_inputs(
+            cfa_type, l_flight, ca_flight, co_flight, overall_length, drive_head, c_flight_pt, co_flight_id,
+        )
+
+        # Calculate coupling qty — uses fallback pitch even when product unavailable
+        co_qty = self._get_cfa_coflight_qty(female_height, co_pitch, co_no_turn, co_has_attrs)
+        ca_qty = self._get_cfa_caflight_qty(cfa_type, l_pitch, l_no_turn, ca_pitch, ca_no_turn, co_qty, o_length_mm)
+
+        return ca_qty, co_qty
+
+    def _get_cfa_flight_inputs(self, cfa_type, l_flight, ca_flight, co_flight, overall_length, drive_head, c_flight_pt='', co_flight_id=''):
+        """
+            Numeric inputs of the carrier and coupling flight quantities, for the
+            scalar functions or the batched _get_cfa_flight_qtys.
+            return: (cfa type, lead pitch, lead turns, carrier pitch, carrier turns,
+            coupling pitch, coupling turns, female coupling height, coupling selected,
+            overall length)
+        """
         def _get_pitch(res):
             p_match = re.search(r'P(\d+)', res)
             r_match = re.search(r'R(\d+\.\d+)', res)
@@ -2048,12 +2191,53 @@ class ProductProduct(models.Model):
         o_length = re.search(r'([\d.]+)\s*m\b', overall_length)
         o_length_mm = float(o_length.group(1)) if o_length else 0
 
-        # Calculate coupling qty — uses fallback pitch even when product unavailable
         co_has_attrs = bool(co_flight or (co_flight_id and c_flight_pt))
-        co_qty = self._get_cfa_coflight_qty(female_height, co_pitch, co_no_turn, co_has_attrs)
-        ca_qty = self._get_cfa_caflight_qty(cfa_type, l_pitch, l_no_turn, ca_pitch, ca_no_turn, co_qty, o_length_mm)
+        return (cfa_type, l_pitch, l_no_turn, ca_pitch, ca_no_turn, co_pitch, co_no_turn,
+                female_height, co_has_attrs, o_length_mm)
 
-        return ca_qty, co_qty
+    def _get_cfa_flight_qtys(self, cfa_types, l_pitches, l_no_turns, ca_pitches, ca_no_turns,
+                             co_pitches, co_no_turns, female_heights, co_has_attrs, overall_lengths):
+        """
+            Batched _get_cfa_coflight_qty / _get_cfa_caflight_qty over arrays of the
+            same length, with numpy when installed. Same operations in the same order
+            and the same half flight rounding, so the quantities are identical to
+            the scalar path.
+            return: ([carrier qty], [coupling qty])
+        """
+        if numpy is None:
+            ca_qtys, co_qtys = [], []
+            for (cfa_type, l_pitch, l_no_turn, ca_pitch, ca_no_turn, co_pitch, co_no_turn,
+                 female_height, has_attrs, o_length) in zip(
+                    cfa_types, l_pitches, l_no_turns, ca_pitches, ca_no_turns,
+                    co_pitches, co_no_turns, female_heights, co_has_attrs, overall_lengths):
+                co_qty = self._get_cfa_coflight_qty(female_height, co_pitch, co_no_turn, has_attrs)
+                ca_qtys.append(self._get_cfa_caflight_qty(cfa_type, l_pitch, l_no_turn, ca_pitch, ca_no_turn, co_qty, o_length))
+                co_qtys.append(co_qty)
+            return ca_qtys, co_qtys
+
+        type_code = numpy.array([CFA_TYPE_CODES.get(cfa_type, 0) for cfa_type in cfa_types])
+        co_pitch = numpy.asarray(co_pitches, dtype=numpy.float64)
+        co_no_turn = numpy.asarray(co_no_turns, dtype=numpy.float64)
+        co_valid = numpy.asarray(co_has_attrs, dtype=bool) & (co_pitch != 0) & (co_no_turn != 0)
+        l_pitch = numpy.asarray(l_pitches, dtype=numpy.float64) / 1000.0
+        ca_pitch = numpy.asarray(ca_pitches, dtype=numpy.float64) / 1000.0
+        ca_denominator = ca_pitch * numpy.asarray(ca_no_turns, dtype=numpy.float64)
+        o_length = numpy.asarray(overall_lengths, dtype=numpy.float64)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            # round half to even, as the python round of the scalar path
+            co_qty = numpy.rint(numpy.asarray(female_heights, dtype=numpy.float64) / (co_pitch * co_no_turn) * 2) / 2
+            co_qty = numpy.where(co_valid, co_qty, 0.0)
+            ca_qty = numpy.where(
+                type_code == 1,
+                ((o_length - (l_pitch * numpy.asarray(l_no_turns, dtype=numpy.float64))) / ca_denominator) - co_qty,
+                (o_length / ca_denominator) - co_qty,
+            )
+            ca_qty = numpy.ceil(ca_qty * 2) / 2
+        ca_valid = (ca_denominator != 0) & (type_code != 0)
+        return (
+            [q if ok else 0 for q, ok in zip(ca_qty.tolist(), ca_valid.tolist())],
+            [q if ok else 0 for q, ok in zip(co_qty.tolist(), co_valid.tolist())],
+        )
 
     def _get_cfa_caflight_qty(self, cfa_type, le_pitch, l_no_turn, car_pitch, ca_no_turn, co_qty, overall_length):
         o_length = overall_length
@@ -1,13 +1,249 @@
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 import csv
 import re
 from odoo.tools import file_path
 from odoo.exceptions import ValidationError
+from odoo.osv import expression
 import logging
 import math
 from decimal import Decimal, ROUND_HALF_UP
+import bisect
+import itertools
+import time
 _logger = logging.getLogger(__name__)
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Centre tube ranges per tube kind: ((od max, od min, min wall thickness, component), ...), mm inclusive
+TUBE_GUSSET_RANGES = {
+    'dhead_100_110_mm': {
+        'hollow_bar': (
+            (152, 128, 0, "Gusset - 100mm Drive 150mm Tube"),
+            (200, 168, 0, "Gusset - 100mm Drive 170mm Tube"),
+            (219, 219, 0, "Gusset - 100mm Drive 219mm Tube"),
+        ),
+        'pipe': (
+            (177, 168, 0, "Gusset - 100mm Drive 170mm Tube"),
+            (219, 219, 0, "Gusset - 100mm Drive 219mm Tube"),
+        ),
+    },
+    'dhead_130_mm': {
+        'hollow_bar': (
+            (152, 150, 0, "Gusset - 130mm Drive 150mm Tube"),
+            (200, 168, 0, "Gusset - 130mm Drive 170mm Tube"),
+            (219, 219, 0, "Gusset - 130mm Drive 219mm Tube"),
+            (273, 273, 0, "Gusset - 130mm Drive 273mm Tube"),
+            (457, 323, 0, "Gusset - 130mm Drive 323mm Tube"),
+        ),
+        'pipe': (
+            (177, 168, 0, "Gusset - 130mm Drive 170mm Tube"),
+            (219, 219, 0, "Gusset - 130mm Drive 219mm Tube"),
+            (273, 273, 0, "Gusset - 130mm Drive 273mm Tube"),
+            (457, 323, 0, "Gusset - 130mm Drive 323mm Tube"),
+        ),
+    },
+    'dhead_150_mm': {
+        'hollow_bar': (
+            (152, 150, 0, "Gusset - 150mm Drive 150mm Tube"),
+            (219, 168, 0, "Gusset - 150mm Drive 170mm Tube"),
+            (457, 273, 0, "Gusset - 150mm Drive 273mm Tube"),
+        ),
+        'pipe': (
+            (177, 168, 0, "Gusset - 130mm Drive 170mm Tube"),
+            (219, 219, 0, "Gusset - 130mm Drive 219mm Tube"),
+            (457, 273, 0, "Gusset - 150mm Drive 273mm Tube"),
+        ),
+    },
+    'dhead_200_mm': {
+        'hollow_bar': (
+            (219, 168, 0, "Gusset - 200mm Drive 170mm Tube"),
+            (457, 273, 0, "Gusset - 200mm Drive 273mm Tube"),
+        ),
+        'pipe': (
+            (219, 168, 0, "Gusset - 200mm Drive 170mm Tube"),
+            (457, 273, 0, "Gusset - 200mm Drive 273mm Tube"),
+        ),
+    },
+}
+TUBE_ZED_CENTRE_RANGES = {
+    'hollow_bar': (
+        (152, 150, 0, "ZED Centre 150mm"),
+        (170, 168, 0, "ZED Centre 168mm"),
+        (219, 219, 0, "ZED Centre 219mm"),
+        (273, 273, 0, "ZED Centre 273mm"),
+    ),
+    'pipe': (
+        (168, 168, 0, "ZED Centre 168mm"),
+        (219, 219, 12.7, "ZED Centre 219mm"),
+        (273, 273, 12.7, "ZED Centre 273mm"),
+    ),
+}
+# Drive head attribute values of the barrels and their drive head component
+BARREL_DRIVE_HEADS = {
+    '75mm Square Head': 'Drive Head - 75mm Square',
+    '100mm Square Head': 'Drive Head - 100mm Square',
+    '110mm Square Head': 'Drive Head - 110mm Square',
+    '130mm Square Head': 'Drive Head - 130mm Square',
+    '130mm Digga Square Head': 'Drive Head - 130mm Square DIGGA',
+    '150mm Square Head': 'Drive Head - 150mm Square',
+    '150mm IMT Square Head': 'Drive Head - 150mm Square IMT',
+    '200mm Bauer Square Head': 'Drive Head - 200mm Square Bauer',
+    '200mm Mait Square Head': 'Drive Head - 200mm Square MAIT',
+    '4" Lo Drill Head': 'Drive Head - 4" Lo Drill',
+}
+# Profiling combination of the barrels and the (drive head, type) it covers
+BARREL_PROFILING_ROWS = (
+    ('75mm Lightweight', (
+        ('75mm Square Head', 'Lightweight'),
+    )),
+    ('75mm Standard, 100mm Lightweight, 110mm Lightweight', (
+        ('75mm Square Head', 'Standard'),
+        ('100mm Square Head', 'Lightweight'),
+        ('110mm Square Head', 'Lightweight'),
+    )),
+    ('75mm Heavy Duty, 100mm Standard, 110mm Standard, 130mm Lightweight, 150mm Lightweight', (
+        ('75mm Square Head', 'Heavy Duty'),
+        ('100mm Square Head', 'Standard'),
+        ('110mm Square Head', 'Standard'),
+        ('130mm Square Head', 'Lightweight'),
+        ('130mm Digga Square Head', 'Lightweight'),
+        ('150mm Square Head', 'Lightweight'),
+        ('150mm IMT Square Head', 'Lightweight'),
+    )),
+    ('100mm Heavy Duty, 110mm Heavy Duty, 130mm Standard, 150mm Standard, 200mm Lightweight', (
+        ('100mm Square Head', 'Heavy Duty'),
+        ('110mm Square Head', 'Heavy Duty'),
+        ('130mm Square Head', 'Standard'),
+        ('130mm Digga Square Head', 'Standard'),
+        ('150mm Square Head', 'Standard'),
+        ('150mm IMT Square Head', 'Standard'),
+        ('200mm Bauer Square Head', 'Lightweight'),
+        ('200mm Mait Square Head', 'Lightweight'),
+    )),
+    ('130mm Heavy Duty, 150mm Heavy Duty, 200mm Standard', (
+        ('130mm Square Head', 'Heavy Duty'),
+        ('130mm Digga Square Head', 'Heavy Duty'),
+        ('150mm Square Head', 'Heavy Duty'),
+        ('150mm IMT Square Head', 'Heavy Duty'),
+        ('200mm Bauer Square Head', 'Standard'),
+        ('200mm Mait Square Head', 'Standard'),
+    )),
+    ('200mm Heavy Duty', (
+        ('200mm Bauer Square Head', 'Heavy Duty'),
+        ('200mm Mait Square Head', 'Heavy Duty'),
+    )),
+    ('4" Lo Drill Lightweight', (
+        ('4" Lo Drill Head', 'Lightweight'),
+    )),
+    ('4" Lo Drill Standard', (
+        ('4" Lo Drill Head', 'Standard'),
+    )),
+    ('4" Lo Drill Heavy Duty', (
+        ('4" Lo Drill Head', 'Heavy Duty'),
+    )),
+    ('Custom Head Lightweight', (
+        ('Custom head', 'Lightweight'),
+    )),
+    ('Custom Head Standard', (
+        ('Custom head', 'Standard'),
+    )),
+    ('Custom Head Heavy Duty', (
+        ('Custom head', 'Heavy Duty'),
+    )),
+)
+BARREL_PROFILING_COMBINATIONS = {
+    key: combination
+    for combination, keys in BARREL_PROFILING_ROWS
+    for key in keys
+}
+# The Core Barrel has no 4" Lo Drill nor custom head
+CORE_BARREL_EXCLUDED_HEADS = {'4" Lo Drill Head', 'Custom head'}
+CORE_BARREL_DRIVE_HEADS = {
+    d_head: drive_head
+    for d_head, drive_head in BARREL_DRIVE_HEADS.items()
+    if d_head not in CORE_BARREL_EXCLUDED_HEADS
+}
+CORE_BARREL_PROFILING_COMBINATIONS = {
+    (d_head, type): combination
+    for (d_head, type), combination in BARREL_PROFILING_COMBINATIONS.items()
+    if d_head not in CORE_BARREL_EXCLUDED_HEADS
+}
+CORE_BARREL_TEETH = {
+    '22mm Teeth': '22mm',
+    '22mm Extra Teeth': '22mm',
+    '25mm Teeth': '25mm',
+    '25mm Extra Teeth': '25mm',
+    '38/30 Teeth': '38/20mm',
+    'CJ2 Teeth': 'CJ2',
+    'WS20 Teeth': 'WS20',
+}
+# Cleaning Bucket / Drilling Barrel opening types and the methods returning
+# their hinge / handle components and bright bar ranges per diameter
+BARREL_HINGE_TABLES = {
+    'cleaning_bucket_handle': ('_components_cb_mapping', '_get_hinge_cb_component3'),
+    'cleaning_bucket_plunger': ('_components_cb_plunger_mapping', '_get_hinge_cb_plunger_component3'),
+    'cleaning_bucket_plunger_handle': ('_components_cb_mapping', '_get_hinge_cb_component3'),
+    'drilling_barrel_handle': ('_components_db_mapping', '_get_hinge_db_component3'),
+    'drilling_barrel_plunger': ('_components_db_plunger_mapping', '_get_hinge_db_plunger_comp3'),
+    'drilling_barrel_plunger_handle': ('_components_db_mapping', '_get_hinge_db_component3'),
+}
+# Drilling Barrel front ends and the method building their teeth and pilot
+DB_FRONT_END_BUILDERS = {
+    'Rock Front End': '_get_teeth_rock_components',
+    'Clay Front End': '_get_teeth_clay_components',
+    'Taper Rock Front End': '_get_teeth_taper_components',
+    'ZED Front End': '_get_zed_frontend_components',
+}
+
+
+# Permanent casing templates, OD and wall thickness in mm
+PERMANENT_CASING_PATTERN = re.compile(r'Permanent Casing - OD(\d+) WT(\d+(?:\.\d+)?)')
+# Seconds a worker trusts the version of the casing index it read last
+CASING_VERSION_INTERVAL = 5
+_casing_versions = {}  # {dbname: (monotonic time read, version)}
+
+# Carrier flight formula of _compute_cflight_qty per auger type:
+# 1 flighted length less the lead, 2 same and doubled with AR150 / blade teeth,
+# 3 flighted length less 40% of the lead
+AUGER_TYPE_CODES = {
+    'dual rock': 1, 'taper rock': 1, 'taper rock aggressive': 1,
+    'zed 25mm': 1, 'zed 32mm': 1, 'zed 40mm': 1, 'zed 50mm': 1,
+    'clay/shale': 2, 'blade': 2,
+    'triad rock': 3,
+}
+AR150_TEETH = (
+    'ar150 teeth', 'ar150 teeth w/ gauge teeth',
+    'blade teeth', 'blade teeth w/ gauge teeth',
+)
+
+# Teeth part builders of the Bored Pile and CFA augers, shared through the
+# teeth table: (method, its arguments, attribute of its option)
+TEETH_BUILDERS = {
+    'dual taper rock': ('_get_teeth_dual_taper_rock', ('diameter', 'teeth', 'pilot', 'option'), 'Rotation'),
+    'triad rock': ('_get_teeth_triad_rock', ('diameter', 'teeth', 'pilot', 'option'), 'Rotation'),
+    'clay shale': ('_get_teeth_clay_shale', ('diameter', 'teeth', 'pilot', 'option'), 'Rotation'),
+    'blade': ('_get_teeth_blade', ('diameter', 'teeth', 'pilot'), None),
+    'zed': ('_get_teeth_zed', ('diameter', 'option', 'teeth'), 'Centre Tube'),
+    'cfa dual taper': ('_get_dual_taper_teeth', ('diameter', 'teeth', 'pilot'), None),
+    'cfa clay shale': ('_get_clay_shale_teeth', ('diameter', 'teeth', 'pilot'), None),
+    'cfa single cut': ('_get_single_cut_teeth', ('diameter', 'teeth', 'pilot'), None),
+    'cfa zed': ('_get_zed_teeth', ('diameter', 'teeth', 'option'), 'Centre Tube OD'),
+}
+TEETH_TEMPLATES = {
+    'Bored Pile Auger': ('dual taper rock', 'triad rock', 'clay shale', 'blade', 'zed'),
+    'CFA Auger': ('cfa dual taper', 'cfa clay shale', 'cfa single cut', 'cfa zed'),
+}
+# Teeth table {(auger, diameter, teeth, pilot, option): parts}. The builders only
+# depend on their arguments, so one table serves every database of the process.
+# It is kept out of the registry LRU, which its cartesian product would flood.
+_teeth_table = {}
+
+# Attributes of the tremie pipe variants, in the order of the table keys
+TREMIE_PIPE_ATTRIBUTES = ('Type_TP', 'Length_TP', 'Diameter_TP', 'Pipe Size_TP')
+
 
 class ProductProduct(models.Model):
     _inherit = "product.product"
@@ -15,6 +251,35 @@ class ProductProduct(models.Model):
     is_different_price = fields.Boolean(default=False)
     different_price = fields.Float()
 
+    # Flight geometry parsed from the name, e.g. 'Flight - OD1370 ID276 P900 T30 LH R1.2'
+    is_flight = fields.Boolean(compute='_compute_flight_geometry', store=True, index=True)
+    flight_od = fields.Integer(string='Flight OD', compute='_compute_flight_geometry', store=True)
+    flight_id_value = fields.Integer(string='Flight ID', compute='_compute_flight_geometry', store=True)
+    flight_pitch = fields.Integer(compute='_compute_flight_geometry', store=True)
+    flight_thickness = fields.Integer(compute='_compute_flight_geometry', store=True)
+    flight_rotation = fields.Selection(
+        [('RH', 'Right Hand'), ('LH', 'Left Hand')],
+        compute='_compute_flight_geometry', store=True,
+    )
+    flight_turns = fields.Char(compute='_compute_flight_geometry', store=True, help="e.g. R1.2, empty for one turn")
+
+    # Tube geometry parsed from the name, e.g. 'Hollow Bar - OD152mm WT 26mm', 'Pipe - OD168mm WT6.4mm'
+    tube_kind = fields.Selection(
+        [('hollow_bar', 'Hollow Bar'), ('pipe', 'Pipe')],
+        compute='_compute_tube_geometry', store=True,
+    )
+    tube_od = fields.Float(string='Tube OD (mm)', compute='_compute_tube_geometry', store=True, index=True)
+    tube_id = fields.Float(string='Tube ID (mm)', compute='_compute_tube_geometry', store=True)
+    tube_wt = fields.Float(string='Tube Wall Thickness (mm)', compute='_compute_tube_geometry', store=True)
+
+    def init(self):
+        super().init()
+        tools.create_index(
+            self.env.cr, 'product_product_flight_geometry_index', self._table,
+            ['flight_od', 'flight_pitch', 'flight_thickness', 'flight_rotation', 'flight_turns', 'flight_id_value'],
+            where='is_flight',
+        )
+
     @api.constrains('name')
     def _check_unique_name(self):
         for record in self:
@@ -88,9 +353,123 @@ class ProductProduct(models.Model):
             self._create_drilling_barrel(product)
             self._create_bored_pile(product)
             self._create_pile_casing(product)
-            self.send_product_variant_creation_email(product)
+            if not self.env.context.get('skip_variant_creation_email'):
+                self.send_product_variant_creation_email(product)
         return products
 
+    def _get_bom_component_generators(self):
+        """
+            return: {template name: method returning the components of a variant}
+            Lets the BOM rules run without creating anything (exports, pre-flight checks)
+        """
+        return {
+            'Core Barrel': self._get_core_barrel_components,
+            'Tremie Pipe Trial': self._get_tre_pipe_components,
+            'Cleaning Bucket': self._get_cleaning_bucket_components,
+            'Drilling Barrel': self._create_drilling_barrel_component,
+            'Bored Pile Auger': self._get_bored_pile_component,
+            'Pile Casing Stock': self._get_pile_casing_components,
+        }
+
+    def _get_variant_bom_components(self, product):
+        """
+            return: the (name, qty) components the rules produce for the variant,
+            None when its template has no BOM automation
+        """
+        generators = {name.lower(): method for name, method in self._get_bom_component_generators().items()}
+        generator = generators.get((product.product_tmpl_id.name or '').strip().lower())
+        if generator is None:
+            return None
+        components = generator(product) or []
+        return [c for c in components if c and len(c) >= 2 and c[0] and c[1]]
+
+    def _get_casing_dimensions(self, diameter, w_thickness, numbers):
+        """ return: (inside diameter, wall thickness) in mm, pre-parsed on the values when given """
+        if 'Inside Diameter' in numbers:
+            inside_dia = numbers['Inside Diameter']
+        else:
+            inside_dia = float(re.search(r"\d+\.?\d*", diameter).group())
+        if 'Wall Thickness' in numbers:
+            wall_thickness = numbers['Wall Thickness']
+        else:
+            wall_thickness = float(re.search(r"\d+\.?\d*", w_thickness).group())
+        return inside_dia, wall_thickness
+
+    def _get_flat_bar_thickness(self, at_sizes):
+        """ return: thickness of a drive band / shoe size such as "100x12t", 0 when absent """
+        attr_sizes = re.search(r"x(\d+)t", at_sizes)
+        return int(attr_sizes.group(1)) if attr_sizes else 0
+
+    def _get_flat_bar_qty(self, type, inside_dia, wall_thickness, flat_bar_thickness):
+        """
+            Flat bar (meter) of an ID aligned, OD aligned or overlapped drive band / shoe
+        """
+        if type == 'id_align':
+            total_id_aligned_db_mm = (inside_dia + flat_bar_thickness) * math.pi
+            ia_mm_qty = round(total_id_aligned_db_mm / 1000, 2)
+            return ia_mm_qty
+        elif type == 'od_align':
+            total_od_aligned_db_mm = (inside_dia + (wall_thickness * 2) - flat_bar_thickness) * math.pi
+            oa_mm_qty = round(total_od_aligned_db_mm / 1000, 2)
+            return oa_mm_qty
+        else:
+            total_overlapped_db_mm = (inside_dia + (wall_thickness * 2) + 6 + flat_bar_thickness) * math.pi
+            ol_mm_qty = round(total_overlapped_db_mm / 1000, 2)
+            return ol_mm_qty
+
+    def _get_flat_bar_qtys(self, inside_dias, wall_thicknesses, flat_bar_thicknesses):
+        """
+            Batched _get_flat_bar_qty over arrays of the same length, with numpy when
+            installed. The circumferences are computed with the same operations in the
+            same order as the scalar path, and rounded with the python round, so the
+            quantities are identical to it.
+            return: {'id_align': [qty], 'od_align': [qty], 'ol': [qty]}
+        """
+        if numpy is None:
+            return {
+                type: [
+                    self._get_flat_bar_qty(type, inside_dia, wall_thickness, flat_bar_thickness)
+                    for inside_dia, wall_thickness, flat_bar_thickness in zip(inside_dias, wall_thicknesses, flat_bar_thicknesses)
+                ]
+                for type in ('id_align', 'od_align', 'ol')
+            }
+        inside_dia = numpy.asarray(inside_dias, dtype=numpy.float64)
+        wall_thickness = numpy.asarray(wall_thicknesses, dtype=numpy.float64)
+        flat_bar_thickness = numpy.asarray(flat_bar_thicknesses, dtype=numpy.float64)
+        totals_mm = {
+            'id_align': (inside_dia + flat_bar_thickness) * math.pi,
+            'od_align': (inside_dia + (wall_thickness * 2) - flat_bar_thickness) * math.pi,
+            'ol': (inside_dia + (wall_thickness * 2) + 6 + flat_bar_thickness) * math.pi,
+        }
+        return {type: [round(qty, 2) for qty in (total_mm / 1000).tolist()] for type, total_mm in totals_mm.items()}
+
+    def _get_casing_flat_bar_qtys(self, products):
+        """
+            Flat bar quantities of the drive bands and shoes of pile casing variants,
+            computed in one batch for _get_pile_casing_components.
+            return: {(type, inside diameter, wall thickness, flat bar thickness): qty}
+        """
+        keys = set()
+        for product in products:
+            attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
+            try:
+                inside_dia, wall_thickness = self._get_casing_dimensions(
+                    attributes.get('Inside Diameter', ''), attributes.get('Wall Thickness', ''),
+                    self._get_attribute_numbers(product),
+                )
+            except AttributeError:
+                continue  # raised again by the variant itself
+            for at_sizes in (attributes.get('1) Drive Band Size'), attributes.get('2) Shoe Size')):
+                if at_sizes:
+                    keys.add((inside_dia, wall_thickness, self._get_flat_bar_thickness(at_sizes)))
+        keys = sorted(keys)
+        qtys = self._get_flat_bar_qtys(*zip(*keys)) if keys else {}
+        return {
+            (type, *key): qty
+            for type, type_qtys in qtys.items()
+            for key, qty in zip(keys, type_qtys)
+        }
+
     def _create_pile_casing(self, product):
         """ Create a BOM automation for pile casing components """
         if product.product_tmpl_id.name != 'Pile Casing Stock':
@@ -98,49 +477,40 @@ class ProductProduct(models.Model):
 
         reference = product.display_name
         components = self._get_pile_casing_components(product)
-        attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
-        drive_band = attributes.get('1) Drive Band Size', '') or attributes.get('Drive Band Type (A)', '') or attributes.get('Drive Band Type (B)', '')
-        shoe = attributes.get('2) Shoe Size', '') or attributes.get('Shoe Type (A)', '') or attributes.get('Shoe Type (B)', '')
-
-        is_dband_shoe = True if drive_band or shoe else False
+        is_dband_shoe = self._is_dband_shoe(product)
 
         if not components:
             return
 
         self._create_pcs_bom_components(product, reference, components, is_dband_shoe)
 
+    def _is_dband_shoe(self, product):
+        """ return: True when the pile casing variant has a drive band or a shoe """
+        attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
+        drive_band = attributes.get('1) Drive Band Size', '') or attributes.get('Drive Band Type (A)', '') or attributes.get('Drive Band Type (B)', '')
+        shoe = attributes.get('2) Shoe Size', '') or attributes.get('Shoe Type (A)', '') or attributes.get('Shoe Type (B)', '')
+
+        return True if drive_band or shoe else False
+
     def _create_pcs_bom_components(self, product, reference, components, is_dband_shoe):
-        bom_lines = []
+        component_uoms = self._get_pcs_component_uoms(components)
+        products = self._get_or_create_bom_components(component_uoms, operator='=')
+        operation_ids = self._get_default_pcs_work_center(product, is_dband_shoe)
+        Mrp_bom = self.env['mrp.bom'].create(
+            self._prepare_bom_vals(product, reference, components, products, component_uoms, operation_ids)
+        )
+        return Mrp_bom
+
+    def _get_pcs_component_uoms(self, components):
+        """ return: {component name: uom of its placeholder} of a pile casing BOM """
         uom_meter = self.env.ref('uom.product_uom_meter', raise_if_not_found=False)
         unit = self.env.ref('uom.product_uom_unit', raise_if_not_found=False)
 
-        for component_name, qty in components:
-            keywords = {'Permanent Casing', 'Hollow Bar', 'Flat Bar', 'Pipe'}
-            uom = uom_meter if any(keyword in component_name for keyword in keywords) else unit
-            component = self.env['product.product'].search([('name', '=', component_name)], limit=1)
-            if not component:
-                component = self.env['product.product'].create({
-                    'name': component_name,
-                    'type': 'consu',
-                    'is_storable': True,
-                    'uom_id': uom.id,
-                })
-            bom_lines.append((0, 0, {
-                'product_id': component.id,
-                'product_qty': qty,
-                'product_uom_id': uom.id,
-            }))
-        operation_ids = self._get_default_pcs_work_center(product, is_dband_shoe)
-        Mrp_bom = self.env['mrp.bom'].create({
-            'code': reference,
-            'product_tmpl_id': product.product_tmpl_id.id,
-            'product_id': product.id,
-            'product_qty': 1.0,
-            'type': 'normal',
-            'bom_line_ids': bom_lines,
-            'operation_ids': operation_ids,
-        })
-        return Mrp_bom
+        keywords = {'Permanent Casing', 'Hollow Bar', 'Flat Bar', 'Pipe'}
+        return {
+            component_name: uom_meter if any(keyword in component_name for keyword in keywords) else unit
+            for component_name, qty in components
+        }
 
     def _get_default_pcs_work_center(self, product, is_dband_shoe):
         if is_dband_shoe:
@@ -190,9 +560,10 @@ class ProductProduct(models.Model):
         operation_lines = [(0, 0, op) for op in operations]
         return operation_lines
 
-    def _get_pile_casing_components(self, product):
+    def _get_pile_casing_components(self, product, flat_bar_qtys=None):
         """
             param: product_template_attribute_value_ids; we retrieve all attribute values excluding N/A.
+            param: flat_bar_qtys, flat bar quantities computed in bulk, see _get_casing_flat_bar_qtys
             return: a list of items & qty for pile casing component.
         """
         attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
@@ -216,46 +587,115 @@ class ProductProduct(models.Model):
         no_of_teeth = attributes.get('No. of Teeth', '')
         customization = attributes.get('Customization', '')
 
-        def _permanent_casing_combination(diameter, w_thickness):
-            """
-                return: formatted permanent casing string
-            """
-            od = 0
-            wall = 0
-            wall_str = 0
+        permanent_casing = self._get_permanent_casing_name(diameter, w_thickness)
+        if self._is_permanent_casing_available(diameter, w_thickness):
+            numbers = self._get_attribute_numbers(product)
+            return self._get_casing_component(casing_type, diameter, w_thickness, segment, c_length, d_band_size, d_band_type_a, d_band_type_b, no_of_teeth, shoe_size, shoe_type_a, shoe_type_b, lock_type, lift_holes, permanent_casing, teeth, numbers=numbers, flat_bar_qtys=flat_bar_qtys)
+        else:
+            raise ValidationError("Oops! Casing is not available, please review the selection")
 
-            od_match = re.search(r'(\d+)\s*mm', diameter, re.IGNORECASE)
-            wt_match = re.search(r'(\d+(?:\.\d+)?)\s*mm', w_thickness, re.IGNORECASE)
+    def _get_permanent_casing_key(self, diameter, w_thickness):
+        """
+            Outside diameter of the casing: inside diameter plus twice the wall.
+            return: ((od, wt) numerics, wall thickness as written in the value)
+        """
+        od = 0
+        wall = 0
+        wall_str = 0
+
+        od_match = re.search(r'(\d+)\s*mm', diameter, re.IGNORECASE)
+        wt_match = re.search(r'(\d+(?:\.\d+)?)\s*mm', w_thickness, re.IGNORECASE)
+
+        if od_match:
+            od = int(od_match.group(1))
+        if wt_match:
+            wall_str = wt_match.group(1)
+            wall = float(wt_match.group(1))
+        od = od + ( 2 * wall)
+        return (int(od), float(wall_str)), wall_str
+
+    def _get_permanent_casing_name(self, diameter, w_thickness):
+        """
+            return: formatted permanent casing string
+        """
+        (od, wall), wall_str = self._get_permanent_casing_key(diameter, w_thickness)
+        return f"Permanent Casing - OD{od} WT{wall_str}"
 
-            if od_match:
-                od = int(od_match.group(1))
-            if wt_match:
-                wall_str = wt_match.group(1)
-                wall = float(wt_match.group(1))
-            od = od + ( 2 * wall)
-            return f"Permanent Casing - OD{int(od)} WT{wall_str}"
+    def _get_permanent_casing_version(self):
+        """
+            Version of the casing index: latest write date and count of the active
+            casing templates. Read again after CASING_VERSION_INTERVAL seconds, or
+            at once when this worker changed a casing (_reset_permanent_casing_version).
+        """
+        dbname = self.env.cr.dbname
+        now = time.monotonic()
+        read_at, version = _casing_versions.get(dbname, (None, None))
+        if read_at is not None and now - read_at < CASING_VERSION_INTERVAL:
+            return version
+        self.env['product.template'].flush_model(['name', 'active'])
+        self.env.cr.execute("""
+            SELECT max(write_date), count(*)
+              FROM product_template
+             WHERE active
+               AND COALESCE(name->>%s, name->>'en_US') ILIKE %s
+        """, [self.env.lang or 'en_US', '%Permanent Casing - OD%'])
+        version = tuple(self.env.cr.fetchone())
+        _casing_versions[dbname] = (now, version)
+        return version
+
+    def _reset_permanent_casing_version(self):
+        _casing_versions.pop(self.env.cr.dbname, None)
+
+    def _get_permanent_casing_index(self):
+        """
+            Permanent casings of the catalogue, rebuilt when its version moves: a
+            template created, renamed, archived or deleted. The other registry
+            caches are left alone.
+            return: {(od, wt): frozenset of the casing template names}
+        """
+        return self._get_permanent_casing_index_version(self._get_permanent_casing_version())
 
-        permanent_casing = _permanent_casing_combination(diameter, w_thickness)
-        product_exist = self.env['product.template'].search([('name', '=', permanent_casing)], limit=1)
+    @tools.ormcache('version')
+    def _get_permanent_casing_index_version(self, version):
+        index = {}
+        for template in self.env['product.template'].search([('name', 'ilike', 'Permanent Casing - OD')]):
+            match = PERMANENT_CASING_PATTERN.fullmatch(template.name or '')
+            if match:
+                key = (int(match.group(1)), float(match.group(2)))
+                index[key] = index.get(key, frozenset()) | {template.name}
+        return index
 
-        od_match = re.search(r'(\d+)\s*mm', diameter or "", re.IGNORECASE)
-        diameter_mm = str(od_match.group(1)) if od_match else ""
+    def _is_permanent_casing_available(self, diameter, w_thickness):
+        """ return: True when the casing of an inside diameter / wall thickness pair is in the catalogue """
+        key, wall_str = self._get_permanent_casing_key(diameter, w_thickness)
+        return f"Permanent Casing - OD{key[0]} WT{wall_str}" in self._get_permanent_casing_index().get(key, ())
 
-        if product_exist:
-            return self._get_casing_component(casing_type, diameter, w_thickness, segment, c_length, d_band_size, d_band_type_a, d_band_type_b, no_of_teeth, shoe_size, shoe_type_a, shoe_type_b, lock_type, lift_holes, permanent_casing, teeth)
-        else:
-            raise ValidationError("Oops! Casing is not available, please review the selection")
+    def _get_unavailable_casing_combinations(self, template):
+        """
+            Inside diameter / wall thickness pairs of a Pile Casing Stock template
+            without a permanent casing, so they can be excluded before any variant exists.
+            return: [(inside diameter PTAV, wall thickness PTAV)]
+        """
+        values = {
+            line.attribute_id.name: line.product_template_value_ids._only_active()
+            for line in template.valid_product_template_attribute_line_ids
+        }
+        return [
+            (diameter, w_thickness)
+            for diameter, w_thickness in itertools.product(values.get('Inside Diameter', []), values.get('Wall Thickness', []))
+            if not self._is_permanent_casing_available(diameter.name, w_thickness.name)
+        ]
 
-    def _get_casing_component(self, casing_type, diameter, w_thickness, segment, c_length, d_band_size, d_band_type_a, d_band_type_b, no_of_teeth, shoe_size, shoe_type_a, shoe_type_b, lock_type, lift_holes, permanent_casing, teeth):
-        # Extract numbers of attribute values
+    def _get_casing_component(self, casing_type, diameter, w_thickness, segment, c_length, d_band_size, d_band_type_a, d_band_type_b, no_of_teeth, shoe_size, shoe_type_a, shoe_type_b, lock_type, lift_holes, permanent_casing, teeth, numbers=None, flat_bar_qtys=None):
+        # Extract numbers of attribute values, pre-parsed on the values when given
+        numbers = numbers or {}
         casing_match = re.search(r"\d+\.?\d*", c_length)
         no_teeth_match = re.search(r"\d+\.?\d*", no_of_teeth)
-        inside_dia = float(re.search(r"\d+\.?\d*", diameter).group())
-        wall_thickness = float(re.search(r"\d+\.?\d*", w_thickness).group())
+        inside_dia, wall_thickness = self._get_casing_dimensions(diameter, w_thickness, numbers)
 
         # Qty for permanent casing and teeth attribute
-        casing_qty = float(casing_match.group()) if casing_match else 0
-        teeth_qty = int(no_teeth_match.group()) if no_teeth_match else 0
+        casing_qty = numbers.get('Casing Length', float(casing_match.group()) if casing_match else 0)
+        teeth_qty = int(numbers.get('No. of Teeth', no_teeth_match.group() if no_teeth_match else 0))
 
         def _get_dband_shoe_qty(type, inside_dia, wall_thickness, at_sizes):
             """
@@ -265,21 +705,11 @@ class ProductProduct(models.Model):
             if not at_sizes:
                 return 0.0
 
-            attr_sizes = re.search(r"x(\d+)t", at_sizes)
-            flat_bar_thickness = int(attr_sizes.group(1)) if attr_sizes else 0
-
-            if type == 'id_align':
-                total_id_aligned_db_mm = (inside_dia + flat_bar_thickness) * math.pi
-                ia_mm_qty = round(total_id_aligned_db_mm / 1000, 2)
-                return ia_mm_qty
-            elif type == 'od_align':
-                total_od_aligned_db_mm = (inside_dia + (wall_thickness * 2) - flat_bar_thickness) * math.pi
-                oa_mm_qty = round(total_od_aligned_db_mm / 1000, 2)
-                return oa_mm_qty
-            else:
-                total_overlapped_db_mm = (inside_dia + (wall_thickness * 2) + 6 + flat_bar_thickness) * math.pi
-                ol_mm_qty = round(total_overlapped_db_mm / 1000, 2)
-                return ol_mm_qty
+            flat_bar_thickness = self._get_flat_bar_thickness(at_sizes)
+            key = (type if type in ('id_align', 'od_align') else 'ol', inside_dia, wall_thickness, flat_bar_thickness)
+            if flat_bar_qtys and key in flat_bar_qtys:
+                return flat_bar_qtys[key]
+            return self._get_flat_bar_qty(type, inside_dia, wall_thickness, flat_bar_thickness)
 
         # Flat Bar items
         def _get_dband_shoe_sizes(size):
@@ -447,8 +877,13 @@ class ProductProduct(models.Model):
         Returns the product name like "Flight - OD590 ID273 P400 T20 RH"
         or empty string if N/A/empty.
         """
+        product = self._find_bp_flight_attr_product(attr_value)
+        return product.name if product else ''
+
+    def _find_bp_flight_attr_product(self, attr_value):
+        """ return: the flight product of a flight attribute value, see _parse_bp_flight_attr """
         if not attr_value or attr_value.strip().lower() == 'n/a':
-            return ''
+            return self.env['product.product']
         # Strip "Lead/Carrier/Coupling Flight - " prefix → "Flight - ..."
         cleaned = re.sub(
             r'^(?:Lead|Carrier|Coupling)\s+Flight\s*-\s*',
@@ -465,8 +900,34 @@ class ProductProduct(models.Model):
             product = self.env['product.product'].search(
                 [('name', '=ilike', stripped)], limit=1
             )
+        return product
+
+    def _resolve_bp_flight_attr(self, value):
+        """
+            _parse_bp_flight_attr memoized on the product.attribute.value, so the
+            flight of a value is searched once instead of on every variant.
+            param: product.attribute.value (or empty)
+        """
+        if not value:
+            return ''
+        if value.bom_component_id:
+            return value.bom_component_id.name
+        product = self._find_bp_flight_attr_product(value.name)
+        if product:
+            value._set_bom_component(product)
         return product.name if product else ''
 
+    def _get_attribute_numbers(self, product):
+        """
+            param: product.product to get the product attributes
+            return: {attribute name: number pre-parsed on its value}, values without a number left out
+        """
+        return {
+            attr.attribute_id.name: attr.product_attribute_value_id.numeric_value
+            for attr in product.product_template_attribute_value_ids
+            if attr.product_attribute_value_id.has_numeric_value
+        }
+
     def _get_bored_pile_component(self, product):
         """
         param: product.template to get the product attributes
@@ -485,8 +946,6 @@ class ProductProduct(models.Model):
         teeth = attributes.get('Teeth', '')
         pilot = attributes.get('Pilot', '')
         center_tube = attributes.get('Centre Tube', '')
-        lead_flight_attr = attributes.get('Lead Flight', '')
-        carrier_flight_attr = attributes.get('Carrier Flight', '')
 
         # Validate required attributes
         if pilot and pilot.strip().lower().startswith('please select'):
@@ -494,8 +953,18 @@ class ProductProduct(models.Model):
 
         # Parse flight attributes into product names
         # "Lead Flight - OD590 ID273 P400 T20 RH" → "Flight - OD590 ID273 P400 T20 RH"
-        lead_flight = self._parse_bp_flight_attr(lead_flight_attr)
-        carrier_flight = self._parse_bp_flight_attr(carrier_flight_attr)
+        values = {
+            attr.attribute_id.name: attr.product_attribute_value_id
+            for attr in product.product_template_attribute_value_ids
+        }
+        lead_flight = self._resolve_bp_flight_attr(values.get('Lead Flight'))
+        carrier_flight = self._resolve_bp_flight_attr(values.get('Carrier Flight'))
+
+        numbers = self._get_attribute_numbers(product)
+        if 'Auger Diameter' in numbers:
+            diameter = int(numbers['Auger Diameter'])
+        else:
+            diameter = int(re.findall(r'\d+', diameter)[0])
 
         args = (
             auger_type, diameter, drive_head,
@@ -553,150 +1022,6 @@ class ProductProduct(models.Model):
         dhead_150_mm = ['Drive Head - 150mm Square', 'Drive Head - 150mm Square IMT']
         dhead_200_mm = ['Drive Head - 200mm Square Bauer', 'Drive Head - 200mm Square MAIT']
 
-        gusset_map = {
-            'dhead_100_110_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD128mm WT 11.5mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD150mm ID120mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 26mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 100mm Drive 150mm Tube",
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 100mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 100mm Drive 219mm Tube",
-                # Pipes
-                'Pipe - OD168mm WT6.4mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 100mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 100mm Drive 219mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 100mm Drive 219mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 100mm Drive 219mm Tube",
-            },
-            'dhead_130_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD150mm ID120mm': "Gusset - 130mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 26mm': "Gusset - 130mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 130mm Drive 150mm Tube",
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 130mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 130mm Drive 219mm Tube",
-                'hollow bar - OD273mm WT14': "Gusset - 130mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 25mm': "Gusset - 130mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 32mm': "Gusset - 130mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT25mm': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow Bar - OD323mm WT30mm': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow Bar - OD356 ID306': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow bar - OD457mm T35mm': "Gusset - 130mm Drive 323mm Tube",
-                'Hollow bar - OD457mm T25mm': "Gusset - 130mm Drive 323mm Tube",
-                # Pipes
-                'Pipe - OD168mm WT6.4mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD273mm WT9.3mm': "Gusset - 130mm Drive 273mm Tube",
-                'Pipe - OD273mm WT6.4mm': "Gusset - 130mm Drive 273mm Tube",
-                'Pipe - OD273mm WT12.7mm': "Gusset - 130mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.75mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD323mm WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD323mm WT6.4mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD323mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD355 WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD355mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - 406mm 9.5mm WT': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD406mm WT12.7mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD457mm WT9.5mm': "Gusset - 130mm Drive 323mm Tube",
-                'Pipe - OD457mm WT15.9mm': "Gusset - 130mm Drive 323mm Tube",
-            },
-            'dhead_150_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD150mm ID120mm': "Gusset - 150mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 26mm': "Gusset - 150mm Drive 150mm Tube",
-                'Hollow Bar - OD152mm WT 33.5mm': "Gusset - 150mm Drive 150mm Tube",
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 150mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 150mm Drive 170mm Tube",
-                'hollow bar - OD273mm WT14': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 25mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 32mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT25mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT30mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow Bar - OD356 ID306': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T35mm': "Gusset - 150mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T25mm': "Gusset - 150mm Drive 273mm Tube",
-                # Pipes
-                'Pipe - OD168mm WT6.4mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 130mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 130mm Drive 219mm Tube",
-                'Pipe - OD273mm WT9.3mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD273mm WT6.4mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD273mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.75mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT6.4mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD323mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD355 WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD355mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - 406mm 9.5mm WT': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD406mm WT12.7mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD457mm WT9.5mm': "Gusset - 150mm Drive 273mm Tube",
-                'Pipe - OD457mm WT15.9mm': "Gusset - 150mm Drive 273mm Tube",
-            },
-            'dhead_200_mm': {
-                # Hollow Bars
-                'Hollow Bar - OD168mm WT 21.5mm': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD168mm WT 29mm': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD170mm ID140mm': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD180 ID150': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow bar - OD200 ID150': "Gusset - 200mm Drive 170mm Tube",
-                'Hollow Bar - OD219mm WT 25mm': "Gusset - 200mm Drive 170mm Tube",
-                'hollow bar - OD273mm WT14': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 25mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD273mm WT 32mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT25mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD323mm WT30mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow Bar - OD356 ID306': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T35mm': "Gusset - 200mm Drive 273mm Tube",
-                'Hollow bar - OD457mm T25mm': "Gusset - 200mm Drive 273mm Tube",
-                # Pipes
-                'Pipe - OD168mm WT6.4mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD168mm WT4.8mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD168mm WT11mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD177mm WT 8mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD219mm WT8.2mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD219mm WT6.4mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD219mm WT12.7mm': "Gusset - 200mm Drive 170mm Tube",
-                'Pipe - OD273mm WT9.3mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD273mm WT6.4mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD273mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.75mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT6.4mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD323mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD355 WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD355mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - 406mm 9.5mm WT': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD406mm WT12.7mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD457mm WT9.5mm': "Gusset - 200mm Drive 273mm Tube",
-                'Pipe - OD457mm WT15.9mm': "Gusset - 200mm Drive 273mm Tube",
-            }
-        }
-
         # Support for shared mapping between similar drive heads
         d_head = ''
         if drive_head in dhead_100_110_mm:
@@ -708,29 +1033,12 @@ class ProductProduct(models.Model):
         elif drive_head in dhead_200_mm:
             d_head = 'dhead_200_mm'
 
-        gusset_label = gusset_map.get(d_head, {}).get(centre_tube)
+        gusset_label = self._get_tube_range_component(TUBE_GUSSET_RANGES.get(d_head, {}), centre_tube)
 
         return (gusset_label, 1) if gusset_label else (None, 0)
 
     def _get_zed_center_component_map(self, center_tube):
-        zed_center_mapping = {
-            'Hollow Bar - OD150mm ID120mm': "ZED Centre 150mm",
-            'Hollow Bar - OD152mm WT 26mm': "ZED Centre 150mm",
-            'Hollow Bar - OD152mm WT 33.5mm': "ZED Centre 150mm",
-            'Hollow Bar - OD168mm WT 21.5mm': "ZED Centre 168mm",
-            'Hollow Bar - OD168mm WT 29mm': "ZED Centre 168mm",
-            'Hollow Bar - OD170mm ID140mm': "ZED Centre 168mm",
-            'Hollow Bar - OD219mm WT 25mm': "ZED Centre 219mm",
-            'hollow bar - OD273mm WT14': "ZED Centre 273mm",
-            'Hollow Bar - OD273mm WT 25mm': "ZED Centre 273mm",
-            'Hollow Bar - OD273mm WT 32mm': "ZED Centre 273mm",
-            'pipe - OD168mm WT4.8mm': "ZED Centre 168mm",
-            'Pipe - OD168mm WT6.4mm': "ZED Centre 168mm",
-            'Pipe - OD168mm WT11mm': "ZED Centre 168mm",
-            'Pipe - OD219mm WT12.7mm': "ZED Centre 219mm",
-            'Pipe - OD273mm WT12.7mm': "ZED Centre 273mm"
-        }
-        return zed_center_mapping.get(center_tube, "")
+        return self._get_tube_range_component(TUBE_ZED_CENTRE_RANGES, center_tube) or ""
 
     def _get_center_tube_zed(
         self, overall_length, drive_head, center_tube, zed_center
@@ -854,6 +1162,21 @@ class ProductProduct(models.Model):
         flighted_length, teeth
     ):
         """Calculate the qty for carrier flight."""
+        inputs = self._get_cflight_inputs(type, lead_flight, carrier_flight, flighted_length, teeth)
+        if inputs is None:
+            return 0
+        return self._compute_cflight_qty(*inputs)
+
+    def _get_cflight_inputs(
+        self, type, lead_flight, carrier_flight,
+        flighted_length, teeth
+    ):
+        """
+            Numeric inputs of the carrier flight qty, for _compute_cflight_qty or
+            the batched _get_cflight_qtys.
+            return: (type code, flighted length, lead pitch, lead turns, carrier pitch,
+            carrier turns, teeth factor), None when the auger has no lead nor carrier flight
+        """
         flight_length = re.findall(r'\d+', flighted_length)[0]
         flight_length_num = int(flight_length)
 
@@ -869,17 +1192,18 @@ class ProductProduct(models.Model):
 
             return pitch, turns
 
-        l_pitch = l_no_turn = c_pitch = c_no_turn = 0
-        if lead_flight or carrier_flight:
-            l_pitch, l_no_turn = _get_pitch(lead_flight or "")
-            c_pitch, c_no_turn = _get_pitch(carrier_flight or "")
-
-            return self._get_cflight_qty(
-                type, flight_length_num,
-                l_pitch, l_no_turn,
-                c_pitch, c_no_turn, teeth,
-            )
-        return 0
+        if not (lead_flight or carrier_flight):
+            return None
+        l_pitch, l_no_turn = _get_pitch(lead_flight or "")
+        c_pitch, c_no_turn = _get_pitch(carrier_flight or "")
+        type_code = AUGER_TYPE_CODES.get(type.strip().lower(), 0)
+        teeth_factor = 1
+        if type_code == 2:
+            try:
+                teeth_factor = 2 if teeth.strip().lower() in AR150_TEETH else 1
+            except AttributeError:
+                type_code = 0  # no teeth: _get_cflight_qty fails to 0
+        return type_code, flight_length_num, l_pitch, l_no_turn, c_pitch, c_no_turn, teeth_factor
 
     def _get_cflight_qty(
         self, type, flight_length_num,
@@ -887,33 +1211,46 @@ class ProductProduct(models.Model):
         teeth
     ):
         """Calculate carrier flight quantity."""
-        type_lower = type.strip().lower()
-        auger_types = (
-            'dual rock', 'taper rock', 'taper rock aggressive',
-            'zed 25mm', 'zed 32mm', 'zed 40mm', 'zed 50mm',
-        )
-        ar150_teeth = (
-            'ar150 teeth', 'ar150 teeth w/ gauge teeth',
-            'blade teeth', 'blade teeth w/ gauge teeth',
+        type_code = AUGER_TYPE_CODES.get(type.strip().lower(), 0)
+        teeth_factor = 1
+        if type_code == 2:
+            try:
+                teeth_factor = 2 if teeth.strip().lower() in AR150_TEETH else 1
+            except AttributeError as e:
+                _logger.exception(
+                    "Unexpected error in _get_cflight_qty "
+                    "for type=%s: %s", type, e,
+                )
+                return 0
+        return self._compute_cflight_qty(
+            type_code, flight_length_num, lead_pitch, l_no_turn,
+            carrier_pitch, c_no_turn, teeth_factor,
         )
+
+    def _compute_cflight_qty(
+        self, type_code, flight_length_num,
+        lead_pitch, l_no_turn, carrier_pitch, c_no_turn,
+        teeth_factor
+    ):
+        """ Carrier flight quantity, rounded up to the half flight """
         denominator = carrier_pitch * c_no_turn
         if denominator == 0:
             _logger.warning(
-                "Division by zero prevented for type=%s. "
+                "Division by zero prevented for type code=%s. "
                 "carrier_pitch=%s, c_no_turn=%s",
-                type, carrier_pitch, c_no_turn,
+                type_code, carrier_pitch, c_no_turn,
             )
             return 0
 
         lead_offset = lead_pitch * l_no_turn
         try:
-            if type_lower in auger_types:
+            if type_code == 1:
                 qty = (flight_length_num - lead_offset) / denominator
-            elif type_lower in ('clay/shale', 'blade'):
+            elif type_code == 2:
                 qty = (flight_length_num - lead_offset) / denominator
-                if teeth.strip().lower() in ar150_teeth:
+                if teeth_factor == 2:
                     qty *= 2
-            elif type_lower == 'triad rock':
+            elif type_code == 3:
                 qty = (flight_length_num - (lead_offset * 0.4)) / denominator
             else:
                 return 0
@@ -923,10 +1260,43 @@ class ProductProduct(models.Model):
         except Exception as e:
             _logger.exception(
                 "Unexpected error in _get_cflight_qty "
-                "for type=%s: %s", type, e,
+                "for type code=%s: %s", type_code, e,
             )
             return 0
 
+    def _get_cflight_qtys(
+        self, type_codes, flight_lengths,
+        lead_pitches, l_no_turns, carrier_pitches, c_no_turns,
+        teeth_factors
+    ):
+        """
+            Batched _compute_cflight_qty over arrays of the same length, with numpy
+            when installed. Same operations in the same order, so the quantities
+            are identical to the scalar path.
+            return: [qty]
+        """
+        if numpy is None:
+            return [
+                self._compute_cflight_qty(*inputs)
+                for inputs in zip(type_codes, flight_lengths, lead_pitches, l_no_turns, carrier_pitches, c_no_turns, teeth_factors)
+            ]
+        type_code = numpy.asarray(type_codes)
+        flight_length = numpy.asarray(flight_lengths, dtype=numpy.float64)
+        denominator = numpy.asarray(carrier_pitches, dtype=numpy.float64) * numpy.asarray(c_no_turns, dtype=numpy.float64)
+        lead_offset = numpy.asarray(lead_pitches, dtype=numpy.float64) * numpy.asarray(l_no_turns, dtype=numpy.float64)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            qty = numpy.where(
+                type_code == 3,
+                (flight_length - (lead_offset * 0.4)) / denominator,
+                (flight_length - lead_offset) / denominator,
+            )
+            qty = numpy.where((type_code == 2) & (numpy.asarray(teeth_factors) == 2), qty * 2, qty)
+            qty = numpy.ceil(qty * 2) / 2
+        if (denominator == 0).any():
+            _logger.warning("Division by zero prevented for %d carrier flights", int((denominator == 0).sum()))
+        valid = (denominator != 0) & numpy.isin(type_code, (1, 2, 3))
+        return [q if ok else 0 for q, ok in zip(qty.tolist(), valid.tolist())]
+
     def _parse_flight_spec(self, name):
         """Parse flight product name into component values.
 
@@ -954,6 +1324,29 @@ class ProductProduct(models.Model):
             'no_turns': f"R{turns_val}" if turns_val > 1 else "",
         }
 
+    def _get_flight_geometry_values(self, name):
+        """ return: the flight geometry fields of a product named `name` """
+        spec = self._parse_flight_spec(name) if 'flight -' in (name or '').lower() else None
+        if spec is None:
+            return {
+                'is_flight': False, 'flight_od': 0, 'flight_id_value': 0, 'flight_pitch': 0,
+                'flight_thickness': 0, 'flight_rotation': False, 'flight_turns': False,
+            }
+        return {
+            'is_flight': True,
+            'flight_od': spec['od'],
+            'flight_id_value': spec['id'],
+            'flight_pitch': spec['pitch'],
+            'flight_thickness': spec['thickness'],
+            'flight_rotation': spec['rotation'],
+            'flight_turns': spec['no_turns'] or False,
+        }
+
+    @api.depends('name')
+    def _compute_flight_geometry(self):
+        for product in self:
+            product.update(self._get_flight_geometry_values(product.name))
+
     def _find_flight_product(
         self, base_id, od, pitch, thickness,
         rotation, no_turns
@@ -964,36 +1357,83 @@ class ProductProduct(models.Model):
         Returns (product, id_value) with smallest qualifying ID.
         """
         Product = self.env['product.product']
-        flights = Product.search([
-            ('name', 'ilike', 'Flight -')
-        ])
-
-        best_product = None
-        best_id_value = None
+        product = Product.search([
+            ('is_flight', '=', True),
+            ('flight_od', '=', od),
+            ('flight_pitch', '=', pitch),
+            ('flight_thickness', '=', thickness),
+            ('flight_rotation', '=', rotation.upper()),
+            ('flight_turns', '=', no_turns or False),
+            ('flight_id_value', '>=', base_id),
+            ('flight_id_value', '<=', base_id + 5),
+        ], order='flight_id_value, %s' % Product._order, limit=1)
+        if not product:
+            return None, None
+        return product, product.flight_id_value
 
-        for product in flights:
-            spec = self._parse_flight_spec(product.name)
-            if spec is None:
-                continue
+    def _parse_tube_spec(self, name):
+        """Parse hollow bar / pipe name into geometry values.
 
-            # Match on OD, pitch, thickness, rotation, and no. of turns
-            matches = (
-                spec['od'] == od
-                and spec['pitch'] == pitch
-                and spec['thickness'] == thickness
-                and spec['rotation'].upper() == rotation.upper()
-                and spec['no_turns'] == no_turns
-            )
-            if not matches:
-                continue
+        Examples: 'Hollow Bar - OD152mm WT 26mm', 'Hollow Bar - OD180 ID150',
+        'Hollow bar - OD457mm T35mm', 'Pipe - 406mm 9.5mm WT'.
+        Returns dict with kind, od, id, wt (mm) or None if unparseable.
+        The missing one of id / wt is derived from the other.
+        """
+        lowered = (name or '').strip().lower()
+        if lowered.startswith('hollow bar'):
+            kind = 'hollow_bar'
+        elif lowered.startswith('pipe'):
+            kind = 'pipe'
+        else:
+            return None
+        number = r'(\d+(?:\.\d+)?)'
+        od = re.search(r'OD\s*' + number, name) or re.search(number + r'\s*mm', name)
+        if not od:
+            return None
+        wt = (
+            re.search(r'WT\s*' + number, name)
+            or re.search(r'\bT\s*' + number + r'\s*mm', name)
+            or re.search(number + r'\s*mm\s*WT', name)
+        )
+        id_ = re.search(r'ID\s*' + number, name)
+        od = float(od.group(1))
+        wt = float(wt.group(1)) if wt else 0.0
+        id_ = float(id_.group(1)) if id_ else 0.0
+        if wt and not id_:
+            id_ = od - 2 * wt
+        elif id_ and not wt:
+            wt = (od - id_) / 2
+        return {'kind': kind, 'od': od, 'id': id_, 'wt': wt}
+
+    @api.depends('name')
+    def _compute_tube_geometry(self):
+        for product in self:
+            spec = self._parse_tube_spec(product.name)
+            product.tube_kind = spec['kind'] if spec else False
+            product.tube_od = spec['od'] if spec else 0.0
+            product.tube_id = spec['id'] if spec else 0.0
+            product.tube_wt = spec['wt'] if spec else 0.0
 
-            # ID tolerance: -0 / +5
-            if base_id <= spec['id'] <= base_id + 5:
-                if best_id_value is None or spec['id'] < best_id_value:
-                    best_product = product
-                    best_id_value = spec['id']
+    def _get_tube_geometry(self, name):
+        """
+            return: {'kind', 'od', 'id', 'wt'} of a hollow bar / pipe, None if unparseable.
+            Parsed from the name here, the catalogue snapshot serves the stored
+            tube fields of the catalogue products instead.
+        """
+        return self._parse_tube_spec(name)
 
-        return best_product, best_id_value
+    def _get_tube_range_component(self, ranges, tube):
+        """ return: the component of the range `tube` falls in, in {kind: ((od max, od min, min wt, component),)}, or None """
+        spec = self._get_tube_geometry(tube)
+        if not spec:
+            return None
+        table = ranges.get(spec['kind'], ())
+        index = bisect.bisect_left(table, (spec['od'],))
+        if index < len(table):
+            od_max, od_min, wt_min, component = table[index]
+            if od_min <= spec['od'] and spec['wt'] >= wt_min:
+                return component
+        return None
 
     def _get_flight_combination(
         self, flight_pt, flight_od, center_tube, rotation
@@ -1172,6 +1612,76 @@ class ProductProduct(models.Model):
         }
         return pilot_support.get(pilot, 0)
 
+    def _get_teeth_parts(self, auger, diameter, teeth, pilot, option=None):
+        """
+            Teeth and pilot parts of a Bored Pile or CFA auger, from the teeth table.
+            param: auger, key of TEETH_BUILDERS
+            param: option, rotation or centre tube of the augers whose builder takes one
+            return: list of the (name, qty) parts
+        """
+        params = TEETH_BUILDERS[auger][1]
+        # what the builder ignores is left out of the key, so the rows are shared
+        return list(self._get_teeth_row(
+            auger, diameter, teeth,
+            pilot if 'pilot' in params else None,
+            option if 'option' in params else None,
+        ))
+
+    def _get_teeth_row(self, auger, diameter, teeth, pilot, option):
+        """ return: tuple of the parts of a TEETH_BUILDERS builder, computed once per key """
+        key = (auger, diameter, teeth, pilot, option)
+        row = _teeth_table.get(key)
+        if row is None:
+            method, params = TEETH_BUILDERS[auger][:2]
+            values = {'diameter': diameter, 'teeth': teeth, 'pilot': pilot, 'option': option}
+            row = _teeth_table[key] = tuple(getattr(self, method)(*(values[param] for param in params)) or ())
+        return row
+
+    def _fill_teeth_table(self, templates=None):
+        """
+            Precompute the teeth rows of every auger type over the diameters,
+            teeth, pilots and rotations / centre tubes of the auger templates,
+            into the module teeth table.
+            return: number of rows
+        """
+        if templates is None:
+            templates = self.env['product.template'].search([('name', 'in', list(TEETH_TEMPLATES))])
+        rows = 0
+        for template in templates:
+            values = {
+                line.attribute_id.name: line.value_ids
+                for line in template.attribute_line_ids
+            }
+            diameters = sorted({
+                int(value.numeric_value)
+                for value in values.get('Auger Diameter', [])
+                if value.has_numeric_value
+            })
+            centre_tubes = [value.name for value in values.get('Centre Tube', [])]
+            options = {
+                'Rotation': [value.name for value in values.get('Rotation', [])] or [''],
+                'Centre Tube': centre_tubes or [''],
+                'Centre Tube OD': sorted({
+                    int(od_match.group(1)) if od_match else ''
+                    for od_match in (re.search(r'OD(\d+)', name) for name in centre_tubes or [''])
+                }, key=str),
+            }
+            for auger in TEETH_TEMPLATES.get(template.name, ()):
+                params, option = TEETH_BUILDERS[auger][1:]
+                keys = itertools.product(
+                    diameters,
+                    [value.name for value in values.get('Teeth', [])] or [''],
+                    ([value.name for value in values.get('Pilot', [])] or ['']) if 'pilot' in params else [None],
+                    options[option] if option else [None],
+                )
+                for key in keys:
+                    try:
+                        self._get_teeth_row(auger, *key)
+                    except (TypeError, ValueError, KeyError, IndexError):
+                        continue
+                    rows += 1
+        return rows
+
     def _get_teeth_qty(self, diameter, mm1, mm2, mm3):
         qty = ((diameter - mm1 - mm2) / mm3) + 8
         # Round up to the nearest integer first
@@ -1616,8 +2126,6 @@ class ProductProduct(models.Model):
         flighted_length, rotation, teeth, pilot,
         center_tube, lead_flight, carrier_flight,
     ):
-        diameter = int(re.findall(r'\d+', diameter)[0])
-
         d_head_75 = "Drive Head - 75mm Square"
         h_bar_150 = "Hollow Bar - OD150mm ID120mm"
         stiffening_ring = (
@@ -1648,8 +2156,8 @@ class ProductProduct(models.Model):
             (stiffening_ring, 1) if stiffening_ring
             else (None, 0)
         )
-        teeth_parts = self._get_teeth_dual_taper_rock(
-            diameter, teeth, pilot, rotation
+        teeth_parts = self._get_teeth_parts(
+            'dual taper rock', diameter, teeth, pilot, rotation
         ) or []
 
         _center_tube = self._get_center_tube(
@@ -1679,14 +2187,12 @@ class ProductProduct(models.Model):
         flighted_length, rotation, teeth, pilot,
         center_tube, lead_flight, carrier_flight,
     ):
-        diameter = int(re.findall(r'\d+', diameter)[0])
-
         l_flight, c_flight = self._get_bp_flight_components(
             type, diameter, lead_flight, carrier_flight,
             flighted_length, teeth,
         )
-        teeth_parts = self._get_teeth_triad_rock(
-            diameter, teeth, pilot, rotation
+        teeth_parts = self._get_teeth_parts(
+            'triad rock', diameter, teeth, pilot, rotation
         ) or []
 
         _center_tube = self._get_center_tube(
@@ -1712,8 +2218,6 @@ class ProductProduct(models.Model):
         flighted_length, rotation, teeth, pilot,
         center_tube, lead_flight, carrier_flight,
     ):
-        diameter = int(re.findall(r'\d+', diameter)[0])
-
         d_head_75 = "Drive Head - 75mm Square"
         h_bar_150 = "Hollow Bar - OD150mm ID120mm"
         stiffening_ring = (
@@ -1746,8 +2250,8 @@ class ProductProduct(models.Model):
         _center_tube = self._get_center_tube_zed(
             overall_length, drive_head, center_tube, zed_centre
         )
-        teeth_zed = self._get_teeth_zed(
-            diameter, center_tube, teeth
+        teeth_zed = self._get_teeth_parts(
+            'zed', diameter, teeth, pilot, center_tube
         ) or []
 
         stiffening = (
@@ -1780,8 +2284,6 @@ class ProductProduct(models.Model):
         flighted_length, rotation, teeth, pilot,
         center_tube, lead_flight, carrier_flight,
     ):
-        diameter = int(re.findall(r'\d+', diameter)[0])
-
         d_head_75 = "Drive Head - 75mm Square"
         h_bar_150 = "Hollow Bar - OD150mm ID120mm"
         stiffening_ring = (
@@ -1800,8 +2302,8 @@ class ProductProduct(models.Model):
             type, diameter, lead_flight, carrier_flight,
             flighted_length, teeth,
         )
-        teeth_parts = self._get_teeth_clay_shale(
-            diameter, teeth, pilot, rotation
+        teeth_parts = self._get_teeth_parts(
+            'clay shale', diameter, teeth, pilot, rotation
         ) or []
 
         _center_tube = self._get_center_tube(
@@ -1834,14 +2336,12 @@ class ProductProduct(models.Model):
         flighted_length, rotation, teeth, pilot,
         center_tube, lead_flight, carrier_flight,
     ):
-        diameter = int(re.findall(r'\d+', diameter)[0])
-
         l_flight, c_flight = self._get_bp_flight_components(
             type, diameter, lead_flight, carrier_flight,
             flighted_length, teeth,
         )
-        teeth_blade = self._get_teeth_blade(
-            diameter, teeth, pilot
+        teeth_blade = self._get_teeth_parts(
+            'blade', diameter, teeth, pilot
         )
 
         _center_tube = self._get_center_tube(
@@ -1893,51 +2393,24 @@ class ProductProduct(models.Model):
         return components
 
     def _get_db_handle(self, p_name, dia, b_height, type, no_blade, d_head, db_type, custom, front_end, teeth):
-        d_number = re.findall(r'\d+', dia)[0]
-        x_head = d_head or ""
-        head_matches = re.findall(r'\d+', x_head)
-        head = head_matches[0] if head_matches else ""
+        d_number, dia_number, head, height = self._get_barrel_dimensions(dia, d_head, b_height)
 
-        height_matches = re.findall(r'\d+', b_height)
-        height = height_matches[0] if height_matches else 0
+        components, (hinge_c3, hengi_c3_qty) = self._get_barrel_hinge_stage('drilling_barrel_handle', dia_number)
 
-        dia_number = int(d_number)
-
-        components_map = self._components_db_mapping()
-        components = self._get_range_per_diameter(components_map, dia_number)
-
-        combination = self._get_prof_combination_for_cb_db(d_head, db_type)
-        pf_combination = f" - {combination}" if combination else ""
+        pf_combination, gusset, drive_head, drive_head_ears, drive_head_ears_qty = self._get_barrel_head_stage(d_number, d_head, db_type)
 
         prof_combination = f"{p_name} {dia} x {b_height} - {type} - {no_blade} - {custom} - {front_end} - {teeth} {pf_combination}"
-        gusset_d_head = self._get_gusset_combination(d_head, head)
-        gusset_label = "- Clean & Drill Barrel" if d_head not in ["Custom head", "Amazng Head"] else ""
-        gusset = f"Gusset {gusset_d_head} x {d_number}mm Diameter {gusset_label}"
-        drive_head = self._get_drive_head(d_head)
-        d_head_digga = "Drive Head EARS - 130mm Square" if d_head == "130mm Square Head" else ""
-        drive_head_ears = "Drive Head EARS - 130mm Square DIGGA" if d_head == "130mm Digga Square Head" else d_head_digga
-        drive_head_ears_qty = 2 if d_head == "130mm Square Head" else 4
         drill_pivot_kit = self._get_drill_pivot_kit(db_type, d_head, dia_number)
 
-        hinge_comp3 = self._get_hinge_db_component3()
-        hinge_comp3_lst = self._get_range_per_diameter(hinge_comp3, dia_number)
-        if hinge_comp3_lst:
-            hinge_c3, hengi_c3_qty = hinge_comp3_lst
-        else:
-            hinge_c3, hengi_c3_qty = None, None
-
         handle_bar_qty = self._get_db_handle_bar_qty(height, dia_number)
         wear_pads = "Barrel Wear Pads"
         wear_qty = self.round_to_nearest_even((((dia_number - 40) * 3.142) * 2) / 200)
         pcf1 = self._get_db_pcf1(dia_number)
         pcf2 = self._get_pcf2(dia_number)
-        hollow_bar_extension = self._get_hollow_bar_extension(db_type, d_head, dia_number, front_end)
-        zed_centre = self._get_zed_centre(hollow_bar_extension, front_end)
-
-        rock_components = self._get_teeth_rock_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        clay_components = self._get_teeth_clay_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        taper_components = self._get_teeth_taper_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        zed_components = self._get_zed_frontend_components(drill_pivot_kit, dia_number, teeth, no_blade)
+        hollow_bar_extension = zed_centre = None
+        if front_end in ['Taper Rock Front End', 'ZED Front End']:
+            hollow_bar_extension = self._get_hollow_bar_extension(db_type, d_head, dia_number, front_end)
+            zed_centre = self._get_zed_centre(hollow_bar_extension, front_end)
 
         drilling_arrow_head = ""
         if dia_number < 350:
@@ -1975,18 +2448,63 @@ class ProductProduct(models.Model):
         possible_components.append((zed_centre, 1) if zed_centre else None)
         # Filter out None values and create the final components list
         components = [component for component in possible_components if component]
-        # Extend with rock_components
-        if front_end == 'Rock Front End':
-            components.extend(rock_components)
-        elif front_end == 'Clay Front End':
-            components.extend(clay_components)
-        elif front_end == 'Taper Rock Front End':                                                                                                                                                                                                        
-            components.extend(taper_components)
-        elif front_end == 'ZED Front End':
-            components.extend(zed_components)
+        # Extend with the components of the selected front end only
+        components.extend(self._get_db_front_end_components(front_end, drill_pivot_kit, dia_number, teeth, no_blade))
 
         return components
 
+    @tools.ormcache('d_number', 'd_head', 'barrel_type')
+    def _get_barrel_head_stage(self, d_number, d_head, barrel_type):
+        """
+            Stage shared by the Cleaning Bucket and Drilling Barrel variants of a
+            diameter, drive head and type, whatever their opening type.
+            return: (profiling suffix, gusset, drive head, drive head ears, ears qty)
+        """
+        head_matches = re.findall(r'\d+', d_head or "")
+        head = head_matches[0] if head_matches else ""
+
+        combination = self._get_prof_combination_for_cb_db(d_head, barrel_type)
+        pf_combination = f" - {combination}" if combination else ""
+        gusset_d_head = self._get_gusset_combination(d_head, head)
+        gusset_label = "- Clean & Drill Barrel" if d_head not in ["Custom head", "Amazng Head"] else ""
+        gusset = f"Gusset {gusset_d_head} x {d_number}mm Diameter {gusset_label}"
+        drive_head = self._get_drive_head(d_head)
+        d_head_digga = "Drive Head EARS - 130mm Square" if d_head == "130mm Square Head" else ""
+        drive_head_ears = "Drive Head EARS - 130mm Square DIGGA" if d_head == "130mm Digga Square Head" else d_head_digga
+        drive_head_ears_qty = 2 if d_head == "130mm Square Head" else 4
+        return pf_combination, gusset, drive_head, drive_head_ears, drive_head_ears_qty
+
+    @tools.ormcache('opening', 'dia_number')
+    def _get_barrel_hinge_stage(self, opening, dia_number):
+        """
+            param: opening: key of BARREL_HINGE_TABLES, the family and opening type
+            return: (hinge / handle / locking components or None, (bright bar, qty) or (None, None))
+        """
+        components_table, bright_bar_table = BARREL_HINGE_TABLES[opening]
+        components = self._get_range_per_diameter(getattr(self, components_table)(), dia_number)
+        bright_bar = self._get_range_per_diameter(getattr(self, bright_bar_table)(), dia_number)
+        return components, bright_bar or (None, None)
+
+    def _get_barrel_dimensions(self, dia, d_head, b_height):
+        """
+            Numbers of the Cleaning Bucket / Drilling Barrel attributes, parsed once for every stage.
+            return: (diameter digits, diameter, drive head digits, barrel height digits)
+        """
+        d_number = re.findall(r'\d+', dia)[0]
+        head_matches = re.findall(r'\d+', d_head or "")
+        head = head_matches[0] if head_matches else ""
+        height_matches = re.findall(r'\d+', b_height)
+        height = height_matches[0] if height_matches else 0
+        return d_number, int(d_number), head, height
+
+    def _get_db_front_end_components(self, front_end, pivot_kit, diameter, teeth, no_blade):
+        """
+            Only the builder of the selected front end is evaluated.
+            return: the teeth and pilot components of the front end, [] without one
+        """
+        builder = DB_FRONT_END_BUILDERS.get(front_end)
+        return getattr(self, builder)(pivot_kit, diameter, teeth, no_blade) if builder else []
+
     def _get_db_handle_bar_qty(self, d_height, d_number):
         def mm_to_meters(mm):
             return mm / 1000
@@ -2004,47 +2522,15 @@ class ProductProduct(models.Model):
         return qty
 
     def _get_db_plunger(self, p_name, dia, b_height, type, no_blade, d_head, db_type, custom, front_end, teeth):
-        d_number = re.findall(r'\d+', dia)[0]
-        x_head = d_head or ""
-        head_matches = re.findall(r'\d+', x_head)
-        head = head_matches[0] if head_matches else ""
-        dia_number = int(d_number)
+        d_number, dia_number, head, height = self._get_barrel_dimensions(dia, d_head, b_height)
 
-        components_map = {
-            (0, 400): ("35mm Hinge - 75mm Long", "35mm Hinge - Bush"),
-            (400, 500): ("35mm Hinge - 110mm Long", "35mm Hinge - Bush"),
-            (500, 550): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
-            (550, 650): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
-            (650, 800): ("45mm Hinge - 240mm Long", "45mm Hinge - Bush"),
-            (800, 1050): ("45mm Hinge - 320mm long", "45mm Hinge - Bush"),
-            (1050, 1400): ("60mm Hinge - 250mm long", "60mm Hinge - Bush"),
-            (1400, 1850): ("60mm Hinge - 400mm long", "60mm Hinge - Bush"),
-            (1850, 2000): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
-            (2000, 2500): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
-            (2500, 5000): ("100mm Hinge - 550mm long", "100mm Hinge - Bush"),
-        }
-        components = self._get_range_per_diameter(components_map, dia_number)
+        components, (hinge_c3, hengi_c3_qty) = self._get_barrel_hinge_stage('drilling_barrel_plunger', dia_number)
 
-        combination = self._get_prof_combination_for_cb_db(d_head, db_type)
-        pf_combination = f" - {combination}" if combination else ""
+        pf_combination, gusset, drive_head, drive_head_ears, drive_head_ears_qty = self._get_barrel_head_stage(d_number, d_head, db_type)
 
         prof_combination = f"{p_name} {dia} x {b_height} - {type} - {no_blade} - {custom} - {front_end} - {teeth} {pf_combination}"
-        gusset_d_head = self._get_gusset_combination(d_head, head)
-        gusset_label = "- Clean & Drill Barrel" if d_head not in ["Custom head", "Amazng Head"] else ""
-        gusset = f"Gusset {gusset_d_head} x {d_number}mm Diameter {gusset_label}"
-        drive_head = self._get_drive_head(d_head)
-        d_head_digga = "Drive Head EARS - 130mm Square" if d_head == "130mm Square Head" else ""
-        drive_head_ears = "Drive Head EARS - 130mm Square DIGGA" if d_head == "130mm Digga Square Head" else d_head_digga
-        drive_head_ears_qty = 2 if d_head == "130mm Square Head" else 4
         drill_pivot_kit = self._get_drill_pivot_kit(db_type, d_head, dia_number)
 
-        hinge_comp3 = self._get_hinge_db_plunger_comp3()
-        hinge_comp3_lst = self._get_range_per_diameter(hinge_comp3, dia_number)
-        if hinge_comp3_lst:
-            hinge_c3, hengi_c3_qty = hinge_comp3_lst
-        else:
-            hinge_c3, hengi_c3_qty = None, None
-
         plunger_bar = self._get_plunger_bar(d_head, dia_number)
         plunger_bar_qty = self._get_plunger_bar_qty(dia_number)
         plunger_bush = "Plunger Bush - 110mm OD 75mm ID - 100mm long"
@@ -2056,12 +2542,10 @@ class ProductProduct(models.Model):
         wear_qty = self.round_to_nearest_even((((dia_number - 40) * 3.142) * 2) / 200)
         pcf1 = self._get_db_pcf1(dia_number)
         pcf2 = self._get_pcf2(dia_number)
-        hollow_bar_extension = self._get_hollow_bar_extension(db_type, d_head, dia_number, front_end)
-        zed_centre = self._get_zed_centre(hollow_bar_extension, front_end)
-        rock_components = self._get_teeth_rock_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        clay_components = self._get_teeth_clay_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        taper_components = self._get_teeth_taper_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        zed_components = self._get_zed_frontend_components(drill_pivot_kit, dia_number, teeth, no_blade)
+        hollow_bar_extension = zed_centre = None
+        if front_end in ['Taper Rock Front End', 'ZED Front End']:
+            hollow_bar_extension = self._get_hollow_bar_extension(db_type, d_head, dia_number, front_end)
+            zed_centre = self._get_zed_centre(hollow_bar_extension, front_end)
         drilling_arrow_head = ""
         if dia_number < 350:
             drilling_arrow_head = "Arrow Head - Small"
@@ -2109,15 +2593,8 @@ class ProductProduct(models.Model):
         possible_components.append((zed_centre, 1) if zed_centre else None)
         # Filter out None values and create the final components list
         components = [component for component in possible_components if component]
-        # Extend with rock_components
-        if front_end == 'Rock Front End':
-            components.extend(rock_components)
-        elif front_end == 'Clay Front End':
-            components.extend(clay_components)
-        elif front_end == 'Taper Rock Front End':
-            components.extend(taper_components)
-        elif front_end == 'ZED Front End':
-            components.extend(zed_components)
+        # Extend with the components of the selected front end only
+        components.extend(self._get_db_front_end_components(front_end, drill_pivot_kit, dia_number, teeth, no_blade))
         return components
 
     def _get_gusset_combination(self, d_head, head):
@@ -2176,6 +2653,21 @@ class ProductProduct(models.Model):
 
         return item
 
+    def _components_db_plunger_mapping(self):
+        return {
+            (0, 400): ("35mm Hinge - 75mm Long", "35mm Hinge - Bush"),
+            (400, 500): ("35mm Hinge - 110mm Long", "35mm Hinge - Bush"),
+            (500, 550): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
+            (550, 650): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
+            (650, 800): ("45mm Hinge - 240mm Long", "45mm Hinge - Bush"),
+            (800, 1050): ("45mm Hinge - 320mm long", "45mm Hinge - Bush"),
+            (1050, 1400): ("60mm Hinge - 250mm long", "60mm Hinge - Bush"),
+            (1400, 1850): ("60mm Hinge - 400mm long", "60mm Hinge - Bush"),
+            (1850, 2000): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
+            (2000, 2500): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
+            (2500, 5000): ("100mm Hinge - 550mm long", "100mm Hinge - Bush"),
+        }
+
     def _get_hinge_db_plunger_comp3(self):
         return {
             (0, 400): ("4140 Bright Bar - 35mm",  0.14),
@@ -2207,39 +2699,15 @@ class ProductProduct(models.Model):
         }
 
     def _get_db_plunger_handler(self, p_name, dia, b_height, type, no_blade, d_head, db_type, custom, front_end, teeth):
-        d_number = re.findall(r'\d+', dia)[0]
-        x_head = d_head or ""
-        head_matches = re.findall(r'\d+', x_head)
-        head = head_matches[0] if head_matches else ""
+        d_number, dia_number, head, height = self._get_barrel_dimensions(dia, d_head, b_height)
 
-        height_matches = re.findall(r'\d+', b_height)
-        height = height_matches[0] if height_matches else 0
-
-        dia_number = int(d_number)
+        components, (hinge_c3, hengi_c3_qty) = self._get_barrel_hinge_stage('drilling_barrel_plunger_handle', dia_number)
 
-        components_map = self._components_db_mapping()
-        components = self._get_range_per_diameter(components_map, dia_number)
-
-        combination = self._get_prof_combination_for_cb_db(d_head, db_type)
-        pf_combination = f" - {combination}" if combination else ""
+        pf_combination, gusset, drive_head, drive_head_ears, drive_head_ears_qty = self._get_barrel_head_stage(d_number, d_head, db_type)
 
         prof_combination = f"{p_name} {dia} x {b_height} - {type} - {no_blade} - {custom} - {front_end} - {teeth} {pf_combination} "
-        gusset_d_head = self._get_gusset_combination(d_head, head)
-        gusset_label = "- Clean & Drill Barrel" if d_head not in ["Custom head", "Amazng Head"] else ""
-        gusset = f"Gusset {gusset_d_head} x {d_number}mm Diameter {gusset_label}"
-        drive_head = self._get_drive_head(d_head)
-        d_head_digga = "Drive Head EARS - 130mm Square" if d_head == "130mm Square Head" else ""
-        drive_head_ears = "Drive Head EARS - 130mm Square DIGGA" if d_head == "130mm Digga Square Head" else d_head_digga
-        drive_head_ears_qty = 2 if d_head == "130mm Square Head" else 4
         drill_pivot_kit = self._get_drill_pivot_kit(db_type, d_head, dia_number)
 
-        hinge_comp3 = self._get_hinge_db_component3()
-        hinge_comp3_lst = self._get_range_per_diameter(hinge_comp3, dia_number)
-        if hinge_comp3_lst:
-            hinge_c3, hengi_c3_qty = hinge_comp3_lst
-        else:
-            hinge_c3, hengi_c3_qty = None, None
-
         handle_bar_qty = self._get_handle_bar_qty(height, dia_number)
         plunger_bar = self._get_plunger_bar(d_head, dia_number)
         plunger_bush = "Plunger Bush - 110mm OD 75mm ID - 100mm long"
@@ -2249,12 +2717,10 @@ class ProductProduct(models.Model):
         wear_qty = self.round_to_nearest_even((((dia_number - 40) * 3.142) * 2) / 200)
         pcf1 = self._get_db_pcf1(dia_number)
         pcf2 = self._get_pcf2(dia_number)
-        hollow_bar_extension = self._get_hollow_bar_extension(db_type, d_head, dia_number, front_end)
-        zed_centre = self._get_zed_centre(hollow_bar_extension, front_end)
-        rock_components = self._get_teeth_rock_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        clay_components = self._get_teeth_clay_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        taper_components = self._get_teeth_taper_components(drill_pivot_kit, dia_number, teeth, no_blade)
-        zed_components = self._get_zed_frontend_components(drill_pivot_kit, dia_number, teeth, no_blade)
+        hollow_bar_extension = zed_centre = None
+        if front_end in ['Taper Rock Front End', 'ZED Front End']:
+            hollow_bar_extension = self._get_hollow_bar_extension(db_type, d_head, dia_number, front_end)
+            zed_centre = self._get_zed_centre(hollow_bar_extension, front_end)
         drilling_arrow_head = ""
         if dia_number < 350:
             drilling_arrow_head = "Arrow Head - Small"
@@ -2295,15 +2761,8 @@ class ProductProduct(models.Model):
         possible_components.append((zed_centre, 1) if zed_centre else None)
         # Filter out None values and create the final components list
         components = [component for component in possible_components if component]
-        # Extend with rock_components
-        if front_end == 'Rock Front End':
-            components.extend(rock_components)
-        elif front_end == 'Clay Front End':
-            components.extend(clay_components)
-        elif front_end == 'Taper Rock Front End':
-            components.extend(taper_components)
-        elif front_end == 'ZED Front End':
-            components.extend(zed_components)
+        # Extend with the components of the selected front end only
+        components.extend(self._get_db_front_end_components(front_end, drill_pivot_kit, dia_number, teeth, no_blade))
         return components
 
     def _get_zed_centre(self, hollow_bar, front_end):
@@ -2592,40 +3051,16 @@ class ProductProduct(models.Model):
         return components
 
     def _get_cb_handle(self, p_name, dia, b_height, type, no_blade, d_head, cb_type, custom):
-        d_number = re.findall(r'\d+', dia)[0]
-        x_head = d_head or ""
-        head_matches = re.findall(r'\d+', x_head)
-        head = head_matches[0] if head_matches else ""
+        d_number, dia_number, head, height = self._get_barrel_dimensions(dia, d_head, b_height)
 
-        height_matches = re.findall(r'\d+', b_height)
-        height = height_matches[0] if height_matches else 0
-
-        dia_number = int(d_number)
-
-        components_map = self._components_cb_mapping()
-        components = self._get_range_per_diameter(components_map, dia_number)
+        components, (hinge_c3, hengi_c3_qty) = self._get_barrel_hinge_stage('cleaning_bucket_handle', dia_number)
         
         b_wear_pads = "Barrel Wear Pads"
-        combination = self._get_prof_combination_for_cb_db(d_head, cb_type)
-        pf_combination = f" - {combination}" if combination else ""
+        pf_combination, gusset, drive_head, drive_head_ears, drive_head_ears_qty = self._get_barrel_head_stage(d_number, d_head, cb_type)
 
         prof_combination = f"{p_name} {dia} x {b_height} - {type} - {no_blade} - {custom} {pf_combination}"
-        gusset_d_head = self._get_gusset_combination(d_head, head)
-        gusset_label = "- Clean & Drill Barrel" if d_head not in ["Custom head", "Amazng Head"] else ""
-        gusset = f"Gusset {gusset_d_head} x {d_number}mm Diameter {gusset_label}"
-        drive_head = self._get_drive_head(d_head)
-        d_head_digga = "Drive Head EARS - 130mm Square" if d_head == "130mm Square Head" else ""
-        drive_head_ears = "Drive Head EARS - 130mm Square DIGGA" if d_head == "130mm Digga Square Head" else d_head_digga
-        drive_head_ears_qty = 2 if d_head == "130mm Square Head" else 4
         pivot_kit = self._get_pivot_kit(cb_type, d_head, dia_number)
 
-        hinge_comp3 = self._get_hinge_cb_component3()
-        hinge_comp3_lst = self._get_range_per_diameter(hinge_comp3, dia_number)
-        if hinge_comp3_lst:
-            hinge_c3, hengi_c3_qty = hinge_comp3_lst
-        else:
-            hinge_c3, hengi_c3_qty = None, None
-
         handle_bar_qty = self._get_hinge_handle_bar_qty(height, dia_number)
         wear_pads = "Barrel Wear Pads"
         wear_qty = self.round_to_nearest_even((((dia_number - 30) * 3.142) * 2) / 200)
@@ -2685,48 +3120,15 @@ class ProductProduct(models.Model):
         return qty
 
     def _get_cb_plunger(self, p_name, dia, b_height, type, no_blade, d_head, cb_type, custom):
-        d_number = re.findall(r'\d+', dia)[0]
-        x_head = d_head or ""
-        head_matches = re.findall(r'\d+', x_head)
-        head = head_matches[0] if head_matches else ""
-
-        dia_number = int(d_number)
-        components_map = {
-            (0, 400): ("35mm Hinge - 75mm Long", "35mm Hinge - Bush"),
-            (400, 500): ("35mm Hinge - 110mm Long", "35mm Hinge - Bush"),
-            (500, 550): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
-            (550, 650): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
-            (650, 800): ("45mm Hinge - 240mm Long", "45mm Hinge - Bush"),
-            (800, 1500): ("45mm Hinge - 320mm long", "45mm Hinge - Bush"),
-            (1500, 1850): ("60mm Hinge - 400mm long", "60mm Hinge - Bush"),
-            (1850, 2000): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
-            (2000, 2500): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
-            (2500, 5000): ("100mm Hinge - 550mm long", "100mm Hinge - Bush"),
-        }
-        components = self._get_range_per_diameter(components_map, dia_number)
+        d_number, dia_number, head, height = self._get_barrel_dimensions(dia, d_head, b_height)
+        components, (hinge_c3, hengi_c3_qty) = self._get_barrel_hinge_stage('cleaning_bucket_plunger', dia_number)
 
         b_wear_pads = "Barrel Wear Pads"
-        dia_number = int(d_number)
-        combination = self._get_prof_combination_for_cb_db(d_head, cb_type)
-        pf_combination = f" - {combination}" if combination else ""
+        pf_combination, gusset, drive_head, drive_head_ears, drive_head_ears_qty = self._get_barrel_head_stage(d_number, d_head, cb_type)
 
         prof_combination = f"{p_name} {dia} x {b_height} - {type} - {no_blade} - {custom} {pf_combination}"
-        gusset_d_head = self._get_gusset_combination(d_head, head)
-        gusset_label = "- Clean & Drill Barrel" if d_head not in ["Custom head", "Amazng Head"] else ""
-        gusset = f"Gusset {gusset_d_head} x {d_number}mm Diameter {gusset_label}"
-        drive_head = self._get_drive_head(d_head)
-        d_head_digga = "Drive Head EARS - 130mm Square" if d_head == "130mm Square Head" else ""
-        drive_head_ears = "Drive Head EARS - 130mm Square DIGGA" if d_head == "130mm Digga Square Head" else d_head_digga
-        drive_head_ears_qty = 2 if d_head == "130mm Square Head" else 4
         pivot_kit = self._get_pivot_kit(cb_type, d_head, dia_number)
 
-        hinge_comp3 = self._get_hinge_cb_plunger_component3()
-        hinge_comp3_lst = self._get_range_per_diameter(hinge_comp3, dia_number)
-        if hinge_comp3_lst:
-            hinge_c3, hengi_c3_qty = hinge_comp3_lst
-        else:
-            hinge_c3, hengi_c3_qty = None, None
-
         plunger_bar = self._get_plunger_bar(d_head, dia_number)
         plunger_bar_qty = self._get_plunger_bar_qty(dia_number)
         plunger_bush = "Plunger Bush - 110mm OD 75mm ID - 100mm long"
@@ -2777,6 +3179,20 @@ class ProductProduct(models.Model):
 
         return components
 
+    def _components_cb_plunger_mapping(self):
+        return {
+            (0, 400): ("35mm Hinge - 75mm Long", "35mm Hinge - Bush"),
+            (400, 500): ("35mm Hinge - 110mm Long", "35mm Hinge - Bush"),
+            (500, 550): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
+            (550, 650): ("45mm Hinge - 180mm Long", "45mm Hinge - Bush"),
+            (650, 800): ("45mm Hinge - 240mm Long", "45mm Hinge - Bush"),
+            (800, 1500): ("45mm Hinge - 320mm long", "45mm Hinge - Bush"),
+            (1500, 1850): ("60mm Hinge - 400mm long", "60mm Hinge - Bush"),
+            (1850, 2000): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
+            (2000, 2500): ("100mm Hinge - 450mm long", "100mm Hinge - Bush"),
+            (2500, 5000): ("100mm Hinge - 550mm long", "100mm Hinge - Bush"),
+        }
+
     def _get_hinge_cb_plunger_component3(self):
         return {
             (0, 400): ("4140 Bright Bar - 35mm",  0.14),
@@ -2792,44 +3208,18 @@ class ProductProduct(models.Model):
         }
 
     def _get_cb_plunger_handler(self, p_name, dia, b_height, type, no_blade, d_head, cb_type, custom):
-        d_number = re.findall(r'\d+', dia)[0]
-        x_head = d_head or ""
-        head_matches = re.findall(r'\d+', x_head)
-        head = head_matches[0] if head_matches else ""
-
-        height_matches = re.findall(r'\d+', b_height)
-        height = height_matches[0] if height_matches else 0
+        d_number, dia_number, head, height = self._get_barrel_dimensions(dia, d_head, b_height)
 
-        dia_number = int(d_number)
-
-        components_map = self._components_cb_mapping()
-        components = self._get_range_per_diameter(components_map, dia_number)
+        components, (hinge_c3, hengi_c3_qty) = self._get_barrel_hinge_stage('cleaning_bucket_plunger_handle', dia_number)
 
         # components = components_map.get(d_number, None)
         b_wear_pads = "Barrel Wear Pads"
-        dia_number = int(d_number)
 
-        combination = self._get_prof_combination_for_cb_db(d_head, cb_type)
-        pf_combination = f" - {combination}" if combination else ""
-        _logger.warning("combination: %s", combination)
+        pf_combination, gusset, drive_head, drive_head_ears, drive_head_ears_qty = self._get_barrel_head_stage(d_number, d_head, cb_type)
 
         prof_combination = f"{p_name} {dia} x {b_height} - {type} - {no_blade} - {custom} {pf_combination}"
-        gusset_d_head = self._get_gusset_combination(d_head, head)
-        gusset_label = "- Clean & Drill Barrel" if d_head not in ["Custom head", "Amazng Head"] else ""
-        gusset = f"Gusset {gusset_d_head} x {d_number}mm Diameter {gusset_label}"
-        drive_head = self._get_drive_head(d_head)
-        d_head_digga = "Drive Head EARS - 130mm Square" if d_head == "130mm Square Head" else ""
-        drive_head_ears = "Drive Head EARS - 130mm Square DIGGA" if d_head == "130mm Digga Square Head" else d_head_digga
-        drive_head_ears_qty = 2 if d_head == "130mm Square Head" else 4
         pivot_kit = self._get_pivot_kit(cb_type, d_head, dia_number)
 
-        hinge_comp3 = self._get_hinge_cb_component3()
-        hinge_comp3_lst = self._get_range_per_diameter(hinge_comp3, dia_number)
-        if hinge_comp3_lst:
-            hinge_c3, hengi_c3_qty = hinge_comp3_lst
-        else:
-            hinge_c3, hengi_c3_qty = None, None
-
         handle_bar_qty = self._get_handle_bar_qty(height, dia_number)
         plunger_bar = self._get_plunger_handler_bar(d_head, dia_number)
         plunger_bush = "Plunger Bush - 110mm OD 75mm ID - 100mm long"
@@ -2953,28 +3343,7 @@ class ProductProduct(models.Model):
         return qty
 
     def _get_drive_head(self, d_head):
-        drive_head = ""
-        if d_head == "75mm Square Head":
-            drive_head = "Drive Head - 75mm Square"
-        elif d_head == "100mm Square Head":
-            drive_head = "Drive Head - 100mm Square"
-        elif d_head == "110mm Square Head":
-            drive_head = "Drive Head - 110mm Square"
-        elif d_head == "130mm Square Head":
-            drive_head = "Drive Head - 130mm Square"
-        elif d_head == "130mm Digga Square Head":
-            drive_head = "Drive Head - 130mm Square DIGGA"
-        elif d_head == "150mm Square Head":
-            drive_head = "Drive Head - 150mm Square"
-        elif d_head == "150mm IMT Square Head":
-            drive_head = "Drive Head - 150mm Square IMT"
-        elif d_head == "200mm Bauer Square Head":
-            drive_head = "Drive Head - 200mm Square Bauer"
-        elif d_head == "200mm Mait Square Head":
-            drive_head = "Drive Head - 200mm Square MAIT"
-        elif d_head == '4" Lo Drill Head':
-            drive_head = 'Drive Head - 4" Lo Drill'
-        return drive_head
+        return BARREL_DRIVE_HEADS.get(d_head, "")
 
     def _get_pivot_kit(self, cb_type, d_head, dia):
         item = ""
@@ -3086,61 +3455,40 @@ class ProductProduct(models.Model):
         return rounded_number
 
     def _get_prof_combination_for_cb_db(self, drive_head, type):
-        if drive_head == '75mm Square Head' and type == 'Lightweight':
-            return '75mm Lightweight'
-        
-        elif (drive_head == '75mm Square Head' and type == 'Standard') or \
-            (drive_head == '100mm Square Head' and type == 'Lightweight') or \
-            (drive_head == '110mm Square Head' and type == 'Lightweight'):
-            return '75mm Standard, 100mm Lightweight, 110mm Lightweight'
-        
-        elif (drive_head == '75mm Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '100mm Square Head' and type == 'Standard') or \
-            (drive_head == '110mm Square Head' and type == 'Standard') or \
-            (drive_head == '130mm Square Head' and type == 'Lightweight') or \
-            (drive_head == '130mm Digga Square Head' and type == 'Lightweight') or \
-            (drive_head == '150mm IMT Square Head' and type == 'Lightweight') or \
-            (drive_head == '150mm Square Head' and type == 'Lightweight'):
-            return '75mm Heavy Duty, 100mm Standard, 110mm Standard, 130mm Lightweight, 150mm Lightweight'
-        
-        elif (drive_head == '100mm Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '110mm Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '130mm Square Head' and type == 'Standard') or \
-            (drive_head == '130mm Digga Square Head' and type == 'Standard') or \
-            (drive_head == '150mm IMT Square Head' and type == 'Standard') or \
-            (drive_head == '150mm Square Head' and type == 'Standard') or \
-            (drive_head == '200mm Mait Square Head' and type == 'Lightweight') or \
-            (drive_head == '200mm Bauer Square Head' and type == 'Lightweight'):
-            return '100mm Heavy Duty, 110mm Heavy Duty, 130mm Standard, 150mm Standard, 200mm Lightweight'
-        
-        elif (drive_head == '130mm Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '130mm Digga Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '150mm Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '150mm IMT Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '200mm Mait Square Head' and type == 'Standard') or \
-            (drive_head == '200mm Bauer Square Head' and type == 'Standard'):
-            return '130mm Heavy Duty, 150mm Heavy Duty, 200mm Standard'
-
-        elif (drive_head == '200mm Bauer Square Head' and type == 'Heavy Duty') or \
-            (drive_head == '200mm Mait Square Head' and type == 'Heavy Duty'):
-            return '200mm Heavy Duty'
-
-        elif type == "Lightweight" and drive_head == '4" Lo Drill Head':
-            return '4" Lo Drill Lightweight'
-        elif type == "Standard" and drive_head == '4" Lo Drill Head':
-            return '4" Lo Drill Standard'
-        elif type == "Heavy Duty" and drive_head == '4" Lo Drill Head':
-            return '4" Lo Drill Heavy Duty'
-
-        elif type == "Lightweight" and drive_head == 'Custom head':
-            return 'Custom Head Lightweight'
-        elif type == "Standard" and drive_head == 'Custom head':
-            return 'Custom Head Standard'
-        elif type == "Heavy Duty" and drive_head == 'Custom head':
-            return 'Custom Head Heavy Duty'
-
-        # If no combination found, return empty
-        return ''
+        return BARREL_PROFILING_COMBINATIONS.get((drive_head, type), '')
+
+    def _get_barrel_unmapped_combinations(self):
+        """
+            Coverage report of the barrel decision tables over the Drive Head,
+            Type and Teeth values configured on the barrel templates.
+            return: {template name: [(drive head, type) or (teeth,)]} the tables do not handle
+        """
+        tables = {
+            'Core Barrel': (CORE_BARREL_PROFILING_COMBINATIONS, CORE_BARREL_TEETH),
+            'Cleaning Bucket': (BARREL_PROFILING_COMBINATIONS, None),
+            'Drilling Barrel': (BARREL_PROFILING_COMBINATIONS, None),
+        }
+        report = {}
+        for template in self.env['product.template'].search([('name', 'in', list(tables))]):
+            combinations, teeth_table = tables[template.name]
+            values = {'Drive Head': [], 'Type': [], 'Teeth': []}
+            for line in template.attribute_line_ids:
+                if line.attribute_id.name in values:
+                    values[line.attribute_id.name] = line.value_ids.mapped('name')
+
+            unmapped = [
+                key for key in itertools.product(values['Drive Head'], values['Type'])
+                if key not in combinations
+            ]
+            if teeth_table is not None:
+                unmapped += [(teeth,) for teeth in values['Teeth'] if teeth not in teeth_table]
+            if unmapped:
+                report[template.name] = unmapped
+                _logger.warning(
+                    "%s: %d attribute combinations not handled by the decision tables: %s",
+                    template.name, len(unmapped), "; ".join(" / ".join(key) for key in unmapped),
+                )
+        return report
 
     def _create_tre_pipe(self, product):
         reference = product.display_name
@@ -3150,20 +3498,48 @@ class ProductProduct(models.Model):
             self._create_bom_components(product, reference, components)
 
     def _get_tre_pipe_components(self, product):
-        p_name = product.product_tmpl_id.name
         # product attributes values
         attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
-        type = attributes.get('Type_TP', '')
-        tp_length = attributes.get('Length_TP', '')
-        tp_diameter = attributes.get('Diameter_TP', '')
-        tp_size = attributes.get('Pipe Size_TP', '')
+        key = tuple(attributes.get(attribute, '') for attribute in TREMIE_PIPE_ATTRIBUTES)
+        return list(self._get_tre_pipe_row(*key))
+
+    @tools.ormcache('type', 'tp_length', 'tp_diameter', 'tp_size')
+    def _get_tre_pipe_row(self, type, tp_length, tp_diameter, tp_size):
+        """
+            Row of the tremie pipe table: the components only depend on the value
+            names, so a row never goes stale and renamed values get rows of their own.
+            return: tuple of the (name, qty) components
+        """
         components = []
         if type == 'Intermediate':
             components = self._get_tp_intermediate(tp_length, tp_diameter, tp_size)
         else:
             if type == 'Lead Section':
                 components = self._get_tp_lead_section(tp_length, tp_diameter, tp_size)
-        return components
+        return tuple(components)
+
+    def _fill_tre_pipe_table(self, templates=None):
+        """
+            Precompute the rows of every Type / Length / Diameter / Pipe Size
+            combination of the tremie pipe templates. The combinations the rules
+            reject are left to raise on their variant.
+            return: number of rows
+        """
+        if templates is None:
+            templates = self.env['product.template'].search([('name', '=', 'Tremie Pipe Trial')])
+        rows = 0
+        for template in templates:
+            values = {
+                line.attribute_id.name: line.value_ids.mapped('name')
+                for line in template.attribute_line_ids
+            }
+            for key in itertools.product(*(values.get(attribute) or [''] for attribute in TREMIE_PIPE_ATTRIBUTES)):
+                try:
+                    self._get_tre_pipe_row(*key)
+                except (IndexError, ValueError):
+                    continue
+                rows += 1
+        return rows
 
     def _get_tp_intermediate(self, tp_length, tp_diameter, tp_size):
         l_number = re.findall(r'\d+\.\d+|\d+', tp_length)[0]
@@ -3239,150 +3615,98 @@ class ProductProduct(models.Model):
             if existing_bom:
                 return
                 
-            attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
-    
-            diameter = attributes.get('Diameter', '')
-            height = attributes.get('Height-A', '')
-            drive_head = attributes.get('Drive Head', '')
-            teeth = attributes.get('Teeth', '')
-            customization = attributes.get('Customization', '')
-            type = attributes.get('Type', '')
-
-            # Get the numeric value of drive attribute e.g 22mm 
-            drive_head_attr = self._extract_numeric_value(drive_head)
-            
             # Use the name_get method to get the formatted name for bom reference
             reference = product.display_name
+            components = self._get_core_barrel_components(product)
 
-            # Calculate the teeth qty based on diameter 
-            teeth_data = self._load_teeth_data('core_barrel_teeth_qty.csv')
-            component_qty = self._compute_number_of_teeth(attributes, diameter, teeth_data)
-            prod_qty = component_qty if component_qty > 0 else 1
-
-            # Drive head combination
-            drive_head_name = ''
-            if drive_head == '75mm Square Head':
-                drive_head_name = 'Drive Head - 75mm Square'
-            elif drive_head == '100mm Square Head':
-                drive_head_name = 'Drive Head - 100mm Square'
-            elif drive_head == '110mm Square Head':
-                drive_head_name = 'Drive Head - 110mm Square'
-            elif drive_head == '130mm Square Head':
-                drive_head_name = 'Drive Head - 130mm Square'
-            elif drive_head == '150mm Square Head':
-                drive_head_name = 'Drive Head - 150mm Square'
-            elif drive_head == '150mm IMT Square Head':
-                drive_head_name = 'Drive Head - 150mm Square IMT'
-            elif drive_head == '200mm Bauer Square Head':
-                drive_head_name = 'Drive Head - 200mm Square Bauer'
-            elif drive_head == '200mm Mait Square Head':
-                drive_head_name = 'Drive Head - 200mm Square MAIT'
-            elif drive_head == '130mm Digga Square Head':
-                drive_head_name = 'Drive Head - 130mm Square DIGGA'
-            else: 
-                drive_head_name
-
-            # Profiling combination
-            combination = ''
-            if drive_head == '100mm Square Head' and type == 'Heavy Duty' or \
-                drive_head == '110mm Square Head' and type == 'Heavy Duty' or \
-                drive_head == '130mm Square Head' and type == 'Standard' or \
-                drive_head == '130mm Digga Square Head' and type == 'Standard' or \
-                drive_head == '150mm Square Head' and type == 'Standard' or \
-                drive_head == '150mm IMT Square Head' and type == 'Standard' or \
-                drive_head == '200mm Bauer Square Head' and type == 'Lightweight' or \
-                drive_head == '200mm Mait Square Head' and type == 'Lightweight':
-                combination = '100mm Heavy Duty, 110mm Heavy Duty, 130mm Standard, 150mm Standard, 200mm Lightweight'
-            elif drive_head == '130mm Square Head' and type == 'Heavy Duty' or \
-                drive_head == '130mm Digga Square Head' and type == 'Heavy Duty' or \
-                drive_head == '150mm Square Head' and type == 'Heavy Duty' or \
-                drive_head == '150mm IMT Square Head' and type == 'Heavy Duty' or \
-                drive_head == '200mm Bauer Square Head' and type == 'Standard' or \
-                drive_head == '200mm Mait Square Head' and type == 'Standard':
-                combination = '130mm Heavy Duty, 150mm Heavy Duty, 200mm Standard'
-            elif drive_head == '200mm Bauer Square Head' and type == 'Heavy Duty' or \
-                drive_head == '200mm Mait Square Head' and type == 'Heavy Duty':
-                combination = '200mm Heavy Duty'
-            elif drive_head == '75mm Square Head' and type == 'Lightweight': 
-                combination = '75mm Lightweight'
-            elif drive_head == '75mm Square Head' and type == 'Standard' or \
-                drive_head == '100mm Square Head' and type == 'Lightweight' or \
-                drive_head == '110mm Square Head' and type == 'Lightweight': 
-                combination = '75mm Standard, 100mm Lightweight, 110mm Lightweight'
-            elif drive_head == '75mm Square Head' and type == 'Heavy Duty' or \
-                drive_head == '100mm Square Head' and type == 'Standard' or \
-                drive_head == '110mm Square Head' and type == 'Standard' or \
-                drive_head == '130mm Square Head' and type == 'Lightweight' or \
-                drive_head == '130mm Digga Square Head' and type == 'Lightweight' or \
-                drive_head == '150mm Square Head' and type == 'Lightweight' or \
-                drive_head == '150mm IMT Square Head' and type == 'Lightweight': 
-                combination = '75mm Heavy Duty, 100mm Standard, 110mm Standard, 130mm Lightweight, 150mm Lightweight'
-            else:
-                combination
-
-            # Teeth attribute values
-            teeth_attr = ''
-            if teeth == '22mm Teeth' or teeth == '22mm Extra Teeth':
-                teeth_attr = '22mm' 
-            elif teeth == '25mm Teeth' or teeth == '25mm Extra Teeth':
-                teeth_attr = '25mm'
-            elif teeth == '38/30 Teeth':
-                teeth_attr = '38/20mm'
-            elif teeth == 'CJ2 Teeth':
-                teeth_attr = 'CJ2'
-            elif teeth == 'WS20 Teeth':
-                teeth_attr = 'WS20'
-
-            prof_combination = f"{product.product_tmpl_id.name} {diameter}, {height}, {teeth}, {customization} - {combination}"
-            # List of components for core barrel 
-            components = [
-                (f"Profiling - {prof_combination}", 1.0),
-                (f"{drive_head_name}", 1.0),
-                (f"40x8 Flat Bar - Hardfaced Wear Strip", 1.0),
-                (f"12mm Round Bar - Miniflights", 1.0),
-            ]
-            # Find the index of the 1st component
-            index = next(i for i, component in enumerate(components) if component == (f"Profiling - {prof_combination}", 1.0))
-            gusset_label = "Core Barrel 22mm Teeth" if teeth in ['22mm Extra Teeth', '22mm Teeth'] else "Core Barrel"
-            core_barrel_gusset_map = {
-                '75mm Square Head': '75mm Drive',
-                '100mm Square Head': '100mm Drive',
-                '110mm Square Head': '110mm Drive',
-                '130mm Square Head': '130mm Drive',
-                '130mm Digga Square Head': '130mm Drive',
-                '150mm Square Head': '150mm Drive',
-                '150mm IMT Square Head': '150mm Drive',
-                '200mm Bauer Square Head': '200mm Bauer Drive',
-                '200mm Mait Square Head': '200mm MAIT Drive',
-                '4" Lo Drill Head': '4" Lo Drill Drive',
-            }
-            gusset_drive = core_barrel_gusset_map.get(drive_head, f"{drive_head_attr} Drive")
-            components.insert(index + 1, (f"Gusset {gusset_drive} x {diameter} - {gusset_label}", 4.0))
-
-            # Find the index of the 2nd component
-            index = next(i for i, component in enumerate(components) if component == (f"{drive_head_name}", 1.0))
-
-            # Insert new components based on attributes
-            if drive_head == '130mm Digga Square Head':
-                components.insert(index + 1, (f"Drive Head EARS - 130mm Square DIGGA", 4.0))
-            elif drive_head == '130mm Square Head':
-                components.insert(index + 1, (f"Drive Head EARS - 130mm Square", 2.0))
-            if teeth == 'CJ2/WS20 Combo Teeth':
-                components.insert(index + 1, (f"CJ2 Teeth", 1.0))
-                components.insert(index + 1, (f"CJ2 Tooth Holder", 1.0))
-                components.insert(index + 1, (f"WS20 Teeth", 4.0))
-                components.insert(index + 1, (f"WS20 Tooth Holder", 4.0))
-            else:    
-                components.insert(index + 1, (f"{self._get_detault_teeth_combination(teeth_attr, 1)}", prod_qty))
-                components.insert(index + 1, (f"{self._get_detault_teeth_combination(teeth_attr, 0)}", prod_qty))
-                
             # Create new bom and set default values 
             self._create_bom_components(product, reference, components)
 
+    def _get_core_barrel_components(self, product):
+        """
+            param: product with the Core Barrel attribute values
+            return: a list of items & qty for the core barrel components
+        """
+        attributes = {attr.attribute_id.name: attr.name for attr in product.product_template_attribute_value_ids}
+
+        diameter = attributes.get('Diameter', '')
+        height = attributes.get('Height-A', '')
+        drive_head = attributes.get('Drive Head', '')
+        teeth = attributes.get('Teeth', '')
+        customization = attributes.get('Customization', '')
+        type = attributes.get('Type', '')
+
+        # Get the numeric value of drive attribute e.g 22mm 
+        drive_head_attr = self._extract_numeric_value(drive_head)
+        
+        # Calculate the teeth qty based on diameter 
+        teeth_data = self._load_teeth_data('core_barrel_teeth_qty.csv')
+        component_qty = self._compute_number_of_teeth(attributes, diameter, teeth_data)
+        prod_qty = component_qty if component_qty > 0 else 1
+
+        # Drive head, profiling combination and teeth attribute values
+        drive_head_name = CORE_BARREL_DRIVE_HEADS.get(drive_head, '')
+        combination = CORE_BARREL_PROFILING_COMBINATIONS.get((drive_head, type), '')
+        teeth_attr = CORE_BARREL_TEETH.get(teeth, '')
+
+        prof_combination = f"{product.product_tmpl_id.name} {diameter}, {height}, {teeth}, {customization} - {combination}"
+        # List of components for core barrel 
+        components = [
+            (f"Profiling - {prof_combination}", 1.0),
+            (f"{drive_head_name}", 1.0),
+            (f"40x8 Flat Bar - Hardfaced Wear Strip", 1.0),
+            (f"12mm Round Bar - Miniflights", 1.0),
+        ]
+        # Find the index of the 1st component
+        index = next(i for i, component in enumerate(components) if component == (f"Profiling - {prof_combination}", 1.0))
+        gusset_label = "Core Barrel 22mm Teeth" if teeth in ['22mm Extra Teeth', '22mm Teeth'] else "Core Barrel"
+        core_barrel_gusset_map = {
+            '75mm Square Head': '75mm Drive',
+            '100mm Square Head': '100mm Drive',
+            '110mm Square Head': '110mm Drive',
+            '130mm Square Head': '130mm Drive',
+            '130mm Digga Square Head': '130mm Drive',
+            '150mm Square Head': '150mm Drive',
+            '150mm IMT Square Head': '150mm Drive',
+            '200mm Bauer Square Head': '200mm Bauer Drive',
+            '200mm Mait Square Head': '200mm MAIT Drive',
+            '4" Lo Drill Head': '4" Lo Drill Drive',
+        }
+        gusset_drive = core_barrel_gusset_map.get(drive_head, f"{drive_head_attr} Drive")
+        components.insert(index + 1, (f"Gusset {gusset_drive} x {diameter} - {gusset_label}", 4.0))
+
+        # Find the index of the 2nd component
+        index = next(i for i, component in enumerate(components) if component == (f"{drive_head_name}", 1.0))
+
+        # Insert new components based on attributes
+        if drive_head == '130mm Digga Square Head':
+            components.insert(index + 1, (f"Drive Head EARS - 130mm Square DIGGA", 4.0))
+        elif drive_head == '130mm Square Head':
+            components.insert(index + 1, (f"Drive Head EARS - 130mm Square", 2.0))
+        if teeth == 'CJ2/WS20 Combo Teeth':
+            components.insert(index + 1, (f"CJ2 Teeth", 1.0))
+            components.insert(index + 1, (f"CJ2 Tooth Holder", 1.0))
+            components.insert(index + 1, (f"WS20 Teeth", 4.0))
+            components.insert(index + 1, (f"WS20 Tooth Holder", 4.0))
+        else:    
+            components.insert(index + 1, (f"{self._get_detault_teeth_combination(teeth_attr, 1)}", prod_qty))
+            components.insert(index + 1, (f"{self._get_detault_teeth_combination(teeth_attr, 0)}", prod_qty))
+        return components
+
     def _create_bom_components(
         self, product, reference, components
     ):
-        bom_lines = []
+        components = [(component_name, qty) for component_name, qty in components if component_name and qty]
+        component_uoms = self._get_bom_component_uoms(components)
+        products = self._get_or_create_bom_components(component_uoms)
+        operation_ids = self._get_default_work_center(product)
+        Mrp_bom = self.env['mrp.bom'].create(
+            self._prepare_bom_vals(product, reference, components, products, component_uoms, operation_ids)
+        )
+        return Mrp_bom
+
+    def _get_bom_component_uoms(self, components):
+        """ return: {component name: uom of its placeholder}, meters for the stock sold by length """
         uom_meter = self.env.ref(
             'uom.product_uom_meter', raise_if_not_found=False
         )
@@ -3393,32 +3717,29 @@ class ProductProduct(models.Model):
             'Permanent Casing', 'Hollow Bar', 'Flat Bar',
             'Pipe', 'Parallel Flange Channel', 'Bright Bar',
         }
-
-        for component_name, qty in components:
-            if not component_name or not qty:
-                continue
-            uom = (
+        return {
+            component_name: (
                 uom_meter
                 if any(kw in component_name for kw in meter_keywords)
                 else unit
             )
-            component = self.env['product.product'].search(
-                [('name', '=ilike', component_name)], limit=1
-            )
-            if not component:
-                component = self.env['product.product'].create({
-                    'name': component_name,
-                    'type': 'consu',
-                    'is_storable': True,
-                    'uom_id': uom.id,
-                })
+            for component_name, qty in components
+        }
+
+    def _prepare_bom_vals(self, product, reference, components, products, component_uoms, operation_ids):
+        """
+            products: {component name: product}
+            return: the mrp.bom values of the variant
+        """
+        bom_lines = []
+        for component_name, qty in components:
+            uom = component_uoms[component_name]
             bom_lines.append((0, 0, {
-                'product_id': component.id,
+                'product_id': products[component_name].id,
                 'product_qty': qty,
                 'product_uom_id': uom.id,
             }))
-        operation_ids = self._get_default_work_center(product)
-        Mrp_bom = self.env['mrp.bom'].create({
+        return {
             'code': reference,
             'product_tmpl_id': product.product_tmpl_id.id,
             'product_id': product.id,
@@ -3426,8 +3747,158 @@ class ProductProduct(models.Model):
             'type': 'normal',
             'bom_line_ids': bom_lines,
             'operation_ids': operation_ids,
+        }
+
+    def _get_bulk_bom_generators(self):
+        """
+            return: {template name: components method} of the BOMs built by
+            _create_bom_components; Pile Casing Stock is handled by _get_pile_casing_bom_entries
+        """
+        return {
+            'Tremie Pipe Trial': self._get_tre_pipe_components,
+        }
+
+    def _get_bulk_bom_entries(self, products, failures=None):
+        """
+            param: failures: {product: error message}, filled with the variants
+            whose components could not be computed; they are left out
+            return: [(product, components, {component name: uom}, search operator, operation_ids)]
+            of the variants whose BOM can be rebuilt in bulk
+        """
+        failures = {} if failures is None else failures
+        generators = {name.lower(): method for name, method in self._get_bulk_bom_generators().items()}
+        entries = []
+        casings = self.env['product.product']
+        for product in products:
+            name = (product.product_tmpl_id.name or '').strip().lower()
+            if name == 'pile casing stock':
+                casings |= product
+                continue
+            generator = generators.get(name)
+            if generator is None:
+                continue
+            try:
+                components = [(component_name, qty) for component_name, qty in generator(product) or [] if component_name and qty]
+                entries.append((
+                    product, components, self._get_bom_component_uoms(components), '=ilike',
+                    self._get_default_work_center(product),
+                ))
+            except Exception as e:
+                failures[product] = str(e)
+        if casings:
+            entries += self._get_pile_casing_bom_entries(casings, failures=failures)
+        return entries
+
+    def _get_pile_casing_bom_entries(self, products, failures=None):
+        """ _get_bulk_bom_entries of pile casing variants, their flat bars computed in one batch """
+        failures = {} if failures is None else failures
+        flat_bar_qtys = self._get_casing_flat_bar_qtys(products)
+        entries = []
+        for product in products:
+            try:
+                components = self._get_pile_casing_components(product, flat_bar_qtys=flat_bar_qtys)
+                if not components:
+                    continue
+                entries.append((
+                    product, components, self._get_pcs_component_uoms(components), '=',
+                    self._get_default_pcs_work_center(product, self._is_dband_shoe(product)),
+                ))
+            except Exception as e:
+                failures[product] = str(e)
+        return entries
+
+    def _regenerate_boms(self, products):
+        """
+            Rebuild the BOMs of `products` in one batch: one get-or-create of the
+            components of all the variants and one mrp.bom create. The previous
+            BOMs of the variants are archived, not deleted, as MOs may use them.
+            A variant whose components cannot be computed keeps its BOM and is
+            reported, the others are still rebuilt.
+            return: (the new BOMs, {product: error message} of the failed variants)
+        """
+        failures = {}
+        entries = self._get_bulk_bom_entries(products, failures=failures)
+        if failures:
+            _logger.warning(
+                "BOMs not regenerated for %d variants: %s", len(failures),
+                "; ".join("%s: %s" % (product.display_name, error) for product, error in failures.items()),
+            )
+        Mrp_bom = self.env['mrp.bom']
+        if not entries:
+            return Mrp_bom, failures
+        found = {}
+        for operator in {entry[3] for entry in entries}:
+            component_uoms = {}
+            for product, components, uoms, entry_operator, operation_ids in entries:
+                if entry_operator == operator:
+                    component_uoms.update(uoms)
+            found[operator] = self._get_or_create_bom_components(component_uoms, operator=operator)
+        Mrp_bom.search([('product_id', 'in', [entry[0].id for entry in entries])]).action_archive()
+        boms = Mrp_bom.create([
+            self._prepare_bom_vals(product, product.display_name, components, found[operator], uoms, operation_ids)
+            for product, components, uoms, operator, operation_ids in entries
+        ])
+        _logger.info("BOMs regenerated for %d variants", len(boms))
+        return boms, failures
+
+    def _search_bom_component(self, component_name, operator='=ilike'):
+        """ Find the catalogue product used as a BOM line for `component_name` """
+        return self.env['product.product'].search(
+            [('name', operator, component_name)], limit=1
+        )
+
+    def _search_bom_components(self, component_names, operator='=ilike'):
+        """
+            Set based _search_bom_component: one search for all the lines of a BOM.
+            return: {component name: product} for the names found
+        """
+        names = {name for name in component_names if name}
+        products = {}
+        if operator != '=':
+            # like wildcards cannot be matched back to their name, search them one by one
+            for name in [name for name in names if '%' in name or '_' in name]:
+                names.discard(name)
+                product = self._search_bom_component(name, operator=operator)
+                if product:
+                    products[name] = product
+        if not names:
+            return products
+
+        def _key(name):
+            return name if operator == '=' else name.lower()
+
+        found = {}
+        domain = expression.OR([[('name', operator, name)] for name in names])
+        for product in self.env['product.product'].search(domain):
+            # first match in the model order, as the single search with limit=1
+            found.setdefault(_key(product.name), product)
+        products.update({name: found[_key(name)] for name in names if _key(name) in found})
+        return products
+
+    def _get_or_create_bom_components(self, component_uoms, operator='=ilike'):
+        """
+            Get-or-create the components of a BOM in one search. The missing ones
+            are claimed in bom.component.key before their placeholder is created,
+            so concurrent configurators never create the same placeholder twice.
+            component_uoms: {component name: uom of its placeholder}
+            return: {component name: product}
+        """
+        products = self._search_bom_components(component_uoms, operator=operator)
+        missing = {name: uom for name, uom in component_uoms.items() if name not in products}
+        if missing:
+            products.update(self.env['bom.component.key']._get_or_create_placeholders(
+                missing, case_sensitive=operator == '=',
+            ))
+        return products
+
+    def _create_bom_placeholder(self, component_name, uom):
+        """ Create a storable placeholder for a component missing from the catalogue """
+        return self.env['product.product'].create({
+            'name': component_name,
+            'type': 'consu',
+            'is_storable': True,
+            'uom_id': uom.id,
         })
-        return Mrp_bom
 
     def _get_default_work_center(self, product):
         if product.name == "Tremie Pipe Trial":
@@ -3668,6 +4139,7 @@ class ProductProduct(models.Model):
             return match.group()
         return None
     
+    @tools.ormcache('filename')
     def _load_teeth_data(self, filename):
         filepath = file_path(f'general_ledger/data/{filename}')
         data = {}
@@ -0,0 +1,78 @@
+from odoo import models
+from odoo.exceptions import ValidationError
+import itertools
+import logging
+_logger = logging.getLogger(__name__)
+
+# Variants evaluated between two env cache invalidations
+BOM_MATRIX_CHUNK = 500
+
+
+class ProductTemplate(models.Model):
+    _inherit = "product.template"
+
+    def _is_combination_possible(self, combination, parent_combination=None, ignore_no_variant=False):
+        """ Pile casing combinations without a permanent casing in the catalogue are not offered """
+        if not super()._is_combination_possible(combination, parent_combination=parent_combination, ignore_no_variant=ignore_no_variant):
+            return False
+        if self.name != 'Pile Casing Stock':
+            return True
+        attributes = {ptav.attribute_id.name: ptav.name for ptav in combination}
+        return self.env['product.product']._is_permanent_casing_available(
+            attributes.get('Inside Diameter', ''), attributes.get('Wall Thickness', ''),
+        )
+
+    def _iter_bom_combinations(self, only_possible=True):
+        """
+            Lazily enumerate the variant combinations of the template,
+            in the order of the attribute lines.
+        """
+        self.ensure_one()
+        lines = self.valid_product_template_attribute_line_ids._without_no_variant_attributes()
+        value_sets = [line.product_template_value_ids._only_active() for line in lines]
+        PTAV = self.env['product.template.attribute.value']
+        for values in itertools.product(*value_sets):
+            combination = PTAV.concat(*values)
+            if only_possible and not self._is_combination_possible(combination):
+                continue
+            yield combination
+
+    def _iter_bom_matrix(self, only_possible=True):
+        """
+            Run the BOM rules over every combination without creating variants.
+            yield: (combination, components, error) per combination
+        """
+        self.ensure_one()
+        Product = self.env['product.product']
+        for index, combination in enumerate(self._iter_bom_combinations(only_possible), 1):
+            variant = Product.new({
+                'product_tmpl_id': self.id,
+                'product_template_attribute_value_ids': [(6, 0, combination.ids)],
+            })
+            components, error = [], None
+            try:
+                components = Product._get_variant_bom_components(variant) or []
+            except Exception as e:
+                error = str(e)
+            yield combination, components, error
+            if index % BOM_MATRIX_CHUNK == 0:
+                # new() records and prefetched values pile up in the cache
+                self.env.invalidate_all()
+
+    def action_regenerate_boms(self):
+        """ Rebuild the BOMs of all the variants of the templates in one batched write """
+        boms, failures = self.env['product.product']._regenerate_boms(self.product_variant_ids)
+        if not boms and not failures:
+            raise ValidationError("Opss! BOMs of these templates cannot be regenerated in bulk.")
+        if not failures:
+            return True
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': "%d BOMs regenerated, %d variants failed" % (len(boms), len(failures)),
+                'message': "\n".join("%s: %s" % (product.display_name, error) for product, error in failures.items()),
+                'type': 'warning',
+                'sticky': True,
+            },
+        }
@@ -0,0 +1 @@
+from . import test_bom_component_key
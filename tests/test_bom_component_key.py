@@ -0,0 +1,75 @@
+import threading
+
+from odoo import SUPERUSER_ID, api
+from odoo.exceptions import ConcurrencyError
+from odoo.modules.registry import Registry
+from odoo.service.model import retrying
+from odoo.tests.common import BaseCase, get_db_name, tagged
+
+COMPONENT = 'BOM TEST CONCURRENT PLACEHOLDER'
+
+
+@tagged('-at_install', 'post_install')
+class TestBomComponentKey(BaseCase):
+    """ Placeholders created by concurrent transactions, on real cursors """
+
+    def cursor(self):
+        return Registry(get_db_name()).cursor()
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(self._unlink_placeholders)
+
+    def _unlink_placeholders(self):
+        with self.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            products = env['product.product'].with_context(active_test=False).search([('name', '=ilike', COMPONENT)])
+            products.product_tmpl_id.unlink()
+
+    def _get_or_create(self, env):
+        uom = env.ref('uom.product_uom_unit')
+        return env['product.product']._get_or_create_bom_components({COMPONENT: uom})[COMPONENT]
+
+    def _count(self):
+        with self.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            return env['product.product'].search_count([('name', '=ilike', COMPONENT)])
+
+    def test_interleaved_transactions(self):
+        with self.cursor() as cr1, self.cursor() as cr2:
+            env1 = api.Environment(cr1, SUPERUSER_ID, {})
+            env2 = api.Environment(cr2, SUPERUSER_ID, {})
+            # both snapshots are taken before the placeholder exists
+            self.assertFalse(env1['product.product'].search([('name', '=ilike', COMPONENT)]))
+            self.assertFalse(env2['product.product'].search([('name', '=ilike', COMPONENT)]))
+            product_id = self._get_or_create(env1).id
+            with self.assertRaises(ConcurrencyError):
+                self._get_or_create(env2)
+            cr2.rollback()
+            cr1.commit()
+        with self.cursor() as cr:
+            self.assertEqual(self._get_or_create(api.Environment(cr, SUPERUSER_ID, {})).id, product_id)
+        self.assertEqual(self._count(), 1)
+
+    def test_concurrent_threads(self):
+        barrier = threading.Barrier(2)
+        product_ids, failures = [], []
+
+        def configure():
+            try:
+                with self.cursor() as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    env['product.product'].search_count([])
+                    barrier.wait(timeout=10)
+                    product_ids.append(retrying(lambda: self._get_or_create(env).id, env))
+            except Exception as e:
+                failures.append(e)
+
+        threads = [threading.Thread(target=configure) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(failures)
+        self.assertEqual(len(set(product_ids)), 1)
+        self.assertEqual(self._count(), 1)